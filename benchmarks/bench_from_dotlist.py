@@ -0,0 +1,36 @@
+"""Per-override cost of `DictConfig.from_dotlist`.
+
+Compares the in-memory value parser with the previous strategy, which wrote every value to a temporary file and parsed
+it with a dedicated root loader. Run with `python -m benchmarks.bench_from_dotlist`.
+"""
+import unittest.mock
+
+from configue_cli.core import loader
+from configue_cli.core.dict_config import DictConfig
+
+from .utils import format_duration, print_table, time_per_call
+
+OVERRIDES = {
+    "integer": "model.batch_size=32",
+    "float": "model.optimizer.learning_rate=1e-3",
+    "string": "dataset.name=wikipedia-fr",
+    "quoted string": "dataset.name='hello world'",
+    "list": "model.layers=[64, 128, 256]",
+    "mapping": "model.optimizer={name: adam, beta: 0.9}",
+    "!ext": "model.activation=!ext collections.OrderedDict",
+    "!path (file fallback)": "dataset.path=!path data.txt",
+}
+
+
+def main() -> None:
+    rows = []
+    for name, override in OVERRIDES.items():
+        in_memory = time_per_call(lambda: DictConfig.from_dotlist([override]), number=200)
+        with unittest.mock.patch.object(loader, "load_from_string", loader._load_from_filesystem):
+            filesystem = time_per_call(lambda: DictConfig.from_dotlist([override]), number=20)
+        rows.append([name, format_duration(filesystem), format_duration(in_memory), f"x{filesystem / in_memory:.1f}"])
+    print_table(["override", "temporary file", "in-memory", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
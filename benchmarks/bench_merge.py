@@ -0,0 +1,30 @@
+"""Cost of layering small overrides on top of large configurations with `DictConfig.merge`.
+
+Subtrees are shared between the layers, so building a new layer and merging an override into it should cost time
+proportional to the size of the override rather than the size of the base configuration. Run with
+`python -m benchmarks.bench_merge`.
+"""
+from configue_cli.core.dict_config import DictConfig, ListMergeMode
+
+from .synthetic import make_config, make_dotlist
+from .utils import format_duration, print_table, time_per_call
+
+N_OVERRIDES = 10
+
+
+def main() -> None:
+    rows = []
+    for n_keys in (1_000, 10_000, 100_000):
+        base = DictConfig(make_config(n_keys))
+        override = DictConfig.from_dotlist(make_dotlist(make_config(n_keys))[:: n_keys // N_OVERRIDES])
+
+        def merge_layer() -> None:
+            config = DictConfig(base)
+            config.merge(override, mode=ListMergeMode.EXTEND)
+
+        rows.append([str(n_keys), str(N_OVERRIDES), format_duration(time_per_call(merge_layer, number=100))])
+    print_table(["base keys", "overridden keys", "new layer + merge"], rows)
+
+
+if __name__ == "__main__":
+    main()
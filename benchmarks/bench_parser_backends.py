@@ -0,0 +1,38 @@
+"""Time to load configuration files with PyYAML's pure Python parser and with libyaml's C parser.
+
+Both backends construct the configurations with the same configue constructors, only the parsing of the files
+differs. Run with `python -m benchmarks.bench_parser_backends`.
+"""
+import tempfile
+
+from configue_cli.core import loader
+from configue_cli.core.loader import ParserBackend, load_from_path
+
+from .synthetic import write_config_files
+from .utils import format_duration, print_table, time_per_call
+
+N_KEYS = (100, 1_000, 10_000, 100_000)
+
+
+def main() -> None:
+    if not loader.LIBYAML_AVAILABLE:
+        # `make bench` runs every benchmark, this one is skipped rather than failing the others
+        print("PyYAML was built without libyaml, only the Python parser is available")
+        return
+    rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for n_keys in N_KEYS:
+            (path,) = write_config_files(temp_dir, n_keys)
+            number = max(1, 10_000 // n_keys)
+            timings = [
+                time_per_call(
+                    lambda: load_from_path(path, instantiate=False, parser_backend=backend), number=number, repeat=3
+                )
+                for backend in (ParserBackend.PYTHON, ParserBackend.LIBYAML)
+            ]
+            rows.append([str(n_keys), *map(format_duration, timings), f"x{timings[0] / timings[1]:.1f}"])
+    print_table(["keys", "python", "libyaml", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Time and peak memory of every stage of `inject_from_cli` on synthetic configurations.
+
+Configurations from 10 to 100k keys are generated with varying depths, list sizes and numbers of `-c` files. Each stage
+is measured separately. Results can be saved as JSON and compared with a previous run to catch regressions between
+releases:
+
+    python -m benchmarks.bench_stages --output before.json
+    python -m benchmarks.bench_stages --compare before.json
+
+The full scan takes several minutes, mostly spent parsing and rendering the largest configurations. Use `--help` to
+restrict the stages and the scanned parameters.
+"""
+import argparse
+import contextlib
+import copy
+import io
+import itertools
+import json
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from configue_cli.core.dict_config import DictConfig, ListMergeMode
+from configue_cli.core.dumper import ConfigueDumper
+from configue_cli.core.loader import load_from_config, load_from_path
+from configue_cli.core.render import render
+
+from .synthetic import make_config, make_dotlist, make_schema, write_config_files
+from .utils import format_duration, format_size, measure, print_table
+
+
+class Scenario(NamedTuple):
+    n_keys: int
+    depth: int
+    list_size: int
+    n_files: int
+
+
+Stage = Callable[[Scenario, "Fixtures"], Tuple[Callable[[Any], object], Callable[[], Any]]]
+
+
+class Fixtures:
+    """Inputs of the stages of a scenario, built once and shared between the stages."""
+
+    def __init__(self, scenario: Scenario, directory: str) -> None:
+        self.scenario = scenario
+        self.directory = directory
+        self._cache: Dict[str, Any] = {}
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        if name not in self._cache:
+            self._cache[name] = factory()
+        return self._cache[name]
+
+    @property
+    def paths(self) -> List[str]:
+        return self._get(
+            "paths",
+            lambda: write_config_files(
+                self.directory,
+                self.scenario.n_keys,
+                n_files=self.scenario.n_files,
+                depth=self.scenario.depth,
+                list_size=self.scenario.list_size,
+            ),
+        )
+
+    @property
+    def file_configs(self) -> List[DictConfig]:
+        return self._get("file_configs", lambda: [load_from_path(path, instantiate=False) for path in self.paths])
+
+    @property
+    def merged_config(self) -> DictConfig:
+        def merge() -> DictConfig:
+            config = DictConfig({})
+            config.merge(*copy.deepcopy(self.file_configs), mode=ListMergeMode.EXTEND)
+            return config
+
+        return self._get("merged_config", merge)
+
+    @property
+    def dotlist(self) -> List[str]:
+        return self._get(
+            "dotlist",
+            lambda: make_dotlist(
+                make_config(self.scenario.n_keys, depth=self.scenario.depth, list_size=self.scenario.list_size)
+            ),
+        )
+
+    @property
+    def schema(self) -> type:
+        return self._get("schema", lambda: make_schema(self.scenario.n_keys, depth=self.scenario.depth))
+
+    @property
+    def schema_config(self) -> DictConfig:
+        return self._get("schema_config", lambda: DictConfig.from_type(self.schema))
+
+
+def bench_load_from_path(_: Scenario, fixtures: Fixtures) -> Tuple[Callable[[Any], object], Callable[[], Any]]:
+    def load(paths: List[str]) -> None:
+        for path in paths:
+            load_from_path(path, instantiate=False)
+
+    return load, lambda: fixtures.paths
+
+
+def bench_from_dotlist(_: Scenario, fixtures: Fixtures) -> Tuple[Callable[[Any], object], Callable[[], Any]]:
+    return DictConfig.from_dotlist, lambda: fixtures.dotlist
+
+
+def make_bench_merge(mode: ListMergeMode) -> Stage:
+    def bench_merge(_: Scenario, fixtures: Fixtures) -> Tuple[Callable[[Any], object], Callable[[], Any]]:
+        def merge(configs: List[DictConfig]) -> None:
+            DictConfig({}).merge(*configs, mode=mode)
+
+        # Merging mutates the merged configurations, each run gets its own copy
+        return merge, lambda: copy.deepcopy(fixtures.file_configs)
+
+    return bench_merge
+
+
+def bench_from_type(_: Scenario, fixtures: Fixtures) -> Tuple[Callable[[Any], object], Callable[[], Any]]:
+    return DictConfig.from_type, lambda: fixtures.schema
+
+
+def bench_load_from_config(_: Scenario, fixtures: Fixtures) -> Tuple[Callable[[Any], object], Callable[[], Any]]:
+    return load_from_config, lambda: fixtures.schema_config
+
+
+def bench_dump(_: Scenario, fixtures: Fixtures) -> Tuple[Callable[[Any], object], Callable[[], Any]]:
+    return ConfigueDumper.from_config, lambda: fixtures.merged_config
+
+
+def bench_render(_: Scenario, fixtures: Fixtures) -> Tuple[Callable[[Any], object], Callable[[], Any]]:
+    def render_to_buffer(config: DictConfig) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            render(config, title="Configuration")
+
+    return render_to_buffer, lambda: fixtures.merged_config
+
+
+# Stages and the scenario parameters they depend on
+STAGES: Dict[str, Tuple[Stage, Sequence[str]]] = {
+    "load_from_path": (bench_load_from_path, ("n_keys", "depth", "list_size", "n_files")),
+    "from_dotlist": (bench_from_dotlist, ("n_keys", "depth", "list_size")),
+    "merge[EXTEND]": (make_bench_merge(ListMergeMode.EXTEND), ("n_keys", "depth", "list_size", "n_files")),
+    "merge[REPLACE]": (make_bench_merge(ListMergeMode.REPLACE), ("n_keys", "depth", "list_size", "n_files")),
+    "from_type": (bench_from_type, ("n_keys", "depth")),
+    "load_from_config": (bench_load_from_config, ("n_keys", "depth")),
+    "ConfigueDumper.from_config": (bench_dump, ("n_keys", "depth", "list_size", "n_files")),
+    "render": (bench_render, ("n_keys", "depth", "list_size", "n_files")),
+}
+
+
+def parse_integers(value: str) -> List[int]:
+    return [int(item) for item in value.split(",")]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", type=lambda value: value.split(","), default=list(STAGES))
+    parser.add_argument("--keys", type=parse_integers, default=[10, 100, 1_000, 10_000, 100_000])
+    parser.add_argument("--depths", type=parse_integers, default=[4])
+    parser.add_argument("--list-sizes", type=parse_integers, default=[4])
+    parser.add_argument("--files", type=parse_integers, default=[1, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Path of a JSON file where the results are saved")
+    parser.add_argument("--compare", help="Path of a JSON file of previous results to compare with")
+    args = parser.parse_args(argv)
+    unknown_stages = set(args.stages) - set(STAGES)
+    if unknown_stages:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown_stages))}")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    baseline: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as reader:
+            baseline = {(result["stage"], *result["scenario"].values()): result for result in json.load(reader)}
+
+    results = []
+    measured = set()
+    for n_keys, depth, list_size, n_files in itertools.product(args.keys, args.depths, args.list_sizes, args.files):
+        scenario = Scenario(n_keys=n_keys, depth=depth, list_size=list_size, n_files=n_files)
+        with tempfile.TemporaryDirectory() as directory:
+            fixtures = Fixtures(scenario, directory)
+            for stage_name in args.stages:
+                stage, parameters = STAGES[stage_name]
+                key = (stage_name, *(getattr(scenario, parameter) for parameter in parameters))
+                if key in measured:
+                    continue
+                measured.add(key)
+                function, setup = stage(scenario, fixtures)
+                duration, peak_memory = measure(function, setup, repeat=args.repeat)
+                results.append(
+                    {
+                        "stage": stage_name,
+                        "scenario": {parameter: getattr(scenario, parameter) for parameter in parameters},
+                        "time": duration,
+                        "peak_memory": peak_memory,
+                    }
+                )
+                print(".", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+
+    header = ["stage", "keys", "depth", "lists", "files", "time", "peak memory"]
+    if baseline:
+        header += ["time vs baseline", "memory vs baseline"]
+    rows = []
+    for result in results:
+        scenario_values = result["scenario"]
+        row = [result["stage"]] + [
+            str(scenario_values.get(parameter, "-")) for parameter in ("n_keys", "depth", "list_size", "n_files")
+        ]
+        row += [format_duration(result["time"]), format_size(result["peak_memory"])]
+        previous = baseline.get((result["stage"], *scenario_values.values()))
+        if previous is not None:
+            row += [
+                f"x{result['time'] / previous['time']:.2f}",
+                f"x{result['peak_memory'] / max(previous['peak_memory'], 1):.2f}",
+            ]
+        elif baseline:
+            row += ["-", "-"]
+        rows.append(row)
+    print_table(header, rows)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as writer:
+            json.dump(results, writer, indent=2)
+
+
+if __name__ == "__main__":
+    main()
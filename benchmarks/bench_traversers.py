@@ -0,0 +1,95 @@
+"""Cost of resolving the configuration of deep and wide dataclass schemas with `DictConfig.from_type`.
+
+Compares the first resolution of a schema, which compiles the field plans of its types, with the following ones, which
+reuse them. Run with `python -m benchmarks.bench_traversers`.
+"""
+import dataclasses
+from typing import Any, Callable, Dict
+
+import attrs
+
+from configue_cli.core.dict_config import DictConfig
+from configue_cli.core.traversers import AttrsDataclassTraverser, NativeDataclassTraverser, Traverser
+
+from .utils import format_duration, print_table, time_per_call
+
+
+def make_native_wide_schema(n_fields: int) -> type:
+    leaf = dataclasses.make_dataclass("Leaf", [("value", int, dataclasses.field(default=0))])
+    fields = []
+    for index in range(n_fields):
+        if index % 4 == 0:
+            fields.append((f"nested_{index}", leaf))
+        elif index % 4 == 1:
+            fields.append((f"factory_{index}", list, dataclasses.field(default_factory=list)))
+        elif index % 4 == 2:
+            fields.append((f"default_{index}", int, dataclasses.field(default=index)))
+    # Fields without defaults must come first
+    fields.sort(key=lambda field: len(field) == 3)
+    return dataclasses.make_dataclass("Wide", fields)
+
+
+def make_native_deep_schema(depth: int) -> type:
+    schema = dataclasses.make_dataclass("Level0", [("value", int, dataclasses.field(default=0))])
+    for level in range(1, depth):
+        schema = dataclasses.make_dataclass(
+            f"Level{level}", [("child", schema), ("value", int, dataclasses.field(default=level))]
+        )
+    return schema
+
+
+def make_attrs_wide_schema(n_fields: int) -> type:
+    leaf = attrs.make_class("Leaf", {"value": attrs.field(default=0)})
+    fields: Dict[str, Any] = {}
+    for index in range(n_fields):
+        if index % 4 == 0:
+            fields[f"nested_{index}"] = attrs.field(type=leaf)
+        elif index % 4 == 1:
+            fields[f"factory_{index}"] = attrs.field(factory=list)
+        elif index % 4 == 2:
+            fields[f"takes_self_{index}"] = attrs.field(default=attrs.Factory(lambda self: 1, takes_self=True))
+        else:
+            fields[f"default_{index}"] = attrs.field(default=index)
+    required = {name: field for name, field in fields.items() if name.startswith("nested")}
+    optional = {name: field for name, field in fields.items() if not name.startswith("nested")}
+    return attrs.make_class("Wide", {**required, **optional})
+
+
+def make_attrs_deep_schema(depth: int) -> type:
+    schema = attrs.make_class("Level0", {"value": attrs.field(default=0)})
+    for level in range(1, depth):
+        schema = attrs.make_class(f"Level{level}", {"child": attrs.field(type=schema), "value": attrs.field(default=1)})
+    return schema
+
+
+def clear_type_plans() -> None:
+    NativeDataclassTraverser._type_plans.clear()
+    AttrsDataclassTraverser._type_plans.clear()
+    Traverser._traversers_by_type.clear()
+
+
+SCHEMAS: Dict[str, Callable[[], type]] = {
+    "native, 500 fields": lambda: make_native_wide_schema(500),
+    "native, depth 200": lambda: make_native_deep_schema(200),
+    "attrs, 500 fields": lambda: make_attrs_wide_schema(500),
+    "attrs, depth 200": lambda: make_attrs_deep_schema(200),
+}
+
+
+def main() -> None:
+    rows = []
+    for name, make_schema in SCHEMAS.items():
+        schema = make_schema()
+
+        def compile_and_resolve() -> None:
+            clear_type_plans()
+            DictConfig.from_type(schema)
+
+        cold = time_per_call(compile_and_resolve, number=20)
+        warm = time_per_call(lambda: DictConfig.from_type(schema), number=20)
+        rows.append([name, format_duration(cold), format_duration(warm), f"x{cold / warm:.1f}"])
+    print_table(["schema", "first resolution", "cached plans", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
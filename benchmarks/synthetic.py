@@ -0,0 +1,112 @@
+"""Generators of synthetic configurations and schemas used by the benchmarks.
+
+Configurations are trees of a given depth whose width is chosen to reach the requested number of leaves. Leaves cycle
+between integers, floats, strings and lists so that every code path of the loaders and dumpers is exercised.
+"""
+import dataclasses
+import math
+import os
+from typing import Any, Dict, List
+
+
+def tree_width(n_keys: int, depth: int) -> int:
+    """Return the smallest width of a tree of the given depth that has at least `n_keys` leaves."""
+    return max(2, math.ceil(n_keys ** (1 / depth) - 1e-9))
+
+
+def make_leaf(index: int, list_size: int) -> Any:
+    kind = index % 4
+    if kind == 0:
+        return index
+    if kind == 1:
+        return index / 10
+    if kind == 2:
+        return f"value-{index}"
+    return list(range(index, index + list_size))
+
+
+def make_config(n_keys: int, *, depth: int = 4, list_size: int = 4, offset: int = 0) -> Dict[str, Any]:
+    """Return a nested dictionary with `n_keys` leaves spread over `depth` levels."""
+    width = tree_width(n_keys, depth)
+    counter = iter(range(n_keys))
+
+    def make_node(level: int) -> Dict[str, Any]:
+        node: Dict[str, Any] = {}
+        for child in range(width):
+            if level == depth - 1:
+                index = next(counter, None)
+                if index is None:
+                    break
+                node[f"key_{child}"] = make_leaf(index + offset, list_size)
+            else:
+                sub_node = make_node(level + 1)
+                if not sub_node:
+                    break
+                node[f"node_{child}"] = sub_node
+        return node
+
+    return make_node(0)
+
+
+def make_dotlist(config: Dict[str, Any], prefix: str = "") -> List[str]:
+    """Return the `key=value` command line arguments describing `config`."""
+    dotlist = []
+    for key, value in config.items():
+        dotted_key = f"{prefix}{key}"
+        if isinstance(value, dict):
+            dotlist.extend(make_dotlist(value, prefix=f"{dotted_key}."))
+        elif isinstance(value, list):
+            dotlist.append(f"{dotted_key}=[{', '.join(map(str, value))}]")
+        else:
+            dotlist.append(f"{dotted_key}={value}")
+    return dotlist
+
+
+def write_config_files(
+    directory: str, n_keys: int, *, n_files: int = 1, depth: int = 4, list_size: int = 4
+) -> List[str]:
+    """Write `n_files` YAML files describing the same keys with different values, as a set of `-c` files would."""
+    import yaml
+
+    paths = []
+    for file_index in range(n_files):
+        config = make_config(n_keys, depth=depth, list_size=list_size, offset=file_index)
+        path = os.path.join(directory, f"config_{file_index}.yml")
+        with open(path, "w", encoding="utf-8") as writer:
+            yaml.safe_dump(config, writer, sort_keys=False)
+        paths.append(path)
+    return paths
+
+
+def make_schema(n_keys: int, *, depth: int = 4) -> type:
+    """Return a dataclass type with at least `n_keys` defaulted leaves spread over `depth` levels.
+
+    A single class is generated per level so the cost of generating a schema stays small for any number of keys.
+    """
+    width = tree_width(n_keys, depth)
+    schema = _register(
+        dataclasses.make_dataclass(
+            f"Level0Width{width}", [(f"key_{index}", int, dataclasses.field(default=index)) for index in range(width)]
+        )
+    )
+    for level in range(1, depth):
+        schema = _register(
+            dataclasses.make_dataclass(
+                f"Level{level}Width{width}",
+                [(f"node_{index}", schema, dataclasses.field(default_factory=schema)) for index in range(width)],
+            )
+        )
+    return schema
+
+
+def _register(schema: type) -> type:
+    # The configurations refer to their classes by import path, which must resolve to the generated classes
+    schema.__module__ = __name__
+    globals()[schema.__qualname__] = schema
+    return schema
+
+
+def count_leaves(config: Any) -> int:
+    if isinstance(config, dict):
+        return sum(count_leaves(value) for key, value in config.items() if key != "()")
+    return 1
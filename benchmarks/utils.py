@@ -0,0 +1,56 @@
+import math
+import time
+import timeit
+import tracemalloc
+from typing import Callable, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def time_per_call(function: Callable[[], object], *, number: int = 100, repeat: int = 5) -> float:
+    """Return the best time (in seconds) of a single call of `function` over `repeat` runs of `number` calls."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def format_duration(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def print_table(header: Sequence[str], rows: List[Sequence[str]]) -> None:
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    for row in [header, *rows]:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)))
+
+
+def measure(function: Callable[[T], object], setup: Callable[[], T], *, repeat: int = 3) -> Tuple[float, int]:
+    """Return the best time (in seconds) of `function` over `repeat` runs and its peak memory allocation (in bytes).
+
+    `setup` is called before every run, outside of the measures, to build the argument of `function`. The memory is
+    traced in a separate run since tracing slows down allocations.
+    """
+    best_time = math.inf
+    for _ in range(repeat):
+        argument = setup()
+        start = time.perf_counter()
+        function(argument)
+        best_time = min(best_time, time.perf_counter() - start)
+
+    argument = setup()
+    tracemalloc.start()
+    try:
+        function(argument)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best_time, peak_memory
+
+
+def format_size(n_bytes: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n_bytes < 1024:
+            return f"{n_bytes:.0f} {unit}" if unit == "B" else f"{n_bytes:.1f} {unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:.1f} GiB"
@@ -4,7 +4,9 @@ from typing import Callable, List, Optional, Tuple, Type, TypeVar, Union, overlo
 import click
 
 from .core import configue_cli
-from .core.dict_config import DictConfig, ListMergeMode
+from .core.concurrency import ExecutorKind
+from .core.dict_config import DictConfig, ListMergeMode, Overrides
+from .core.profiler import ProfileFormat
 
 __all__ = ["inject_from_cli"]
 
@@ -21,7 +23,16 @@ def inject_from_cli(
     skypilot_config_path: Optional[str] = None,
     yaml_merge_mode: ListMergeMode = ListMergeMode.EXTEND,
     cli_merge_mode: ListMergeMode = ListMergeMode.REPLACE,
-) -> Callable[[Callable[[InjectedT], ReturnedT]], Callable[..., Optional[ReturnedT]]]:
+    cache_dir: Optional[str] = None,
+    cache_max_size: Optional[int] = None,
+    loading_workers: Optional[int] = None,
+    loading_executor: ExecutorKind = ExecutorKind.THREAD,
+    lazy_instantiation: bool = False,
+    instantiation_workers: Optional[int] = None,
+    deduplicate_instances: bool = False,
+    overrides: Optional[Overrides] = None,
+    skypilot_workers: Optional[int] = None,
+) -> Callable[[Callable[[InjectedT], ReturnedT]], Callable[..., Union[ReturnedT, List[Optional[ReturnedT]], None]]]:
     ...  # pragma: no cover
 
 
@@ -33,7 +44,16 @@ def inject_from_cli(
     skypilot_config_path: Optional[str] = None,
     yaml_merge_mode: ListMergeMode = ListMergeMode.EXTEND,
     cli_merge_mode: ListMergeMode = ListMergeMode.REPLACE,
-) -> Callable[[Callable[[DictConfig], ReturnedT]], Callable[..., Optional[ReturnedT]]]:
+    cache_dir: Optional[str] = None,
+    cache_max_size: Optional[int] = None,
+    loading_workers: Optional[int] = None,
+    loading_executor: ExecutorKind = ExecutorKind.THREAD,
+    lazy_instantiation: bool = False,
+    instantiation_workers: Optional[int] = None,
+    deduplicate_instances: bool = False,
+    overrides: Optional[Overrides] = None,
+    skypilot_workers: Optional[int] = None,
+) -> Callable[[Callable[[DictConfig], ReturnedT]], Callable[..., Union[ReturnedT, List[Optional[ReturnedT]], None]]]:
     ...  # pragma: no cover
 
 
@@ -44,8 +64,25 @@ def inject_from_cli(
     skypilot_config_path: Optional[str] = None,
     yaml_merge_mode: ListMergeMode = ListMergeMode.EXTEND,
     cli_merge_mode: ListMergeMode = ListMergeMode.REPLACE,
-) -> Callable[[Callable[[Union[InjectedT, DictConfig]], ReturnedT]], Callable[..., Optional[ReturnedT]]]:
-    def cli(inner_function: Callable[[Union[InjectedT, DictConfig]], ReturnedT]) -> Callable[..., Optional[ReturnedT]]:
+    cache_dir: Optional[str] = None,
+    cache_max_size: Optional[int] = None,
+    loading_workers: Optional[int] = None,
+    loading_executor: ExecutorKind = ExecutorKind.THREAD,
+    lazy_instantiation: bool = False,
+    instantiation_workers: Optional[int] = None,
+    deduplicate_instances: bool = False,
+    overrides: Optional[Overrides] = None,
+    skypilot_workers: Optional[int] = None,
+) -> Callable[
+    [Callable[[Union[InjectedT, DictConfig]], ReturnedT]],
+    Callable[..., Union[ReturnedT, List[Optional[ReturnedT]], None]],
+]:
+    # Iterators of overrides are consumed once, and the values are shared by all the calls of the command
+    overrides_config = DictConfig.from_overrides(overrides) if overrides is not None else None
+
+    def cli(
+        inner_function: Callable[[Union[InjectedT, DictConfig]], ReturnedT]
+    ) -> Callable[..., Union[ReturnedT, List[Optional[ReturnedT]], None]]:
         @click.argument("parameters", nargs=-1, type=str, required=False)
         @click.option(
             "-c",
@@ -70,6 +107,12 @@ def inject_from_cli(
             default=True,
             help=configue_cli.PRETTY_PRINT_DOCTRING,
         )
+        @click.option(
+            "--cache/--no-cache",
+            "use_cache",
+            default=True,
+            help=configue_cli.CACHE_DOCSTRING,
+        )
         @click.option(
             "-L",
             "--level",
@@ -86,16 +129,83 @@ def inject_from_cli(
             type=click.Path(writable=True),
             help=configue_cli.OUTPUT_DOCSTRING,
         )
+        @click.option(
+            "--compile",
+            "compile_path",
+            default=None,
+            type=click.Path(writable=True),
+            help=configue_cli.COMPILE_DOCSTRING,
+        )
+        @click.option(
+            "--profile",
+            "profile",
+            default=False,
+            is_flag=True,
+            help=configue_cli.PROFILE_DOCSTRING,
+        )
+        @click.option(
+            "--profile-format",
+            "profile_format",
+            default=ProfileFormat.TABLE.value,
+            type=click.Choice([profile_format.value for profile_format in ProfileFormat]),
+            help=configue_cli.PROFILE_FORMAT_DOCSTRING,
+        )
+        @click.option(
+            "--profile-stats",
+            "profile_stats_path",
+            default=None,
+            type=click.Path(writable=True),
+            help=configue_cli.PROFILE_STATS_DOCSTRING,
+        )
+        @click.option(
+            "-w",
+            "--watch",
+            "watch",
+            default=False,
+            is_flag=True,
+            help=configue_cli.WATCH_DOCSTRING,
+        )
+        @click.option(
+            "-m",
+            "--multirun",
+            "multirun",
+            default=False,
+            is_flag=True,
+            help=configue_cli.MULTIRUN_DOCSTRING,
+        )
+        @click.option(
+            "--multirun-workers",
+            "multirun_workers",
+            default=1,
+            type=click.IntRange(min=1),
+            help=configue_cli.MULTIRUN_WORKERS_DOCSTRING,
+        )
         @click.pass_context
         def wrapped(
             context: click.Context,
             parameters: Tuple[str],
             config_paths: Optional[List[str]] = None,
             output: Optional[Path] = None,
+            compile_path: Optional[str] = None,
             dry_run: bool = False,
             tree_depth: Optional[int] = None,
             pretty_print: bool = True,
-        ) -> Optional[ReturnedT]:
+            use_cache: bool = True,
+            profile: bool = False,
+            profile_format: str = ProfileFormat.TABLE.value,
+            profile_stats_path: Optional[str] = None,
+            watch: bool = False,
+            multirun: bool = False,
+            multirun_workers: int = 1,
+        ) -> Union[ReturnedT, List[Optional[ReturnedT]], None]:
+            cache = None
+            if cache_dir is not None and use_cache:
+                # Hashing and pickling the cached files are only needed if the cache is used
+                from .core.cache import DEFAULT_CACHE_MAX_SIZE, NodeCache
+
+                cache = NodeCache(
+                    cache_dir, max_size=DEFAULT_CACHE_MAX_SIZE if cache_max_size is None else cache_max_size
+                )
             return configue_cli.inject_from_cli(
                 context=context,
                 parameters=parameters,
@@ -110,11 +220,27 @@ def inject_from_cli(
                 skypilot_config_path=skypilot_config_path,
                 yaml_merge_mode=yaml_merge_mode,
                 cli_merge_mode=cli_merge_mode,
+                cache=cache,
+                loading_workers=loading_workers,
+                loading_executor=loading_executor,
+                lazy_instantiation=lazy_instantiation,
+                instantiation_workers=instantiation_workers,
+                deduplicate_instances=deduplicate_instances,
+                overrides=overrides_config,
+                skypilot_workers=skypilot_workers,
+                profile=profile or profile_stats_path is not None,
+                profile_format=ProfileFormat(profile_format),
+                profile_stats_path=profile_stats_path,
+                multirun=multirun,
+                multirun_workers=multirun_workers,
+                compile_path=compile_path,
+                watch=watch,
             )
 
         # click auto-documents the arguments so we only pass the CLI description
         wrapped.__doc__ = configue_cli.CLI_DESCRIPTION
         wrapped.__name__ = inner_function.__name__
+        setattr(wrapped, configue_cli.INNER_FUNCTION_ATTRIBUTE, inner_function)
         return wrapped
 
     return cli
@@ -0,0 +1,63 @@
+import itertools
+import os
+from typing import Any, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+from .exceptions import InvalidArgumentFileError
+
+ARGUMENT_FILE_PREFIX = "@"
+COMMENT_PREFIX = "#"
+
+
+def read_parameters(file_path: str) -> Iterator[str]:
+    """Lazily read the parameters listed in a text file, one per line, skipping empty lines and comments."""
+    with open(file_path, encoding="utf-8") as reader:
+        for line in reader:
+            parameter = line.strip()
+            if parameter and not parameter.startswith(COMMENT_PREFIX):
+                yield parameter
+
+
+def read_overrides(file_path: str) -> Iterator[Tuple[str, Any]]:
+    """Lazily read the values set by a JSON Lines file, in which each line maps dotted keys to JSON values."""
+    from .formats import read_json_lines
+
+    for line_number, overrides in enumerate(read_json_lines(file_path), start=1):
+        if not isinstance(overrides, dict):
+            raise InvalidArgumentFileError(
+                f"{file_path}: expected an object mapping dotted keys to values on line {line_number}"
+            )
+        yield from overrides.items()
+
+
+class ArgumentFiles(NamedTuple):
+    """Command line parameters in which the `@file` arguments are expanded.
+
+    The parameters listed in `@file.txt` text files replace the argument, they can sweep values like any other
+    parameter. `@file.jsonl` files set values that are already typed, which are not parsed as YAML.
+    """
+
+    parameters: List[str]
+    overrides_paths: List[str]
+
+    @classmethod
+    def from_parameters(cls, parameters: Sequence[str]) -> "ArgumentFiles":
+        from .formats import JSON_LINES_SUFFIX
+
+        expanded_parameters: List[str] = []
+        overrides_paths = []
+        for parameter in parameters:
+            if not parameter.startswith(ARGUMENT_FILE_PREFIX):
+                expanded_parameters.append(parameter)
+                continue
+            file_path = parameter[len(ARGUMENT_FILE_PREFIX) :]
+            if not os.path.isfile(file_path):
+                raise InvalidArgumentFileError(f"Argument file {file_path} does not exist")
+            if os.path.splitext(file_path)[1].lower() == JSON_LINES_SUFFIX:
+                overrides_paths.append(file_path)
+            else:
+                expanded_parameters.extend(read_parameters(file_path))
+        return cls(expanded_parameters, overrides_paths)
+
+    def overrides(self) -> Iterable[Tuple[str, Any]]:
+        """Lazily read the values set by the JSON Lines files, in the order the files were given."""
+        return itertools.chain.from_iterable(map(read_overrides, self.overrides_paths))
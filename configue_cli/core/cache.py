@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+Fingerprint = Tuple[int, int, str]
+
+
+class NodeCache:
+    """On-disk cache of the YAML node graphs composed from configuration files.
+
+    The composed nodes are cached rather than the constructed configuration since construction depends on other
+    files (`!import`), on the environment (`${VAR}`) and on the code (`!ext`). Entries are keyed by the absolute path
+    of the file and only used if the file is unchanged: its content hash is only compared if its modification time
+    changed but not its size, so that cache hits do not read the file. The least recently used entries are evicted
+    once the cache grows over `max_size` bytes.
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_CACHE_MAX_SIZE) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+
+    def _entry_path(self, file_path: str) -> str:
+        key = hashlib.sha256(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    @staticmethod
+    def fingerprint(file_path: str) -> Fingerprint:
+        """Return the modification time, size and content hash of a file, stored with its entry."""
+        with open(file_path, "rb") as reader:
+            stat = os.fstat(reader.fileno())
+            digest = hashlib.sha256(reader.read()).hexdigest()
+        return stat.st_mtime_ns, stat.st_size, digest
+
+    def get(self, file_path: str) -> Optional[Any]:
+        stat = os.stat(file_path)
+        entry_path = self._entry_path(file_path)
+        try:
+            with open(entry_path, "rb") as reader:
+                entry = pickle.load(reader)
+        except FileNotFoundError:
+            return None
+        except Exception:  # a corrupted entry is simply ignored, it will be overwritten
+            logger.debug(f"Could not read the cache entry of {file_path}", exc_info=True)
+            return None
+        if entry.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        mtime_ns, size, digest = entry["fingerprint"]
+        if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            # A file that was only touched, e.g. by a checkout, is still the same file
+            if size != stat.st_size or self.fingerprint(file_path)[2] != digest:
+                return None
+        # The modification time of the entries is used to track their last use
+        os.utime(entry_path)
+        return entry["node"]
+
+    def set(self, file_path: str, fingerprint: Fingerprint, node: Any) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {"version": CACHE_FORMAT_VERSION, "fingerprint": fingerprint, "node": node}
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as writer:
+                pickle.dump(entry, writer, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._entry_path(file_path))
+        except Exception:
+            logger.debug(f"Could not write the cache entry of {file_path}", exc_info=True)
+            os.remove(temp_path)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as dir_entries:
+            for dir_entry in dir_entries:
+                if dir_entry.name.endswith(".pickle"):
+                    try:
+                        stat = dir_entry.stat()
+                    except FileNotFoundError:  # removed by a concurrent eviction
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, dir_entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
@@ -0,0 +1,154 @@
+import collections
+import itertools
+import sys
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+DEFAULT_MAX_WORKERS = 8
+
+# Function inherited by the worker processes, see `imap_ordered`
+_worker_function: Optional[Callable[[Any], Any]] = None
+
+
+class ExecutorKind(IntEnum):
+    THREAD = 0
+    PROCESS = 1
+
+
+def _set_worker_function(function: Callable[[Any], Any]) -> None:
+    global _worker_function
+    _worker_function = function
+
+
+def _call_worker_function(item: Any) -> Any:
+    assert _worker_function is not None
+    return _worker_function(item)
+
+
+def imap_ordered(
+    function: Callable[[ItemT], ResultT],
+    items: Iterable[ItemT],
+    *,
+    workers: int = DEFAULT_MAX_WORKERS,
+    executor_kind: ExecutorKind = ExecutorKind.THREAD,
+) -> Iterator[ResultT]:
+    """Lazily apply `function` to `items` concurrently and yield the results in the order of the items.
+
+    Items are consumed as workers become available, with at most two pending items per worker, so `items` can be an
+    arbitrarily long iterator. Threads suit I/O bound functions (e.g. reading files from a network filesystem),
+    processes suit CPU bound ones. On Linux, worker processes are forked: they inherit `function` and the data it
+    references instead of receiving a pickled copy for every item; otherwise `function` must be picklable. Items and
+    results must be picklable in any case. The items are processed sequentially in the current thread if `workers`
+    is 1.
+    """
+    if workers <= 1:
+        yield from map(function, items)
+        return
+
+    import multiprocessing
+    from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+    executor: Executor
+    submitted_function: Callable[[Any], Any] = function
+    # Forking a process running threads is unsafe on macOS, where CPython spawns the worker processes by default
+    if executor_kind == ExecutorKind.PROCESS and sys.platform.startswith("linux"):
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_set_worker_function,
+            initargs=(function,),
+        )
+        submitted_function = _call_worker_function
+    elif executor_kind == ExecutorKind.PROCESS:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    iterator = iter(items)
+    with executor:
+        pending: Deque[Future] = collections.deque(
+            executor.submit(submitted_function, item) for item in itertools.islice(iterator, 2 * workers)
+        )
+        while pending:
+            result = pending.popleft().result()
+            for item in itertools.islice(iterator, 1):
+                pending.append(executor.submit(submitted_function, item))
+            yield result
+
+
+def map_ordered(
+    function: Callable[[ItemT], ResultT],
+    items: Sequence[ItemT],
+    *,
+    workers: Optional[int] = None,
+    executor_kind: ExecutorKind = ExecutorKind.THREAD,
+) -> List[ResultT]:
+    """Apply `function` to all `items` concurrently and return the results in the order of the items.
+
+    `workers` defaults to the number of items, up to `DEFAULT_MAX_WORKERS`. See `imap_ordered` for the constraints of
+    each kind of executor.
+    """
+    n_workers = min(workers if workers is not None else DEFAULT_MAX_WORKERS, len(items))
+    return list(imap_ordered(function, items, workers=n_workers, executor_kind=executor_kind))
+
+
+def run_task_graph(
+    tasks: Sequence[Callable[[], ResultT]],
+    dependencies: Sequence[Iterable[int]],
+    *,
+    workers: int = DEFAULT_MAX_WORKERS,
+) -> List[ResultT]:
+    """Run tasks in a thread pool as soon as the tasks they depend on are done, and return their results in order.
+
+    `dependencies[index]` holds the indices of the tasks that must be done before running `tasks[index]`, which must
+    all be lower than `index`: running the tasks one after the other in the order of their indices is always valid,
+    and is what happens if `workers` is 1. Ready tasks are started in the order of their indices. If tasks fail, no
+    task is started past the first failed one, and the exception of the failed task with the lowest index is raised,
+    which is the exception a sequential run would raise.
+    """
+    if workers <= 1:
+        return [task() for task in tasks]
+
+    from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+    remaining_dependencies = []
+    dependents: List[List[int]] = [[] for _ in tasks]
+    for index, task_dependencies in enumerate(dependencies):
+        unique_dependencies = set(task_dependencies)
+        remaining_dependencies.append(len(unique_dependencies))
+        for dependency in unique_dependencies:
+            dependents[dependency].append(index)
+
+    results: List[Any] = [None] * len(tasks)
+    errors: Dict[int, BaseException] = {}
+    ready = [index for index, count in enumerate(remaining_dependencies) if count == 0]
+    running: Dict[Future, int] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while ready or running:
+            # The tasks following a failed one are never started, the ones preceding it are run to find the first error
+            first_error = min(errors, default=len(tasks))
+            for index in ready:
+                if index < first_error:
+                    running[executor.submit(tasks[index])] = index
+            ready = []
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                exception = future.exception()
+                if exception is not None:
+                    errors[index] = exception
+                    continue
+                results[index] = future.result()
+                for dependent in dependents[index]:
+                    remaining_dependencies[dependent] -= 1
+                    if remaining_dependencies[dependent] == 0:
+                        ready.append(dependent)
+            ready.sort()
+    if errors:
+        raise errors[min(errors)]
+    return results
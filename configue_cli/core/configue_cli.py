@@ -1,16 +1,19 @@
+import functools
 import logging
-import logging.config
-import tempfile
 from pathlib import Path
-from typing import Callable, List, Optional, Tuple, Type, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence, Tuple, Type, TypeVar, Union, cast
 
 import click
-import yaml
 
+from .concurrency import ExecutorKind, imap_ordered
 from .dict_config import DictConfig, ListMergeMode
-from .dumper import ConfigueDumper
-from .loader import load_from_config, load_from_path
-from .render import render
+from .profiler import ProfileFormat, Profiler
+
+if TYPE_CHECKING:
+    from .cache import NodeCache
+    from .loader import ResolutionContext
+    from .skypilot import ConfigArtifact, SkyPilotSubmission
+    from .watch import ConfigFiles
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +24,36 @@ PARAMETERS_DOCSTRING = """\
 Parameters key-value pairs in dotted notation: module.param1=value1 module.submodule.param2=value2
 """
 CONFIG_PATHS_DOCSTRING = (
-    "Path to a YAML file containing a configuration; multiple configurations can be specified with "
-    "additional -c/--config flags, they will be merged in the order they are provided."
+    "Path to a YAML, JSON or TOML file containing a configuration or to a snapshot compiled with --compile; multiple "
+    "configurations can be specified with additional -c/--config flags, they will be merged in the order they are "
+    "provided."
+)
+OUTPUT_DOCSTRING = (
+    "Path to an output file used to save the final configuration, in YAML or in the format given by its extension: "
+    ".json, .msgpack or .jsonl, to which the configuration is appended as a line."
+)
+COMPILE_DOCSTRING = (
+    "Path to an output binary snapshot (.cfgc) of the merged configuration, which can be loaded with -c/--config "
+    "without parsing and merging the configuration again."
 )
-OUTPUT_DOCSTRING = "Path to an output YAML file used to save the final configuration."
 DRY_RUN_DOCSTRING = "Print the final configuration but do not run the command."
 PRETTY_PRINT_DOCTRING = "Enable/disable pretty printing."
 TREE_DEPTH_DOCSTRING = "Only print the first levels of the configuration tree."
+CACHE_DOCSTRING = "Enable/disable the cache of parsed YAML files (only used if a cache directory is configured)."
+PROFILE_DOCSTRING = "Print the time and peak memory usage of each step of the configuration resolution."
+PROFILE_FORMAT_DOCSTRING = "Format of the profiling report: a table printed after the configuration or a JSON line."
+PROFILE_STATS_DOCSTRING = "Path to an output file where cProfile statistics of the configuration resolution are saved."
+WATCH_DOCSTRING = (
+    "Run the command again, or print the configuration again with --dry-run, every time the configuration files or "
+    "the files they reference are modified."
+)
+MULTIRUN_DOCSTRING = (
+    "Run the command once for each combination of the swept parameters, e.g. model.batch_size=16,32,64 or "
+    "optimizer.warmup_steps=range(0,1000,100)."
+)
+MULTIRUN_WORKERS_DOCSTRING = "Number of processes executing the runs of a multirun in parallel."
+# Attribute of the click callback holding the function decorated with `inject_from_cli`
+INNER_FUNCTION_ATTRIBUTE = "__configue_inner_function__"
 
 InjectedT = TypeVar("InjectedT")
 ReturnedT = TypeVar("ReturnedT")
@@ -48,106 +74,410 @@ def inject_from_cli(
     skypilot_config_path: Optional[str] = None,
     yaml_merge_mode: ListMergeMode = ListMergeMode.EXTEND,
     cli_merge_mode: ListMergeMode = ListMergeMode.REPLACE,
-) -> Optional[ReturnedT]:
-    base_config = DictConfig({})
-
-    # Step 1: Load configurations from YAML files
-    yaml_configs = []
-    _config_paths = config_paths or []
-    for config_path in _config_paths:
-        yaml_configs.append(load_from_path(config_path, instantiate=False))
-    base_config.merge(*yaml_configs, mode=yaml_merge_mode)
-
-    # Step 2: Append a configuration generated from command line arguments (if any)
-    cli_configs = []
-    _parameters = parameters or ()
-    if len(_parameters) > 0:
-        cli_configs.append(DictConfig.from_dotlist(_parameters))
-    base_config.merge(*cli_configs, mode=cli_merge_mode)
+    cache: Optional["NodeCache"] = None,
+    loading_workers: Optional[int] = None,
+    loading_executor: ExecutorKind = ExecutorKind.THREAD,
+    lazy_instantiation: bool = False,
+    instantiation_workers: Optional[int] = None,
+    deduplicate_instances: bool = False,
+    overrides: Optional[DictConfig] = None,
+    skypilot_workers: Optional[int] = None,
+    profile: bool = False,
+    profile_format: ProfileFormat = ProfileFormat.TABLE,
+    profile_stats_path: Optional[str] = None,
+    multirun: bool = False,
+    multirun_workers: int = 1,
+    compile_path: Optional[str] = None,
+    watch: bool = False,
+) -> Union[ReturnedT, List[Optional[ReturnedT]], None]:
+    from .watch import ConfigFiles
+
+    config_files = ConfigFiles(config_paths or [], cache=cache, workers=loading_workers, executor_kind=loading_executor)
+    inject = functools.partial(
+        _inject,
+        config_files,
+        context=context,
+        inner_function=inner_function,
+        parameters=parameters or (),
+        output=output,
+        dry_run=dry_run,
+        pretty_print=pretty_print,
+        target_type=target_type,
+        tree_depth=tree_depth,
+        logging_config_path=logging_config_path,
+        skypilot_config_path=skypilot_config_path,
+        yaml_merge_mode=yaml_merge_mode,
+        cli_merge_mode=cli_merge_mode,
+        overrides=overrides,
+        skypilot_workers=skypilot_workers,
+        lazy_instantiation=lazy_instantiation,
+        instantiation_workers=instantiation_workers,
+        deduplicate_instances=deduplicate_instances,
+        profile=profile,
+        profile_format=profile_format,
+        profile_stats_path=profile_stats_path,
+        multirun=multirun,
+        multirun_workers=multirun_workers,
+        compile_path=compile_path,
+    )
+    if not watch:
+        return inject()
+    from .watch import watch as watch_config_files
+
+    # Only the configuration files depending on the modified files are loaded again
+    watch_config_files(inject, config_files)
+    return None
+
+
+def _inject(
+    config_files: "ConfigFiles",
+    *,
+    context: click.Context,
+    inner_function: Callable[[Union[InjectedT, DictConfig]], ReturnedT],
+    parameters: Tuple[str, ...],
+    output: Optional[Path],
+    dry_run: bool,
+    pretty_print: bool,
+    target_type: Optional[Type[InjectedT]],
+    tree_depth: Optional[int],
+    logging_config_path: Optional[str],
+    skypilot_config_path: Optional[str],
+    yaml_merge_mode: ListMergeMode,
+    cli_merge_mode: ListMergeMode,
+    overrides: Optional[DictConfig],
+    skypilot_workers: Optional[int],
+    lazy_instantiation: bool,
+    instantiation_workers: Optional[int],
+    deduplicate_instances: bool,
+    profile: bool,
+    profile_format: ProfileFormat,
+    profile_stats_path: Optional[str],
+    multirun: bool,
+    multirun_workers: int,
+    compile_path: Optional[str],
+) -> Union[ReturnedT, List[Optional[ReturnedT]], None]:
+    from .argument_files import ArgumentFiles
+    from .sweep import Sweep
+
+    argument_files = ArgumentFiles.from_parameters(parameters)
+    sweep = Sweep.from_parameters(argument_files.parameters) if multirun else Sweep(argument_files.parameters, [])
+    resolve = functools.partial(
+        _resolve,
+        command_path=context.command_path,
+        config_paths=config_files.config_paths,
+        resolution_context=config_files.context,
+        dry_run=dry_run,
+        pretty_print=pretty_print,
+        target_type=target_type,
+        tree_depth=tree_depth,
+        logging_config_path=logging_config_path,
+        skypilot_config_path=skypilot_config_path,
+        lazy_instantiation=lazy_instantiation,
+        instantiation_workers=instantiation_workers,
+        deduplicate_instances=deduplicate_instances,
+    )
+
+    with Profiler(profile, profile_format=profile_format, stats_path=profile_stats_path) as profiler:
+        base_config = DictConfig({})
+
+        # Step 1: Load configurations from YAML files
+        with profiler.step("Load YAML files"):
+            # The files are read and parsed concurrently but merged in the order they are provided
+            base_config.merge(*config_files.load(), mode=yaml_merge_mode)
+
+        # Step 2: Append a configuration generated from command line arguments (if any)
+        # In a multirun, the swept parameters are merged for each run
+        with profiler.step("Parse command line parameters"):
+            # Values set in memory and in JSON Lines argument files are already typed, they are merged first
+            cli_configs = [] if overrides is None else [overrides]
+            if len(argument_files.overrides_paths) > 0:
+                cli_configs.append(DictConfig.from_overrides(argument_files.overrides()))
+            if len(sweep.fixed_parameters) > 0:
+                cli_configs.append(DictConfig.from_dotlist(sweep.fixed_parameters, context=config_files.context))
+            base_config.merge(*cli_configs, mode=cli_merge_mode)
+
+        if compile_path is not None:
+            from .snapshot import compute_source_hash, write_snapshot
+
+            with profiler.step("Compile"):
+                source_hash = compute_source_hash(
+                    config_files.config_paths + argument_files.overrides_paths, sweep.fixed_parameters
+                )
+                write_snapshot(compile_path, base_config, source_hash)
+
+        if not multirun:
+            injected_object = resolve(base_config, parameters, output=output, profiler=profiler)
+        else:
+            # The merged configuration is shared by all the runs, which are executed in the order of the combinations
+            run = functools.partial(
+                _run_combination,
+                resolve=resolve,
+                context=config_files.context,
+                inner_function=_InnerFunction(inner_function),
+                base_config=base_config,
+                fixed_parameters=sweep.fixed_parameters,
+                cli_merge_mode=cli_merge_mode,
+                output=output,
+            )
+            with profiler.step("Run sweep"):
+                results: List[Any] = list(
+                    imap_ordered(
+                        run,
+                        enumerate(sweep.combinations()),
+                        workers=1 if dry_run else multirun_workers,
+                        executor_kind=ExecutorKind.PROCESS,
+                    )
+                )
+            from .skypilot import SkyPilotSubmission
+            from .skypilot import submit as submit_skypilot_tasks
+
+            submissions = [result for result in results if isinstance(result, SkyPilotSubmission)]
+            if len(submissions) > 0:
+                with profiler.step("Submit SkyPilot tasks"):
+                    submit_skypilot_tasks(submissions, workers=skypilot_workers)
+                results = [None if isinstance(result, SkyPilotSubmission) else result for result in results]
+
+    if multirun and dry_run:
+        return None
+    if multirun:
+        return results
+    # SkyPilot submissions are only deferred in multiruns, otherwise the task is submitted and `None` is returned
+    if injected_object is None:
+        return None
+    return inner_function(cast(Union[InjectedT, DictConfig], injected_object))
+
+
+class _InnerFunction:
+    """Function decorated with `inject_from_cli`, pickled by reference for the runs of sweeps in spawned processes.
+
+    Once decorated, the name of the function refers to the click command: the function is found back through the
+    callback of the command.
+    """
+
+    __slots__ = ("function",)
+
+    def __init__(self, function: Callable[[Any], Any]) -> None:
+        self.function = function
+
+    def __call__(self, injected_object: Any) -> Any:
+        return self.function(injected_object)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        if "<locals>" in self.function.__qualname__:
+            return _InnerFunction, (self.function,)
+        return _find_inner_function, (self.function.__module__, self.function.__qualname__)
+
+
+def _find_inner_function(module_name: str, qualified_name: str) -> _InnerFunction:
+    import importlib
+
+    value: Any = importlib.import_module(module_name)
+    for name in qualified_name.split("."):
+        value = getattr(value, name)
+    callback = getattr(value, "callback", value)
+    return _InnerFunction(getattr(callback, INNER_FUNCTION_ATTRIBUTE, callback))
+
+
+def _run_combination(
+    indexed_parameters: Tuple[int, List[str]],
+    *,
+    resolve: Callable[..., Any],
+    context: "ResolutionContext",
+    inner_function: Callable[[Any], Any],
+    base_config: DictConfig,
+    fixed_parameters: List[str],
+    cli_merge_mode: ListMergeMode,
+    output: Optional[Path],
+) -> Any:
+    from .formats import JSON_LINES_SUFFIX
+    from .skypilot import SkyPilotSubmission
+
+    index, swept_parameters = indexed_parameters
+    config = DictConfig(base_config)
+    config.merge(DictConfig.from_dotlist(swept_parameters, context=context), mode=cli_merge_mode)
+    if output and Path(output).suffix != JSON_LINES_SUFFIX:
+        # Each run exports its configuration to its own file: output.yml -> output.0.yml, output.1.yml... while JSON
+        # Lines files are logs to which all the runs append their configuration
+        output = Path(output).with_suffix(f".{index}{Path(output).suffix}")
+    injected_object = resolve(
+        config,
+        fixed_parameters + swept_parameters,
+        output=output,
+        title_suffix=f" ({', '.join(swept_parameters)})",
+        # The SkyPilot tasks of the runs are submitted at once after all the runs are resolved
+        defer_skypilot_submission=True,
+    )
+    if injected_object is None or isinstance(injected_object, SkyPilotSubmission):
+        return injected_object
+    return inner_function(injected_object)
+
+
+def _resolve(
+    base_config: DictConfig,
+    parameters: Sequence[str],
+    *,
+    command_path: str,
+    config_paths: List[str],
+    resolution_context: "ResolutionContext",
+    output: Optional[Path],
+    dry_run: bool,
+    pretty_print: bool,
+    target_type: Optional[Type[InjectedT]],
+    tree_depth: Optional[int],
+    logging_config_path: Optional[str],
+    skypilot_config_path: Optional[str],
+    lazy_instantiation: bool,
+    instantiation_workers: Optional[int],
+    deduplicate_instances: bool,
+    profiler: Optional[Profiler] = None,
+    title_suffix: str = "",
+    defer_skypilot_submission: bool = False,
+) -> Union[InjectedT, DictConfig, "SkyPilotSubmission", None]:
+    """Build the object injected in the wrapped function from the merged YAML and command line configurations.
+
+    Return `None` if the wrapped function should not be called (dry runs and SkyPilot submissions). With
+    `defer_skypilot_submission`, the SkyPilot task is returned instead of being submitted.
+    """
+    from .formats import export_config
+    from .loader import load_from_config
+    from .render import render
+    from .validation import validate
+
+    profiler = profiler if profiler is not None else Profiler()
 
     # Step 3: Deduce remaining arguments by recursively traversing the dataclasses
     # We skip this step if the arguments are injected in an unstructured config
-    if target_type is None:
-        config = base_config
-    else:
-        config = DictConfig.from_type(target_type, initial_config=base_config)  # type: ignore[arg-type]
-        config.pop("()")
-        config.merge(base_config, mode=ListMergeMode.REPLACE)
+    with profiler.step("Traverse dataclasses"):
+        if target_type is None:
+            config = DictConfig(base_config)
+        else:
+            config = DictConfig.from_type(target_type, initial_config=base_config)  # type: ignore[arg-type]
+            config.pop("()")
+            config.merge(base_config, mode=ListMergeMode.REPLACE)
+
+    # Fail before instantiating anything if some mandatory values are missing
+    if not dry_run:
+        with profiler.step("Validate"):
+            validate(config)
 
     # Step 4: Load the logging configuration (if any)
-    if logging_config_path is None:
-        logging_config = DictConfig({})
-    elif logging_config_path in config:
-        logging_config = DictConfig(config.pop(logging_config_path))
-        logging.captureWarnings(True)
-        logging.config.dictConfig(load_from_config(logging_config, instantiate=True))
-        logging_config = DictConfig({logging_config_path: logging_config})
-    else:
-        logger.warning(f"`{logging_config_path}` was not found in the config, skip logging configuration")
-        logging_config = DictConfig({})
+    with profiler.step("Configure logging"):
+        if logging_config_path is None:
+            logging_config = DictConfig({})
+        elif logging_config_path in config:
+            import logging.config
+
+            logging_config = DictConfig(config.pop(logging_config_path))
+            logging.captureWarnings(True)
+            logging.config.dictConfig(load_from_config(logging_config, instantiate=True))
+            logging_config = DictConfig({logging_config_path: logging_config})
+        else:
+            logger.warning(f"`{logging_config_path}` was not found in the config, skip logging configuration")
+            logging_config = DictConfig({})
 
     if dry_run:
         config.merge(logging_config, mode=ListMergeMode.REPLACE)
-        render(
-            config,
-            title="Configuration helper",
-            throw_on_missing_value=False,
-            pretty_print=pretty_print,
-            depth=tree_depth,
-        )
+        with profiler.step("Render"):
+            render(
+                config,
+                title="Configuration helper" + title_suffix,
+                throw_on_missing_value=False,
+                pretty_print=pretty_print,
+                depth=tree_depth,
+            )
         return None
 
     # Step 5: Create and execute a SkyPilot task
     if skypilot_config_path is not None and skypilot_config_path in config:
         sky_config = load_from_config(DictConfig(config.pop(skypilot_config_path)), instantiate=True)
         if sky_config.get("submit", True):
+            from .skypilot import SkyPilotSubmission
+            from .skypilot import submit as submit_skypilot_tasks
+
             task_config = sky_config.get("task")
-            # Interpolate the current command into the Skypilot `run` command
-            task_config["run"] = task_config["run"].format(
-                command=context.command_path,
-                parameters=" ".join(
-                    [f"-c {config_path}" for config_path in _config_paths]
-                    + list(_parameters)
+            temporary_paths = []
+            if sky_config.get("ship-config", True):
+                # The merged configuration is mounted on the remote nodes, so that the remote command neither parses
+                # the configuration files again nor depends on their copies in the workdir
+                with profiler.step("Ship configuration"):
+                    artifact = _ship_config(
+                        base_config,
+                        task_config.get("workdir"),
+                        skypilot_config_path,
+                        config_paths,
+                        parameters,
+                        resolution_context,
+                    )
+                task_config["file_mounts"] = {
+                    **task_config.get("file_mounts", {}),
+                    artifact.remote_path: artifact.local_path,
+                }
+                temporary_paths.append(artifact.local_path)
+                remote_parameters = [f"-c {artifact.remote_path}"]
+            else:
+                remote_parameters = (
+                    [f"-c {config_path}" for config_path in config_paths]
+                    + list(parameters)
                     + [f"{skypilot_config_path}.submit=false"]
-                ),
-            )
-            logger.info(f"Submitting command {task_config['run']} to {sky_config.get('cluster-name')}")
-            try:  # pragma: no cover
-                import sky
-            except ImportError as exc:  # pragma: no cover
-                raise ImportError("skypilot is not installed, use `pip install skypilot`") from exc
-            with tempfile.NamedTemporaryFile(suffix=".yml", mode="w") as sky_file:
-                yaml.safe_dump(task_config, sky_file)
-                task = sky.Task.from_yaml(sky_file.name)
-            sky.exec(
-                task,
-                cluster_name=sky_config.get("cluster-name"),
-                dryrun=sky_config.get("dryrun", False),
-                down=sky_config.get("down", False),
-                stream_logs=sky_config.get("stream-logs", True),
-            )
+                )
+            # Interpolate the current command into the Skypilot `run` command
+            task_config["run"] = task_config["run"].format(command=command_path, parameters=" ".join(remote_parameters))
+            submission = SkyPilotSubmission.from_config(sky_config, temporary_paths)
+            if defer_skypilot_submission:
+                return submission
+            logger.info(f"Submitting command {task_config['run']} to {submission.cluster_name}")
+            with profiler.step("Submit SkyPilot task"):
+                submit_skypilot_tasks([submission])
             return None
     elif skypilot_config_path is not None:
         logger.warning(f"`{skypilot_config_path}` was not found in the config, skip SkyPilot configuration")
 
     # Step 6: Create the final object
-    injected_object: Union[InjectedT, DictConfig] = (
-        target_type(**load_from_config(config, instantiate=True))
-        if target_type is not None
-        else DictConfig(**load_from_config(config, instantiate=True))
-    )
+    with profiler.step("Instantiate"):
+        instance = load_from_config(
+            config,
+            instantiate=True,
+            lazy=lazy_instantiation,
+            workers=instantiation_workers,
+            deduplicate=deduplicate_instances,
+        )
+        injected_object: Union[InjectedT, DictConfig] = (
+            target_type(**instance) if target_type is not None else DictConfig(**instance)
+        )
     config.merge(logging_config, mode=ListMergeMode.REPLACE)
 
     if output:
-        with open(output, "w", encoding="utf-8") as writer:
-            writer.write(ConfigueDumper.from_config(config))
+        with profiler.step("Export"):
+            export_config(str(output), config)
 
-    render(
-        config,
-        title="Configuration",
-        throw_on_missing_value=True,
-        pretty_print=pretty_print,
-        depth=tree_depth,
-    )
+    with profiler.step("Render"):
+        render(
+            config,
+            title="Configuration" + title_suffix,
+            throw_on_missing_value=False,
+            pretty_print=pretty_print,
+            depth=tree_depth,
+        )
 
-    return inner_function(injected_object)
+    return injected_object
+
+
+def _ship_config(
+    base_config: DictConfig,
+    workdir: Optional[str],
+    skypilot_config_path: str,
+    config_paths: List[str],
+    parameters: Sequence[str],
+    resolution_context: "ResolutionContext",
+) -> "ConfigArtifact":
+    """Snapshot the merged configuration of a run, which the remote command must not submit again."""
+    from .skypilot import write_config_artifact
+    from .snapshot import compute_source_hash
+
+    config = DictConfig(base_config)
+    config.merge(DictConfig({skypilot_config_path: {"submit": False}}), mode=ListMergeMode.REPLACE)
+    # Only the values resolved with `!path` or `!import` are paths to make relative to the workdir
+    local_paths = set().union(*resolution_context.dependencies.values())
+    return write_config_artifact(
+        config, compute_source_hash(config_paths, parameters), workdir=workdir, local_paths=local_paths
+    )
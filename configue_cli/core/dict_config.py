@@ -4,13 +4,32 @@ import functools
 from collections.abc import Mapping
 from enum import IntEnum
 from functools import reduce
-from typing import Any, Dict, MutableMapping, Optional, Sequence, Type
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    ItemsView,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    ValuesView,
+)
 
-import yaml
+if TYPE_CHECKING:
+    from .loader import ResolutionContext
+    from .traversers import DataclassInstance
 
-from .dumper import ConfigueDumper
-from .loader import load_from_string
-from .traversers import DataclassInstance, Traverser
+
+_NO_DEFAULT = object()
+
+# Values set by dotted key, as a mapping or as pairs
+Overrides = Union[Mapping, Iterable[Tuple[str, Any]]]
 
 
 class ListMergeMode(IntEnum):
@@ -18,39 +37,255 @@ class ListMergeMode(IntEnum):
     REPLACE = 1
 
 
+def _share(value: Any) -> Any:
+    """Prepare a value to be referenced by one more mapping.
+
+    `DictConfig` subtrees are shared and copied lazily by the mapping that writes to them, other containers are copied.
+    """
+    if isinstance(value, DictConfig):
+        value._shared = True
+        return value
+    return _wrap(value)
+
+
+def _wrap(value: Any) -> Any:
+    """Prepare a value coming from outside of a configuration to be stored in it.
+
+    The given `DictConfig` is still referenced by its owner, which can modify it directly: it is copied shallowly and
+    only its subtrees are shared.
+    """
+    if isinstance(value, DictConfig):
+        return value._detach()
+    if isinstance(value, dict):
+        return DictConfig(value)
+    if isinstance(value, list):
+        return _copy_list(value)
+    return value
+
+
+def _copy_list(values: List[Any]) -> List[Any]:
+    # Lists are not copied on write, so they are copied eagerly along with the mappings they contain
+    return [_copy_list_item(value) for value in values]
+
+
+def _copy_list_item(value: Any) -> Any:
+    if isinstance(value, DictConfig):
+        return value._detach()
+    if isinstance(value, dict):
+        return {key: _copy_list_item(sub_value) for key, sub_value in value.items()}
+    if isinstance(value, list):
+        return _copy_list(value)
+    return value
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_path(path: str) -> Tuple[str, ...]:
+    return tuple(path.split("."))
+
+
+def _get_item(container: Any, key: str, path: str) -> Any:
+    """Return the value of a key of a mapping other than a dictionary, or the item of a list at the index `key`."""
+    if isinstance(container, list):
+        try:
+            return container[int(key)]
+        except (ValueError, IndexError):
+            raise KeyError(path) from None
+    if isinstance(container, Mapping):
+        return container[key]
+    raise KeyError(path)
+
+
 def _deepmerge(destination: DictConfig, source: Mapping, mode: ListMergeMode) -> DictConfig:
-    for key in source:
-        if key in destination:
-            if isinstance(destination[key], MutableMapping) and isinstance(source[key], Mapping):
-                _deepmerge(destination[key], source[key], mode)
-            elif isinstance(destination[key], list) and isinstance(source[key], list) and mode == ListMergeMode.EXTEND:
-                destination[key].extend(source[key])
-            elif destination[key] is source[key]:
-                pass
-            else:
-                destination[key] = source[key]
+    # The merge works on the underlying dictionaries so that the unchanged subtrees of `source` are shared rather than
+    # copied, its cost is proportional to the size of `source`
+    source_items = dict.items(source) if isinstance(source, dict) else source.items()
+    for key, source_value in source_items:
+        if key not in destination:
+            dict.__setitem__(destination, key, _wrap(source_value))
+            continue
+
+        destination_value = dict.__getitem__(destination, key)
+        if isinstance(destination_value, MutableMapping) and isinstance(source_value, Mapping):
+            if not isinstance(destination_value, DictConfig) or destination_value._shared:
+                destination_value = destination._privatize(key, destination_value)
+            _deepmerge(destination_value, source_value, mode)
+        elif isinstance(destination_value, list) and isinstance(source_value, list) and mode == ListMergeMode.EXTEND:
+            dict.__setitem__(destination, key, destination_value + _copy_list(source_value))
+        elif destination_value is source_value:
+            pass
         else:
-            destination[key] = source[key]
+            dict.__setitem__(destination, key, _wrap(source_value))
     return destination
 
 
 class DictConfig(Dict[str, Any]):
+    """A configuration tree whose nested mappings are `DictConfig` objects.
+
+    Subtrees are structurally shared between configurations: building a configuration from another one or merging
+    configurations links the existing subtrees instead of copying them. A shared subtree is copied (shallowly) the
+    first time it is accessed through one of its parents, so that modifying a configuration never affects the
+    configurations it shares subtrees with. A `DictConfig` given as a value is copied shallowly, since its owner may
+    still modify it directly.
+    """
+
+    _shared = False
+
     def __init__(self, *args: Dict[str, Any], **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
-        for key, value in self.items():
-            if isinstance(value, dict):
-                self[key] = self.__class__(value)
+        if len(args) == 1 and not kwargs and isinstance(args[0], DictConfig):
+            # The subtrees of another configuration are shared as they are, without being copied by `__getitem__`
+            super().__init__(dict.items(args[0]))
+            share = _share
+        else:
+            super().__init__(*args, **kwargs)
+            share = _wrap
+        for key, value in list(dict.items(self)):
+            if isinstance(value, (dict, list)):
+                dict.__setitem__(self, key, share(value))
+
+    def _privatize(self, key: str, value: Mapping) -> DictConfig:
+        private_value = value._detach() if isinstance(value, DictConfig) else DictConfig(dict(value))
+        dict.__setitem__(self, key, private_value)
+        return private_value
+
+    def _privatize_values(self) -> None:
+        for key, value in list(dict.items(self)):
+            if isinstance(value, DictConfig) and value._shared:
+                self._privatize(key, value)
+
+    def _detach(self) -> DictConfig:
+        copy = self.__class__()
+        for key, value in dict.items(self):
+            dict.__setitem__(copy, key, _share(value))
+        return copy
+
+    def __iter__(self) -> Iterator[str]:
+        # Overriding `__iter__` makes `dict(config)` and `**config` read the values through `__getitem__`, instead of
+        # returning the shared subtrees
+        return dict.__iter__(self)
+
+    def __getitem__(self, key: str) -> Any:
+        value = dict.__getitem__(self, key)
+        if isinstance(value, DictConfig) and value._shared:
+            return self._privatize(key, value)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return super().setdefault(key, default)
+
+    def pop(self, key: str, *args: Any) -> Any:
+        value = super().pop(key, *args)
+        if isinstance(value, DictConfig) and value._shared:
+            return value._detach()
+        return value
+
+    def popitem(self) -> Tuple[str, Any]:
+        key, value = super().popitem()
+        if isinstance(value, DictConfig) and value._shared:
+            return key, value._detach()
+        return key, value
+
+    def values(self) -> ValuesView[Any]:  # type: ignore[override]
+        self._privatize_values()
+        return dict.values(self)
+
+    def items(self) -> ItemsView[str, Any]:  # type: ignore[override]
+        self._privatize_values()
+        return dict.items(self)
+
+    def copy(self) -> DictConfig:
+        return self._detach()
+
+    def __copy__(self) -> DictConfig:
+        return self._detach()
+
+    def get_path(self, path: str, default: Any = _NO_DEFAULT) -> Any:
+        """Return the value at a dotted path, e.g. `model.layers.0.size` where `layers` is a list.
+
+        Raise a `KeyError` if there is no value at this path and no `default` is given.
+        """
+        value: Any = self
+        try:
+            for key in _split_path(path):
+                # Shared subtrees are copied on the way by `DictConfig.__getitem__`
+                value = value[key] if isinstance(value, dict) else _get_item(value, key, path)
+        except KeyError:
+            if default is _NO_DEFAULT:
+                raise KeyError(path) from None
+            return default
+        return value
+
+    def has_path(self, path: str) -> bool:
+        value: Any = self
+        try:
+            for key in _split_path(path):
+                # The value is only read, shared subtrees do not need to be copied
+                value = dict.__getitem__(value, key) if isinstance(value, dict) else _get_item(value, key, path)
+        except KeyError:
+            return False
+        return True
+
+    def set_path(self, path: str, value: Any) -> None:
+        """Set the value at a dotted path, creating the missing mappings on the way."""
+        *parent_keys, last_key = _split_path(path)
+        container: Any = self
+        for key in parent_keys:
+            if isinstance(container, dict):
+                if key not in container:
+                    container[key] = self.__class__()
+                container = container[key]
+            else:
+                container = _get_item(container, key, path)
+        if isinstance(container, (dict, MutableMapping)):
+            container[last_key] = value
+        elif isinstance(container, list):
+            try:
+                container[int(last_key)] = value
+            except (ValueError, IndexError):
+                raise KeyError(path) from None
+        else:
+            raise KeyError(path)
+
+    def delete_path(self, path: str) -> None:
+        *parent_keys, last_key = _split_path(path)
+        container: Any = self
+        try:
+            for key in parent_keys:
+                container = container[key] if isinstance(container, dict) else _get_item(container, key, path)
+        except KeyError:
+            raise KeyError(path) from None
+        if isinstance(container, (dict, MutableMapping)) and last_key in container:
+            del container[last_key]
+        elif isinstance(container, list):
+            try:
+                del container[int(last_key)]
+            except (ValueError, IndexError):
+                raise KeyError(path) from None
+        else:
+            raise KeyError(path)
 
     def to_configue(self) -> str:
-        return ConfigueDumper.from_pyyaml(yaml.dump(self, Dumper=yaml.Dumper, sort_keys=False))
+        from .dumper import ConfigueDumper
+
+        return ConfigueDumper.from_config(self)
 
     @classmethod
     def from_type(cls, type_: Type[DataclassInstance], initial_config: Optional[Dict[str, Any]] = None) -> DictConfig:
+        from .traversers import Traverser
+
         config, _ = Traverser.traverse_type(type_, initial_config)
         return cls(**config)
 
     @classmethod
-    def from_dotlist(cls, dotlist: Sequence[str]) -> DictConfig:
+    def from_dotlist(cls, dotlist: Sequence[str], context: Optional[ResolutionContext] = None) -> DictConfig:
+        from .loader import load_from_string
+
         config = cls()
         for arg in dotlist:
             idx = arg.find("=")
@@ -60,19 +295,28 @@ class DictConfig(Dict[str, Any]):
             else:
                 key = arg[0:idx]
                 value = arg[idx + 1 :]
-                value = load_from_string(value.strip("\"'"), instantiate=False)
-
-            subkeys = key.split(".")
-            sub_config = config
-            for subkey in subkeys[:-1]:
-                if subkey not in sub_config:
-                    sub_config[subkey] = cls()
-                sub_config = sub_config[subkey]
-            sub_config[subkeys[-1]] = value
+                value = load_from_string(value.strip("\"'"), instantiate=False, context=context)
+
+            config.set_path(key, value)
+        return config
+
+    @classmethod
+    def from_overrides(cls, overrides: Overrides) -> DictConfig:
+        """Build a configuration from values that are already parsed, set by dotted key in the given order.
+
+        Unlike `from_dotlist`, the values are used as is instead of being parsed as YAML, and `overrides` can be an
+        iterator, e.g. over the lines of a file.
+        """
+        config = cls()
+        items = overrides.items() if isinstance(overrides, Mapping) else overrides
+        for path, value in items:
+            config.set_path(path, _wrap(value))
         return config
 
     def merge(self, *configs: DictConfig, mode: ListMergeMode = ListMergeMode.EXTEND) -> None:
         reduce(functools.partial(_deepmerge, mode=mode), configs, self)
 
 
-yaml.add_representer(DictConfig, lambda dumper, data: dumper.represent_mapping("tag:yaml.org,2002:map", data.items()))
+def represent_dict_config(dumper: Any, data: DictConfig) -> Any:
+    """Represent a configuration as a YAML mapping, registered by the modules importing `yaml`."""
+    return dumper.represent_mapping("tag:yaml.org,2002:map", dict.items(data))
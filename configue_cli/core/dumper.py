@@ -1,8 +1,233 @@
+import functools
+import io
 import re
-from typing import TYPE_CHECKING
+import types
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
 
-if TYPE_CHECKING:
-    from .dict_config import DictConfig
+import yaml
+from yaml.resolver import Resolver
+
+from .dict_config import DictConfig, represent_dict_config
+from .formats import get_ext_name
+
+# PyYAML folds the lines longer than this width
+LINE_WIDTH = 80
+# Keys and strings that PyYAML writes as plain scalars, unless they are resolved as another type (e.g. `true`)
+PLAIN_KEY_REGEX = re.compile(r"[A-Za-z_(\\][\w.()/\\-]*", flags=re.ASCII)
+PLAIN_STRING_REGEX = re.compile(r"[A-Za-z_(\\/][\w.()/\\=+-]*(?: [\w.()/\\=+-]+)*", flags=re.ASCII)
+# PyYAML only accepts line widths larger than 4, which bounds the indentation of the scalars it can format alone
+MAX_DEPTH = (LINE_WIDTH - 5) // 2
+SCALAR_TYPES = (type(None), bool, int, float, str)
+EXT_TYPES = (types.FunctionType, types.BuiltinFunctionType)
+
+_RESOLVER = Resolver()
+
+
+class ConfigueYamlDumper(yaml.Dumper):
+    """PyYAML dumper writing classes and functions with the `!ext` tag of configue."""
+
+    def choose_scalar_style(self) -> str:
+        if self.event.tag == "!ext":
+            return ""
+        return str(super().choose_scalar_style())
+
+
+def _represent_ext(dumper: yaml.Dumper, data: Any) -> yaml.ScalarNode:
+    return dumper.represent_scalar("!ext", get_ext_name(data))
+
+
+yaml.add_representer(DictConfig, represent_dict_config)
+ConfigueYamlDumper.add_representer(DictConfig, represent_dict_config)
+ConfigueYamlDumper.add_multi_representer(type, _represent_ext)
+for ext_type in EXT_TYPES:
+    ConfigueYamlDumper.add_representer(ext_type, _represent_ext)
+
+
+def _is_ext(value: Any) -> bool:
+    return isinstance(value, type) or type(value) in EXT_TYPES
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_plain_key(key: str) -> bool:
+    return (
+        len(key) < 128
+        and PLAIN_KEY_REGEX.fullmatch(key) is not None
+        and _RESOLVER.resolve(yaml.ScalarNode, key, (True, False)) == "tag:yaml.org,2002:str"
+    )
+
+
+def _is_plain_string(value: str) -> bool:
+    return (
+        PLAIN_STRING_REGEX.fullmatch(value) is not None
+        and _RESOLVER.resolve(yaml.ScalarNode, value, (True, False)) == "tag:yaml.org,2002:str"
+    )
+
+
+def _format_float(value: float) -> str:
+    # Same as `yaml.representer.SafeRepresenter.represent_float`
+    if value != value:
+        return ".nan"
+    if value == float("inf"):
+        return ".inf"
+    if value == -float("inf"):
+        return "-.inf"
+    text = repr(value).lower()
+    if "." not in text and "e" in text:
+        text = text.replace("e", ".0e", 1)
+    return text
+
+
+def _format_scalar(value: Any, column: int) -> Optional[str]:
+    """Format a scalar as PyYAML would, or return `None` if it requires PyYAML's scalar analysis."""
+    value_type = type(value)
+    if value is None:
+        return "null"
+    if value_type is bool:
+        return "true" if value else "false"
+    if value_type is int:
+        return str(value)
+    if value_type is float:
+        return _format_float(value)
+    # Plain strings containing spaces are folded by PyYAML past the line width
+    if column + len(value) <= LINE_WIDTH or " " not in value:
+        return value if _is_plain_string(value) else None
+    return None
+
+
+class _UnsupportedValueError(Exception):
+    pass
+
+
+class ConfigueEmitter:
+    """Write a configuration tree in the YAML dialect of configue.
+
+    The output is the same as dumping the configuration with PyYAML, with classes and functions written with the
+    `!ext` tag, but the common values (mappings, lists, numbers, plain strings, classes and functions) are written
+    directly. Scalars requiring quotes or escapes are formatted with PyYAML. Trees holding other objects, or mappings
+    and lists referenced several times, are entirely dumped with PyYAML.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._write = stream.write
+        # Anchors of the classes and functions appearing several times, as generated by PyYAML
+        self._anchors: Dict[int, str] = {}
+        self._anchored_ids: Set[int] = set()
+
+    def emit(self, config: Dict[str, Any]) -> None:
+        try:
+            self._prepare(config)
+        except _UnsupportedValueError:
+            yaml.dump(config, self._stream, Dumper=ConfigueYamlDumper, sort_keys=False)
+            return
+        if len(config) == 0:
+            self._write("{}\n")
+            return
+        self._write_mapping(config, 0, "")
+
+    def _prepare(self, config: Dict[str, Any]) -> None:
+        # PyYAML numbers the anchors in the order of the second occurrences of the objects
+        seen_ids = set()
+        stack: List[Tuple[Any, int]] = [(config, 0)]
+        while stack:
+            value, depth = stack.pop()
+            if type(value) in SCALAR_TYPES:
+                continue
+            if id(value) in seen_ids:
+                if not _is_ext(value):
+                    raise _UnsupportedValueError()
+                if id(value) not in self._anchors:
+                    self._anchors[id(value)] = f"id{len(self._anchors) + 1:03d}"
+                continue
+            seen_ids.add(id(value))
+            if depth > MAX_DEPTH:
+                raise _UnsupportedValueError()
+            if isinstance(value, dict) and type(value) in (dict, DictConfig):
+                items = list(dict.items(value))
+                for key, sub_value in items:
+                    # Entries whose key requires quotes are dumped on their own with PyYAML, which cannot know about
+                    # the anchors of the rest of the tree
+                    if type(key) is not str or (not _is_plain_key(key) and type(sub_value) not in SCALAR_TYPES):
+                        raise _UnsupportedValueError()
+                stack.extend((sub_value, depth + 1) for _, sub_value in reversed(items))
+            elif type(value) is list:
+                stack.extend((item, depth + 1) for item in reversed(value))
+            elif not _is_ext(value):
+                raise _UnsupportedValueError()
+
+    def _format_ext(self, value: Any) -> str:
+        anchor = self._anchors.get(id(value))
+        if anchor is None:
+            return f"!ext {get_ext_name(value)}"
+        if id(value) in self._anchored_ids:
+            return f"*{anchor}"
+        self._anchored_ids.add(id(value))
+        return f"&{anchor} !ext {get_ext_name(value)}"
+
+    def _write_mapping(self, mapping: Dict[str, Any], indent: int, first_prefix: str) -> None:
+        prefix = first_prefix
+        for key, value in dict.items(mapping):
+            if _is_plain_key(key):
+                self._write_mapping_value(prefix, key, value, indent)
+            else:
+                self._write_with_pyyaml({key: value}, indent, prefix)
+            prefix = " " * indent
+
+    def _write_mapping_value(self, prefix: str, key: str, value: Any, indent: int) -> None:
+        key_prefix = f"{prefix}{key}:"
+        if isinstance(value, dict):
+            if len(value) == 0:
+                self._write(f"{key_prefix} {{}}\n")
+            else:
+                self._write(f"{key_prefix}\n")
+                self._write_mapping(value, indent + 2, " " * (indent + 2))
+        elif type(value) is list:
+            if len(value) == 0:
+                self._write(f"{key_prefix} []\n")
+            else:
+                # PyYAML does not indent the lists nested in mappings
+                self._write(f"{key_prefix}\n")
+                self._write_sequence(value, indent, " " * indent)
+        elif _is_ext(value):
+            self._write(f"{key_prefix} {self._format_ext(value)}\n")
+        else:
+            text = _format_scalar(value, len(key_prefix) + 1)
+            if text is None:
+                self._write_with_pyyaml({key: value}, indent, prefix)
+            else:
+                self._write(f"{key_prefix} {text}\n")
+
+    def _write_sequence(self, sequence: List[Any], indent: int, first_prefix: str) -> None:
+        prefix = first_prefix
+        for value in sequence:
+            item_prefix = f"{prefix}- "
+            if isinstance(value, dict) and len(value) > 0:
+                self._write_mapping(value, indent + 2, item_prefix)
+            elif type(value) is list and len(value) > 0:
+                self._write_sequence(value, indent + 2, item_prefix)
+            elif isinstance(value, dict):
+                self._write(f"{item_prefix}{{}}\n")
+            elif type(value) is list:
+                self._write(f"{item_prefix}[]\n")
+            elif _is_ext(value):
+                self._write(f"{item_prefix}{self._format_ext(value)}\n")
+            else:
+                text = _format_scalar(value, len(item_prefix))
+                if text is None:
+                    self._write_with_pyyaml([value], indent, prefix)
+                else:
+                    self._write(f"{item_prefix}{text}\n")
+            prefix = " " * indent
+
+    def _write_with_pyyaml(self, value: Any, indent: int, first_prefix: str) -> None:
+        # The value is dumped at the first column with a line width reduced by the indentation, which folds long
+        # scalars at the same places as when dumping the whole tree
+        serialized_value = yaml.dump(value, Dumper=ConfigueYamlDumper, sort_keys=False, width=LINE_WIDTH - indent)
+        lines = serialized_value.splitlines(keepends=True)
+        self._write(first_prefix + lines[0])
+        for line in lines[1:]:
+            # The empty lines of multi-line scalars are not indented
+            self._write(line if line == "\n" else " " * indent + line)
 
 
 class ConfigueDumper:
@@ -17,5 +242,11 @@ class ConfigueDumper:
         return serialized_config.strip(" \n") + "\n"
 
     @classmethod
-    def from_config(cls, config: "DictConfig") -> str:
-        return cls.from_pyyaml(config.to_configue())
+    def dump(cls, config: Dict[str, Any], stream: TextIO) -> None:
+        ConfigueEmitter(stream).emit(config)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> str:
+        stream = io.StringIO()
+        cls.dump(config, stream)
+        return stream.getvalue()
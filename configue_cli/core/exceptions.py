@@ -4,3 +4,19 @@ class MissingMandatoryValueError(Exception):
 
 class UnsupportedDataclassTypeError(Exception):
     pass
+
+
+class InvalidSweepError(Exception):
+    pass
+
+
+class InvalidSnapshotError(Exception):
+    pass
+
+
+class InstantiationError(Exception):
+    pass
+
+
+class InvalidArgumentFileError(Exception):
+    pass
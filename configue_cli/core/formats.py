@@ -0,0 +1,190 @@
+import datetime
+import functools
+import json
+import os
+import sys
+import types
+from typing import IO, Any, Dict, Iterator, List
+
+JSON_SUFFIX = ".json"
+JSON_LINES_SUFFIX = ".jsonl"
+MSGPACK_SUFFIX = ".msgpack"
+TOML_SUFFIX = ".toml"
+# Configuration files holding plain data, which are parsed with native parsers instead of PyYAML
+DATA_FILE_SUFFIXES = (JSON_SUFFIX, MSGPACK_SUFFIX, TOML_SUFFIX)
+# Classes and functions are exported as `{"!ext": "module.name"}` mappings, loaded back as the `!ext` tag would be
+EXT_KEY = "!ext"
+LOCALS_NAME = "<locals>"
+
+
+def _get_suffix(file_path: str) -> str:
+    return os.path.splitext(file_path)[1].lower()
+
+
+def is_data_file(file_path: str) -> bool:
+    return _get_suffix(file_path) in DATA_FILE_SUFFIXES
+
+
+def load_data_file(file_path: str) -> Any:
+    """Parse a JSON, MessagePack or TOML configuration file, with orjson and tomli if they are installed."""
+    suffix = _get_suffix(file_path)
+    if suffix == TOML_SUFFIX:
+        return _load_toml(file_path)
+    with open(file_path, "rb") as reader:
+        if suffix == MSGPACK_SUFFIX:
+            return _load_msgpack(reader)
+        return _load_json(reader.read())
+
+
+def read_json_lines(file_path: str) -> Iterator[Any]:
+    """Iterate over the configurations appended to a JSON Lines file, without reading the whole file."""
+    with open(file_path, "rb") as reader:
+        for line in reader:
+            if line.strip():
+                yield _load_json(line)
+
+
+def export_config(file_path: str, config: Dict[str, Any]) -> None:
+    """Write a configuration to a file in the format given by its extension, YAML by default.
+
+    JSON Lines files are append-only logs: each export appends the configuration as a line to the file.
+    """
+    suffix = _get_suffix(file_path)
+    if suffix == JSON_LINES_SUFFIX:
+        _append_json_line(file_path, config)
+    elif suffix == JSON_SUFFIX:
+        with open(file_path, "w", encoding="utf-8") as writer:
+            json.dump(config, writer, default=_encode_json, ensure_ascii=False, indent=2)
+            writer.write("\n")
+    elif suffix == MSGPACK_SUFFIX:
+        with open(file_path, "wb") as writer:
+            _dump_msgpack(config, writer)
+    else:
+        from .dumper import ConfigueDumper
+
+        with open(file_path, "w", encoding="utf-8") as writer:
+            ConfigueDumper.dump(config, writer)
+
+
+def get_ext_name(value: Any) -> str:
+    """Return the `module.qualified.name` of a class or function, loaded back by the `!ext` tag."""
+    if LOCALS_NAME in value.__qualname__:
+        raise TypeError(
+            f"{value.__qualname__} is defined inside a function and cannot be loaded back, define it in a module"
+        )
+    return f"{value.__module__}.{value.__qualname__}"
+
+
+def _is_ext(value: Any) -> bool:
+    return isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType))
+
+
+def _encode(value: Any, format_name: str) -> Any:
+    if _is_ext(value):
+        return {EXT_KEY: get_ext_name(value)}
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} objects cannot be exported to {format_name}, export to YAML instead")
+
+
+def _encode_json(value: Any) -> Any:
+    return _encode(value, "JSON")
+
+
+def _encode_msgpack(value: Any) -> Any:
+    return _encode(value, "MessagePack")
+
+
+def _decode_ext(mapping: Dict[str, Any]) -> Any:
+    if len(mapping) == 1 and EXT_KEY in mapping:
+        from yaml.constructor import ConstructorError
+
+        from .instantiator import find_python_name
+
+        # The module is the longest importable prefix of the name, nested classes are attributes of their outer class
+        object_names = mapping[EXT_KEY].split(".")
+        attribute_names: List[str] = []
+        while object_names:
+            try:
+                value = find_python_name(".".join(object_names))
+            except ConstructorError:
+                attribute_names.insert(0, object_names.pop())
+                continue
+            return functools.reduce(getattr, attribute_names, value)
+        # Report the error of the whole name
+        return find_python_name(mapping[EXT_KEY])
+    return mapping
+
+
+def _decode_ext_values(value: Any) -> Any:
+    if type(value) is dict:
+        for key, sub_value in value.items():
+            value[key] = _decode_ext_values(sub_value)
+        return _decode_ext(value)
+    if type(value) is list:
+        value[:] = map(_decode_ext_values, value)
+    return value
+
+
+def _append_json_line(file_path: str, config: Dict[str, Any]) -> None:
+    line = json.dumps(config, default=_encode_json, ensure_ascii=False, separators=(",", ":")) + "\n"
+    # The line is written with a single call to a file opened in append mode, so that concurrent runs appending to
+    # the same log do not interleave their lines
+    file_descriptor = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        os.write(file_descriptor, line.encode("utf-8"))
+    finally:
+        os.close(file_descriptor)
+
+
+def _load_json(data: bytes) -> Any:
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(data, object_hook=_decode_ext)
+    try:
+        value = orjson.loads(data)
+    except orjson.JSONDecodeError:  # orjson rejects the NaN and Infinity written by the json module
+        return json.loads(data, object_hook=_decode_ext)
+    # orjson has no object hook, the tree is only walked if it may contain classes or functions
+    if f'"{EXT_KEY}"'.encode("utf-8") in data:
+        return _decode_ext_values(value)
+    return value
+
+
+def _import_msgpack() -> Any:
+    try:
+        import msgpack
+    except ImportError as exc:
+        raise ImportError("msgpack is required to use MessagePack files, use `pip install msgpack`") from exc
+    return msgpack
+
+
+def _dump_msgpack(config: Dict[str, Any], writer: IO[bytes]) -> None:
+    packer = _import_msgpack().Packer(default=_encode_msgpack)
+    # The top-level entries are packed one at a time, so only one of them is held in memory as bytes
+    writer.write(packer.pack_map_header(len(config)))
+    for key, value in dict.items(config):
+        writer.write(packer.pack(key))
+        writer.write(packer.pack(value))
+
+
+def _load_msgpack(reader: IO[bytes]) -> Any:
+    unpacker = _import_msgpack().Unpacker(reader, object_hook=_decode_ext, strict_map_key=False)
+    return unpacker.unpack()
+
+
+def _load_toml(file_path: str) -> Any:
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:  # pragma: no cover
+        try:
+            import tomli as tomllib
+        except ImportError as exc:
+            raise ImportError(
+                "tomli is required to load TOML files before Python 3.11, use `pip install tomli`"
+            ) from exc
+    with open(file_path, "rb") as reader:
+        return tomllib.load(reader)
@@ -0,0 +1,448 @@
+import copy
+import functools
+import sys
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from configue.configue_loader import CONSTRUCTOR_KEY, ESCAPED_CONSTRUCTOR_KEY
+from configue.exceptions import NonCallableError
+from yaml.constructor import ConstructorError
+
+from .concurrency import DEFAULT_MAX_WORKERS, run_task_graph
+from .dict_config import DictConfig
+from .exceptions import InstantiationError
+from .missing import MissingType
+
+ATOMIC_TYPES = (str, bytes, bool, int, float, complex, type(None), MissingType)
+
+# Attribute set to `False` on the classes and functions whose objects are never shared, see `not_deduplicated`
+DEDUPLICATE_ATTRIBUTE = "__configue_deduplicate__"
+
+_NOT_BUILT = object()
+
+ConstructorT = TypeVar("ConstructorT", bound=Callable[..., Any])
+
+
+def find_python_name(name: Any) -> Any:
+    """Resolve the value of a `()` key the same way as PyYAML does when loading a configuration."""
+    if not isinstance(name, str):
+        return name
+    if not name:
+        raise ConstructorError(None, None, "expected a non-empty constructor name")
+    module_name, _, object_name = name.rpartition(".")
+    module_name = module_name or "builtins"
+    try:
+        __import__(module_name)
+    except ImportError as exc:
+        raise ConstructorError(None, None, f"cannot find module {module_name!r} ({exc})") from exc
+    module = sys.modules[module_name]
+    if not hasattr(module, object_name):
+        raise ConstructorError(None, None, f"cannot find {object_name!r} in the module {module.__name__!r}")
+    return getattr(module, object_name)
+
+
+def _find_constructor(name: Any) -> Callable[..., Any]:
+    constructor: Callable[..., Any] = find_python_name(name)
+    if not callable(constructor):
+        raise NonCallableError(
+            f"Error while constructing a Python instance, expected a callable but found {type(constructor)}"
+        )
+    return constructor
+
+
+def not_deduplicated(constructor: ConstructorT) -> ConstructorT:
+    """Decorate a class or a function whose objects must not be shared when identical subtrees are deduplicated.
+
+    An object holding such an object is not shared either.
+    """
+    setattr(constructor, DEDUPLICATE_ATTRIBUTE, False)
+    return constructor
+
+
+class Instantiator:
+    """Build the objects described by a non-instantiated configuration.
+
+    This walks the configuration tree directly instead of dumping it to YAML and loading it back with the
+    instantiating loader, with the same semantics: mappings with a `()` key are instantiated, `\\()` keys are
+    unescaped, and arbitrary Python objects are copied. Nodes appearing several times in the tree (e.g. through
+    `!cfg` references) are built once and shared, as YAML anchors would be.
+
+    With `deduplicate`, identical mappings with a `()` key are also built once and shared, even if they are distinct
+    nodes. Mappings are identical if they have the same arguments, in any order, and their values are equal scalars,
+    identical subtrees or the same Python objects. See `not_deduplicated` to opt classes out.
+    """
+
+    def __init__(self, deduplicate: bool = False) -> None:
+        self._memo: Dict[int, Any] = {}
+        self._copy_memo: Dict[int, Any] = {}
+        self._deduplicate = deduplicate
+        self._structural_keys: Dict[int, int] = {}
+        self._interned_keys: Dict[Hashable, int] = {}
+        self._shared_instances: Dict[int, Any] = {}
+
+    def instantiate(self, config: Any) -> Any:
+        if isinstance(config, ATOMIC_TYPES):
+            return config
+        config_id = id(config)
+        if config_id in self._memo:
+            return self._memo[config_id]
+
+        if isinstance(config, DictConfig) or type(config) is dict:
+            shared_key = self._get_shared_key(config)
+            if shared_key is None:
+                instance = self._instantiate_mapping(config)
+            elif shared_key in self._shared_instances:
+                instance = self._shared_instances[shared_key]
+            else:
+                instance = self._shared_instances[shared_key] = self._instantiate_mapping(config)
+        elif type(config) is list:
+            instance = []
+            self._memo[config_id] = instance
+            instance.extend(self.instantiate(item) for item in config)
+        elif type(config) is tuple:
+            instance = tuple(self.instantiate(item) for item in config)
+        else:
+            instance = copy.deepcopy(config, self._copy_memo)
+        self._memo[config_id] = instance
+        return instance
+
+    def _get_shared_key(self, config: Dict[Any, Any]) -> Optional[int]:
+        """Return the key of the objects identical to the object of a mapping, or `None` if it must not be shared."""
+        if not self._deduplicate or CONSTRUCTOR_KEY not in config:
+            return None
+        key = self._get_structural_key(config)
+        return key if key >= 0 else None
+
+    def _get_structural_key(self, config: Any) -> int:
+        """Return an integer identifying the structure of a node, negative if the node is only identical to itself.
+
+        Keys are interned, so that comparing the keys of two subtrees does not require walking them again.
+        """
+        if isinstance(config, ATOMIC_TYPES):
+            return self._intern_key((type(config), config))
+        config_id = id(config)
+        if config_id in self._structural_keys:
+            return self._structural_keys[config_id]
+        # Nodes referencing themselves are never identical to other nodes
+        self._structural_keys[config_id] = key = -len(self._structural_keys) - 1
+
+        if isinstance(config, DictConfig) or type(config) is dict:
+            items = [(item_key, self._get_structural_key(value)) for item_key, value in dict.items(config)]
+            if CONSTRUCTOR_KEY not in config:
+                key = self._intern_key(("mapping", tuple(items)))
+            elif _is_deduplicated(dict.__getitem__(config, CONSTRUCTOR_KEY)):
+                # The order of the arguments of a constructor does not matter
+                key = self._intern_key(("constructor", tuple(sorted(items, key=lambda item: str(item[0])))))
+        elif type(config) in (list, tuple):
+            key = self._intern_key((type(config), tuple(map(self._get_structural_key, config))))
+        self._structural_keys[config_id] = key
+        return key
+
+    def _intern_key(self, structure: Hashable) -> int:
+        return self._interned_keys.setdefault(structure, len(self._interned_keys))
+
+    def _instantiate_mapping(self, config: Dict[Any, Any]) -> Any:
+        # The configuration is only read, its shared subtrees do not need to be copied
+        return self._construct({key: self.instantiate(value) for key, value in dict.items(config)})
+
+    @staticmethod
+    def _construct(mapping: Dict[Any, Any]) -> Any:
+        if CONSTRUCTOR_KEY in mapping:
+            return _find_constructor(mapping.pop(CONSTRUCTOR_KEY))(**mapping)
+        if ESCAPED_CONSTRUCTOR_KEY in mapping:
+            mapping[CONSTRUCTOR_KEY] = mapping.pop(ESCAPED_CONSTRUCTOR_KEY)
+        return mapping
+
+
+def _is_deduplicated(constructor_name: Any) -> bool:
+    try:
+        constructor = find_python_name(constructor_name)
+    except Exception:  # The error is raised when building the object
+        return False
+    return bool(getattr(constructor, DEDUPLICATE_ATTRIBUTE, True))
+
+
+class _Construction:
+    """Call of a `()` constructor, postponed until the objects it receives are built."""
+
+    __slots__ = ("index", "constructor_name", "mapping", "instance")
+
+    def __init__(self, index: int, constructor_name: Any, mapping: Dict[Any, Any]) -> None:
+        self.index = index
+        self.constructor_name = constructor_name
+        self.mapping = mapping
+        self.instance: Any = _NOT_BUILT
+
+
+class ParallelInstantiator(Instantiator):
+    """Build the objects described by a non-instantiated configuration, with independent objects built concurrently.
+
+    The configuration is first walked as by `Instantiator`, but the `()` constructors are recorded instead of being
+    called. An object depends on the objects it receives, including the ones it shares with other objects through
+    `!cfg` references, which are built once. The constructors are then called in a thread pool of `workers` threads,
+    each one as soon as its dependencies are built. The factories of attrs classes taking `self` run in the
+    constructor of their class, after the other fields are built, and only read these fields.
+
+    The resulting object graph is the same as with `Instantiator`, only the order of the constructor calls differs
+    between independent objects. Threads only speed up constructors waiting for I/O (e.g. loading files or
+    connecting to remote services).
+    """
+
+    def __init__(self, workers: int = DEFAULT_MAX_WORKERS, deduplicate: bool = False) -> None:
+        super().__init__(deduplicate)
+        self._workers = workers
+        self._constructions: List[_Construction] = []
+        self._is_walking = False
+        # Tuples are rebuilt with the built objects, and must stay shared between the objects receiving them
+        self._tuples_lock = threading.Lock()
+        self._built_tuples: Dict[int, Tuple[Any, ...]] = {}
+
+    def instantiate(self, config: Any) -> Any:
+        if self._is_walking:
+            return super().instantiate(config)
+        self._is_walking = True
+        try:
+            instance = super().instantiate(config)
+        finally:
+            self._is_walking = False
+
+        # Constructions are recorded after the constructions they receive, their order is a valid order of the calls
+        constructions, self._constructions = self._constructions, []
+        run_task_graph(
+            [functools.partial(self._build, construction) for construction in constructions],
+            [
+                [dependency.index for dependency in _find_constructions(construction.mapping)]
+                for construction in constructions
+            ],
+            workers=self._workers,
+        )
+        return self._replace_constructions(instance, set())
+
+    def _instantiate_mapping(self, config: Dict[Any, Any]) -> Any:
+        mapping = {key: self.instantiate(value) for key, value in dict.items(config)}
+        if CONSTRUCTOR_KEY not in mapping:
+            return self._construct(mapping)
+        construction = _Construction(len(self._constructions), mapping.pop(CONSTRUCTOR_KEY), mapping)
+        self._constructions.append(construction)
+        return construction
+
+    def _build(self, construction: _Construction) -> None:
+        mapping = self._replace_constructions(construction.mapping, set())
+        construction.instance = _find_constructor(construction.constructor_name)(**mapping)
+
+    def _replace_constructions(self, value: Any, visited_ids: Set[int]) -> Any:
+        """Replace in place the constructions held by the containers built while walking the configuration."""
+        value_type = type(value)
+        if value_type is _Construction:
+            return value.instance
+        if value_type not in (dict, list, tuple) or id(value) in visited_ids:
+            return value
+        visited_ids.add(id(value))
+        if value_type is dict:
+            for key, item in value.items():
+                value[key] = self._replace_constructions(item, visited_ids)
+        elif value_type is list:
+            for index, item in enumerate(value):
+                value[index] = self._replace_constructions(item, visited_ids)
+        else:
+            items = tuple(self._replace_constructions(item, visited_ids) for item in value)
+            with self._tuples_lock:
+                value = self._built_tuples.setdefault(id(value), items)
+        return value
+
+
+def _find_constructions(value: Any) -> List[_Construction]:
+    """Find the constructions held by the containers built while walking the configuration, without entering them."""
+    constructions = []
+    visited_ids = set()
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is _Construction:
+            constructions.append(value)
+        elif value_type in (dict, list, tuple) and id(value) not in visited_ids:
+            visited_ids.add(id(value))
+            stack.extend(value.values() if value_type is dict else value)
+    return constructions
+
+
+class LazyObject:
+    """Proxy of an object that is only built on first use, then forwards every operation to it.
+
+    `isinstance` checks are answered with the class named by the `()` key, without building the object, unless `()`
+    names a factory function.
+    """
+
+    __slots__ = ("_lazy_factory", "_lazy_class_factory", "_lazy_lock", "_lazy_instance", "__weakref__")
+
+    def __init__(self, factory: Callable[[], Any], class_factory: Callable[[], Any], lock: "threading.RLock") -> None:
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_class_factory", class_factory)
+        object.__setattr__(self, "_lazy_lock", lock)
+        object.__setattr__(self, "_lazy_instance", _NOT_BUILT)
+
+    def _lazy_get(self) -> Any:
+        instance = object.__getattribute__(self, "_lazy_instance")
+        if instance is _NOT_BUILT:
+            with object.__getattribute__(self, "_lazy_lock"):
+                instance = object.__getattribute__(self, "_lazy_instance")
+                if instance is _NOT_BUILT:
+                    instance = object.__getattribute__(self, "_lazy_factory")()
+                    object.__setattr__(self, "_lazy_instance", instance)
+        return instance
+
+    @property  # type: ignore[misc]
+    def __class__(self) -> type:
+        instance = object.__getattribute__(self, "_lazy_instance")
+        if instance is _NOT_BUILT:
+            cls = object.__getattribute__(self, "_lazy_class_factory")()
+            if isinstance(cls, type):
+                return cls
+        return type(unwrap(self))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(unwrap(self), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(unwrap(self), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(unwrap(self), name)
+
+    def __dir__(self) -> Iterable[str]:
+        return dir(unwrap(self))
+
+    def __repr__(self) -> str:
+        return repr(unwrap(self))
+
+    def __str__(self) -> str:
+        return str(unwrap(self))
+
+    def __bool__(self) -> bool:
+        return bool(unwrap(self))
+
+    def __len__(self) -> int:
+        return len(unwrap(self))
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(unwrap(self))
+
+    def __contains__(self, item: Any) -> bool:
+        return item in unwrap(self)
+
+    def __getitem__(self, key: Any) -> Any:
+        return unwrap(self)[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        unwrap(self)[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del unwrap(self)[key]
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return unwrap(self)(*args, **kwargs)
+
+    def __eq__(self, other: Any) -> bool:
+        return bool(unwrap(self) == unwrap(other))
+
+    def __ne__(self, other: Any) -> bool:
+        return bool(unwrap(self) != unwrap(other))
+
+    def __hash__(self) -> int:
+        return hash(unwrap(self))
+
+    def __enter__(self) -> Any:
+        return unwrap(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> Any:
+        return unwrap(self).__exit__(*exc_info)
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # The built object is pickled instead of the proxy
+        return unwrap(self).__reduce_ex__(protocol)
+
+
+def unwrap(value: Any) -> Any:
+    """Return the object behind a lazy object, building it if needed, or the value itself."""
+    if type(value) is LazyObject:
+        return value._lazy_get()
+    return value
+
+
+def is_instantiated(value: Any) -> bool:
+    """Return whether a value is not a lazy object, or a lazy object that was already built."""
+    return type(value) is not LazyObject or object.__getattribute__(value, "_lazy_instance") is not _NOT_BUILT
+
+
+class LazyInstantiator(Instantiator):
+    """Build the objects described by a non-instantiated configuration on first use.
+
+    Mappings with a `()` key below the root are replaced by `LazyObject` proxies, so the branches of a configuration
+    that are never used are never built. The subtree of a proxy is built at once when it is first used, and the
+    objects it holds receive actual objects. Errors raised while building an object are reported with its dotted path
+    in the configuration.
+    """
+
+    def __init__(self, deduplicate: bool = False) -> None:
+        super().__init__(deduplicate)
+        # Proxies can be used from several threads and the subtree of a proxy can hold other proxies
+        self._lock = threading.RLock()
+
+    def instantiate(self, config: Any, path: str = "", lazy: bool = True) -> Any:
+        if isinstance(config, ATOMIC_TYPES):
+            return config
+        config_id = id(config)
+        if config_id in self._memo:
+            return self._memo[config_id] if lazy else unwrap(self._memo[config_id])
+
+        shared_key = self._get_shared_key(config) if isinstance(config, DictConfig) or type(config) is dict else None
+        if shared_key is not None and shared_key in self._shared_instances:
+            self._memo[config_id] = self._shared_instances[shared_key]
+            return self._memo[config_id] if lazy else unwrap(self._memo[config_id])
+
+        if isinstance(config, DictConfig) or type(config) is dict:
+            if lazy and path and CONSTRUCTOR_KEY in config:
+                instance: Any = LazyObject(
+                    functools.partial(self._build, config, path),
+                    functools.partial(self._find_class, config, path),
+                    self._lock,
+                )
+            else:
+                instance = self._instantiate_mapping_at(config, path, lazy)
+        elif type(config) is list:
+            instance = []
+            self._memo[config_id] = instance
+            instance.extend(self.instantiate(item, _join_path(path, index), lazy) for index, item in enumerate(config))
+        elif type(config) is tuple:
+            instance = tuple(self.instantiate(item, _join_path(path, index), lazy) for index, item in enumerate(config))
+        else:
+            instance = copy.deepcopy(config, self._copy_memo)
+        self._memo[config_id] = instance
+        if shared_key is not None:
+            self._shared_instances[shared_key] = instance
+        return instance
+
+    def _instantiate_mapping_at(self, config: Dict[Any, Any], path: str, lazy: bool) -> Any:
+        mapping = {key: self.instantiate(value, _join_path(path, key), lazy) for key, value in dict.items(config)}
+        try:
+            return self._construct(mapping)
+        except InstantiationError:
+            raise
+        except Exception as exc:
+            raise InstantiationError(f"Could not instantiate {path or 'the configuration'}: {exc}") from exc
+
+    def _build(self, config: Dict[Any, Any], path: str) -> Any:
+        with self._lock:
+            return self._instantiate_mapping_at(config, path, lazy=False)
+
+    @staticmethod
+    def _find_class(config: Dict[Any, Any], path: str) -> Any:
+        try:
+            return find_python_name(dict.__getitem__(config, CONSTRUCTOR_KEY))
+        except Exception as exc:
+            raise InstantiationError(f"Could not instantiate {path}: {exc}") from exc
+
+
+def _join_path(path: str, key: Any) -> str:
+    return f"{path}.{key}" if path else str(key)
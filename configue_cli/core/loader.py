@@ -1,15 +1,74 @@
+import contextlib
+import functools
+import logging
 import os
+import re
 import tempfile
-from typing import TYPE_CHECKING, Any, List, Type, Union, cast
+import threading
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 from configue.configue_loader import ConfigueLoader
+from configue.exceptions import NotFoundError
 from configue.file_loader import FileLoader
 from configue.root_loader import RootLoader
-from yaml import FullLoader, Loader, MappingNode
-from yaml.constructor import UnsafeConstructor
+from yaml import FullLoader, Loader, MappingNode, Node, ScalarNode, YAMLError, add_representer
+from yaml.constructor import ConstructorError, FullConstructor, UnsafeConstructor
+from yaml.resolver import Resolver
 
-if TYPE_CHECKING:
-    from .dict_config import DictConfig
+from .cache import NodeCache
+from .dict_config import DictConfig, represent_dict_config
+from .formats import is_data_file, load_data_file
+from .instantiator import Instantiator, LazyInstantiator, ParallelInstantiator
+from .snapshot import SNAPSHOT_SUFFIX, load_snapshot
+
+try:
+    from yaml._yaml import CParser
+
+    LIBYAML_AVAILABLE = True
+except ImportError:  # PyYAML was built without libyaml
+    LIBYAML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Scalars made of these characters only are plain YAML scalars: they can be resolved without running the parser
+PLAIN_SCALAR_REGEX = re.compile(r"[\w+][\w.+-]*|-[\w.][\w.+-]*|\.\w[\w.+-]*")
+# Tags whose value is resolved relatively to the directory of the file being loaded
+FILE_RELATIVE_TAG_REGEX = re.compile(r"!(?:import|path)\b")
+IN_MEMORY_FILE_PATH = os.path.join(os.getcwd(), "<string>")
+# A YAML document, as a string or as an open file
+YamlSource = Union[str, IO[str]]
+
+# Configurations are dumped with PyYAML's default dumper as plain mappings
+add_representer(DictConfig, represent_dict_config)
+
+_SCALAR_RESOLVER = Resolver()
+_SCALAR_CONSTRUCTOR = FullConstructor()
+
+
+class ParserBackend(IntEnum):
+    """Parser composing the YAML nodes that the configue constructors turn into configurations."""
+
+    PYTHON = 0
+    LIBYAML = 1
+
+
+DEFAULT_PARSER_BACKEND = ParserBackend.LIBYAML if LIBYAML_AVAILABLE else ParserBackend.PYTHON
 
 
 class NonInstanciatingConfigueLoader(ConfigueLoader):
@@ -17,68 +76,325 @@ class NonInstanciatingConfigueLoader(ConfigueLoader):
         return cast(MappingNode, super(FullLoader, self).construct_yaml_map(node))  # type: ignore[misc]
 
 
-class NonInstanciatingFileLoader(FileLoader):
-    def __init__(self, file_path: str, root_loader: RootLoader) -> None:
-        super().__init__(file_path, root_loader)
+# File loader constructing objects in the current thread, see `get_loader_cls`
+_CURRENT_FILE_LOADER: "ContextVar[BaseFileLoader]" = ContextVar("current_file_loader")
+_loader_classes: Dict[Tuple[type, ParserBackend], Type[Loader]] = {}
 
-        loader_cls: Type[Loader] = cast(
-            Type[Loader],
-            type("CustomLoader", (NonInstanciatingConfigueLoader,), {"yaml_loader": self}),
-        )
 
-        loader_cls.add_multi_constructor("!import", self._load_import)
-        loader_cls.add_constructor("!path", self._load_path)
-        loader_cls.add_constructor("!cfg", self._load_cfg)
-        loader_cls.add_constructor("!ext", self._load_ext)
-        loader_cls.add_constructor("tag:yaml.org,2002:map", loader_cls.construct_yaml_map)
-        loader_cls.add_multi_constructor("tag:yaml.org,2002:python/object:", UnsafeConstructor.construct_python_object)
-        loader_cls.add_multi_constructor(
-            "tag:yaml.org,2002:python/object/new:", UnsafeConstructor.construct_python_object_new
-        )
+def _construct_import(loader: ConfigueLoader, tag_suffix: str, node: ScalarNode) -> Any:
+    return _CURRENT_FILE_LOADER.get()._load_import(loader, tag_suffix, node)
 
-        with open(self._file_path, encoding="utf-8") as config_file:
-            self._loader = loader_cls(config_file)
-            self._root_node = self._loader.get_single_node()
-        self._loader.dispose()
+
+def _construct_path(loader: ConfigueLoader, node: ScalarNode) -> Any:
+    return _CURRENT_FILE_LOADER.get()._load_path(loader, node)
+
+
+def _construct_cfg(loader: ConfigueLoader, node: ScalarNode) -> Any:
+    return _CURRENT_FILE_LOADER.get()._load_cfg(loader, node)
 
 
-class InstanciatingFileLoader(FileLoader):
-    def __init__(self, file_path: str, root_loader: RootLoader) -> None:
-        super().__init__(file_path, root_loader)
+def _construct_ext(loader: ConfigueLoader, node: ScalarNode) -> Any:
+    return _CURRENT_FILE_LOADER.get()._load_ext(loader, node)
 
+
+def _init_libyaml_loader(loader: Any, stream: Any) -> None:
+    # Same as `yaml.CFullLoader`: libyaml replaces the reader, scanner, parser and composer of PyYAML
+    CParser.__init__(loader, stream)
+    FullConstructor.__init__(loader)
+    Resolver.__init__(loader)
+
+
+def get_loader_cls(
+    base_loader_cls: Type[ConfigueLoader], parser_backend: ParserBackend = DEFAULT_PARSER_BACKEND
+) -> Type[Loader]:
+    """Create the YAML loader class resolving the configue tags on top of `base_loader_cls`.
+
+    configue creates a loader class per file, with the tag constructors bound to its file loader. Here the classes are
+    created once and the tags are resolved by the file loader currently constructing objects. With the libyaml backend,
+    the nodes are composed by libyaml's C parser instead of PyYAML's, and constructed the same way. The Python backend
+    is used instead if PyYAML was built without libyaml.
+    """
+    if not LIBYAML_AVAILABLE:
+        parser_backend = ParserBackend.PYTHON
+    key = (base_loader_cls, parser_backend)
+    if key in _loader_classes:
+        return _loader_classes[key]
+    if parser_backend == ParserBackend.LIBYAML:
         loader_cls: Type[Loader] = cast(
             Type[Loader],
-            type("CustomLoader", (ConfigueLoader,), {"yaml_loader": self}),
+            type("CustomCLoader", (CParser, base_loader_cls), {"__init__": _init_libyaml_loader}),
         )
+    else:
+        loader_cls = cast(Type[Loader], type("CustomLoader", (base_loader_cls,), {}))
+
+    loader_cls.add_multi_constructor("!import", _construct_import)
+    loader_cls.add_constructor("!path", _construct_path)
+    loader_cls.add_constructor("!cfg", _construct_cfg)
+    loader_cls.add_constructor("!ext", _construct_ext)
+    loader_cls.add_constructor("tag:yaml.org,2002:map", loader_cls.construct_yaml_map)
+    loader_cls.add_multi_constructor("tag:yaml.org,2002:python/object:", UnsafeConstructor.construct_python_object)
+    loader_cls.add_multi_constructor(
+        "tag:yaml.org,2002:python/object/new:", UnsafeConstructor.construct_python_object_new
+    )
+    _loader_classes[key] = loader_cls
+    return loader_cls
 
-        loader_cls.add_multi_constructor("!import", self._load_import)
-        loader_cls.add_constructor("!path", self._load_path)
-        loader_cls.add_constructor("!cfg", self._load_cfg)
-        loader_cls.add_constructor("!ext", self._load_ext)
-        loader_cls.add_constructor("tag:yaml.org,2002:map", loader_cls.construct_yaml_map)
-        loader_cls.add_multi_constructor("tag:yaml.org,2002:python/object:", UnsafeConstructor.construct_python_object)
-        loader_cls.add_multi_constructor(
-            "tag:yaml.org,2002:python/object/new:", UnsafeConstructor.construct_python_object_new
-        )
 
-        with open(self._file_path, encoding="utf-8") as config_file:
-            self._loader = loader_cls(config_file)
-            self._root_node = self._loader.get_single_node()
+class BaseFileLoader(FileLoader):
+    configue_loader_cls: Type[ConfigueLoader] = ConfigueLoader
+    _root_loader: "BaseRootLoader"
+    # Loaders constructing the objects of the file, one per thread
+    _constructors: threading.local
+
+    @property
+    def _loader(self) -> Loader:
+        # YAML constructors keep track of the nodes being constructed: threads loading the same file concurrently
+        # construct its nodes with their own constructor
+        constructor: Optional[Loader] = getattr(self._constructors, "loader", None)
+        if constructor is None:
+            constructor = get_loader_cls(self.configue_loader_cls, self._root_loader.parser_backend)("")
+            constructor.dispose()
+            self._constructors.loader = constructor
+        return constructor
+
+    @_loader.setter
+    def _loader(self, loader: Loader) -> None:
+        self._constructors.loader = loader
+
+    def load(self, path: Union[str, List[str]]) -> Any:
+        token = _CURRENT_FILE_LOADER.set(self)
+        try:
+            return super().load(path)
+        finally:
+            _CURRENT_FILE_LOADER.reset(token)
+
+    def _parse(self, loader_cls: Type[Loader], open_source: Callable[[], ContextManager[YamlSource]]) -> Optional[Node]:
+        with open_source() as source:
+            self._loader = loader_cls(source)
+            root_node = self._loader.get_single_node()
         self._loader.dispose()
+        return root_node
+
+    def _parse_with_fallback(self, open_source: Callable[[], ContextManager[YamlSource]]) -> Optional[Node]:
+        """Parse the YAML document opened by `open_source`, which is called again if the document is parsed twice."""
+        loader_cls = get_loader_cls(self.configue_loader_cls, self._root_loader.parser_backend)
+        python_loader_cls = get_loader_cls(self.configue_loader_cls, ParserBackend.PYTHON)
+        try:
+            return self._parse(loader_cls, open_source)
+        except YAMLError:
+            if loader_cls is python_loader_cls:
+                raise
+        # libyaml follows the YAML specification more strictly than PyYAML, which for instance accepts `${VAR}` in
+        # flow sequences: the files it rejects are parsed again with PyYAML, which also reports the errors as before
+        logger.debug(f"libyaml could not parse {self._file_path}, parsing it with PyYAML")
+        return self._parse(python_loader_cls, open_source)
+
+    def _load_ext(self, loader: ConfigueLoader, node: ScalarNode) -> Any:
+        # configue looks the path following the module up as a single attribute, which cannot load nested classes: the
+        # attributes of their qualified name (`module.Outer.Inner`) are looked up one at a time
+        path = loader.construct_scalar(node)
+        object_names = path.split(".")
+        sub_path: List[str] = []
+        while object_names:
+            try:
+                value = loader.find_python_name(".".join(object_names), node.start_mark, unsafe=True)
+            except ConstructorError:
+                sub_path.insert(0, object_names.pop())
+                continue
+            for name in sub_path:
+                value = self._get_element_at_sub_path(name, value)
+            return value
+        raise NotFoundError(f"Could not load element {path} {node.start_mark}")
+
+    def _load_path(self, loader: ConfigueLoader, node: ScalarNode) -> Optional[str]:
+        # `!import` also resolves its path with this method
+        path: Optional[str] = super()._load_path(loader, node)
+        if path is not None:
+            self._root_loader.dependencies.setdefault(os.path.abspath(self._file_path), set()).add(
+                os.path.abspath(path)
+            )
+        return path
+
+
+class YamlFileLoader(BaseFileLoader):
+    def __init__(self, file_path: str, root_loader: "BaseRootLoader") -> None:
+        # `FileLoader.__init__` is not called since it would parse the file with the default configue loader first
+        self._file_path = file_path
+        self._root_loader = root_loader
+        self._constructors = threading.local()
+
+        open_source = functools.partial(open, file_path, encoding="utf-8")
+        cache = root_loader.cache
+        if cache is None:
+            self._root_node = self._parse_with_fallback(open_source)
+            return
+
+        root_node = cache.get(file_path)
+        if root_node is None:
+            # The file is fingerprinted before it is parsed, so that a file modified in between is parsed again later
+            fingerprint = cache.fingerprint(file_path)
+            self._root_node = self._parse_with_fallback(open_source)
+            cache.set(file_path, fingerprint, self._root_node)
+        else:
+            self._root_node = root_node
+
+
+class NonInstanciatingFileLoader(YamlFileLoader):
+    configue_loader_cls = NonInstanciatingConfigueLoader
+
+
+class InstanciatingFileLoader(YamlFileLoader):
+    configue_loader_cls = ConfigueLoader
+
+
+class StringLoader(BaseFileLoader):
+    def __init__(self, serialized_config: str, root_loader: "BaseRootLoader") -> None:
+        # `FileLoader.__init__` reads the configuration from the filesystem so its state is initialized here instead
+        self._file_path = IN_MEMORY_FILE_PATH
+        self._root_loader = root_loader
+        self._constructors = threading.local()
+        self._root_node = self._parse_with_fallback(lambda: contextlib.nullcontext(serialized_config))
+
+
+class DataFileLoader(BaseFileLoader):
+    """Loader of a JSON, MessagePack or TOML configuration file, parsed with a native parser instead of PyYAML.
+
+    The file only holds plain data: mappings with a `()` key are instantiated as in YAML files, `{"!ext": path}`
+    mappings are loaded as the `!ext` tag, but there are no other tags and environment variables are not replaced.
+    """
+
+    instantiate = False
+
+    def __init__(self, file_path: str, root_loader: "BaseRootLoader") -> None:
+        self._file_path = file_path
+        self._root_loader = root_loader
+        self._config = load_data_file(file_path)
+
+    def load(self, path: Union[str, List[str]]) -> Any:
+        config = _get_sub_config(self._config, path)
+        if self.instantiate:
+            return Instantiator().instantiate(config)
+        return config
+
 
+class NonInstanciatingDataFileLoader(DataFileLoader):
+    instantiate = False
+
+
+class InstanciatingDataFileLoader(DataFileLoader):
+    instantiate = True
+
+
+class NonInstanciatingStringLoader(StringLoader):
+    configue_loader_cls = NonInstanciatingConfigueLoader
+
+
+class InstanciatingStringLoader(StringLoader):
+    configue_loader_cls = ConfigueLoader
+
+
+class BaseRootLoader(RootLoader):
+    file_loader_cls: Type[YamlFileLoader] = YamlFileLoader
+    data_file_loader_cls: Type[DataFileLoader] = DataFileLoader
+
+    def __init__(
+        self,
+        file_path: str,
+        cache: Optional[NodeCache] = None,
+        parser_backend: ParserBackend = DEFAULT_PARSER_BACKEND,
+    ) -> None:
+        super().__init__(file_path)
+        self.cache = cache
+        self.parser_backend = parser_backend
+        # Absolute paths referenced with `!import` or `!path` by each loaded file
+        self.dependencies: Dict[str, Set[str]] = {}
 
-class NonInstanciatingRootLoader(RootLoader):
     def load_file(self, file_path: str, sub_path: Union[str, List[str]]) -> Any:
         if file_path not in self._file_loaders_by_file:
-            self._file_loaders_by_file[file_path] = NonInstanciatingFileLoader(file_path, self)
+            self._file_loaders_by_file[file_path] = self._create_file_loader(file_path)
         return self._file_loaders_by_file[file_path].load(sub_path)
 
+    def _create_file_loader(self, file_path: str) -> BaseFileLoader:
+        if is_data_file(file_path):
+            return self.data_file_loader_cls(file_path, self)
+        return self.file_loader_cls(file_path, self)
+
+
+class NonInstanciatingRootLoader(BaseRootLoader):
+    file_loader_cls = NonInstanciatingFileLoader
+    data_file_loader_cls = NonInstanciatingDataFileLoader
+
+
+class InstanciatingRootLoader(BaseRootLoader):
+    file_loader_cls = InstanciatingFileLoader
+    data_file_loader_cls = InstanciatingDataFileLoader
+
+
+class ResolutionContext(NonInstanciatingRootLoader):
+    """Root loader shared by all the configuration files loaded while resolving a configuration.
+
+    Every file is parsed once, even if it is imported by several configuration files: the parsing of a file is
+    serialized between threads, which then construct its objects concurrently. Files are identified by their absolute
+    path. Modified files and the files depending on them can be forgotten to be loaded again.
+    """
+
+    def __init__(
+        self, cache: Optional[NodeCache] = None, parser_backend: ParserBackend = DEFAULT_PARSER_BACKEND
+    ) -> None:
+        super().__init__(IN_MEMORY_FILE_PATH, cache, parser_backend)
+        self._lock = threading.Lock()
+        self._file_locks: Dict[str, threading.Lock] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks and YAML parsers cannot be pickled: the files are loaded again by the processes the context is sent to
+        state = self.__dict__.copy()
+        del state["_lock"], state["_file_locks"]
+        state["_file_loaders_by_file"] = {}
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._file_locks = {}
 
-class InstanciatingRootLoader(RootLoader):
     def load_file(self, file_path: str, sub_path: Union[str, List[str]]) -> Any:
-        if file_path not in self._file_loaders_by_file:
-            self._file_loaders_by_file[file_path] = InstanciatingFileLoader(file_path, self)
-        return self._file_loaders_by_file[file_path].load(sub_path)
+        key = os.path.abspath(file_path)
+        with self._lock:
+            file_lock = self._file_locks.setdefault(key, threading.Lock())
+        # Only the parsing holds the lock: constructing the objects of a file loads the files it imports, which would
+        # deadlock with a thread loading an imported file which imports this file in turn
+        with file_lock:
+            file_loader = self._file_loaders_by_file.get(key)
+            if file_loader is None:
+                file_loader = self._file_loaders_by_file[key] = self._create_file_loader(file_path)
+        return file_loader.load(sub_path)
+
+    def load(self, file_path: str) -> Any:
+        if file_path.endswith(SNAPSHOT_SUFFIX):
+            return load_snapshot(file_path)
+        return self.load_file(file_path, "")
+
+    def dependents(self, file_paths: Iterable[str]) -> Set[str]:
+        """Return the absolute paths of `file_paths` and of all the loaded files depending on them."""
+        dependents_by_file: Dict[str, Set[str]] = {}
+        for file_path, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                dependents_by_file.setdefault(dependency, set()).add(file_path)
+
+        stack = [os.path.abspath(file_path) for file_path in file_paths]
+        visited = set(stack)
+        while stack:
+            for dependent in dependents_by_file.get(stack.pop(), ()):
+                if dependent not in visited:
+                    visited.add(dependent)
+                    stack.append(dependent)
+        return visited
+
+    def forget(self, file_paths: Iterable[str]) -> None:
+        with self._lock:
+            for file_path in file_paths:
+                self._file_loaders_by_file.pop(file_path, None)
+                self.dependencies.pop(file_path, None)
 
 
 def load_from_path(
@@ -86,19 +402,102 @@ def load_from_path(
     *,
     sub_path: Union[str, List[str]] = "",
     instantiate: bool = True,
+    cache: Optional[NodeCache] = None,
+    parser_backend: ParserBackend = DEFAULT_PARSER_BACKEND,
 ) -> Any:
+    if file_path.endswith(SNAPSHOT_SUFFIX):
+        return _load_from_snapshot(file_path, sub_path=sub_path, instantiate=instantiate)
+    if instantiate:
+        return InstanciatingRootLoader(file_path, cache, parser_backend).load_root_file(sub_path, None)
+    return NonInstanciatingRootLoader(file_path, cache, parser_backend).load_root_file(sub_path, None)
+
+
+def load_with_dependencies(file_path: str, *, cache: Optional[NodeCache] = None) -> Tuple[Any, Dict[str, Set[str]]]:
+    """Load a configuration file without instantiating it, along with the paths each loaded file references."""
+    if file_path.endswith(SNAPSHOT_SUFFIX):
+        return load_snapshot(file_path), {}
+    root_loader = NonInstanciatingRootLoader(file_path, cache)
+    return root_loader.load_root_file("", None), root_loader.dependencies
+
+
+def _load_from_snapshot(file_path: str, *, sub_path: Union[str, List[str]], instantiate: bool) -> Any:
+    # Snapshots already contain a merged configuration, neither parsing nor caching is needed
+    config = _get_sub_config(load_snapshot(file_path), sub_path)
     if instantiate:
-        return InstanciatingRootLoader(file_path).load_root_file(sub_path, None)
-    return NonInstanciatingRootLoader(file_path).load_root_file(sub_path, None)
+        return Instantiator().instantiate(config)
+    return config
+
+
+def _get_sub_config(config: Any, sub_path: Union[str, List[str]]) -> Any:
+    for element in sub_path.split(".") if isinstance(sub_path, str) else sub_path:
+        if element:
+            config = FileLoader._get_element_at_sub_path(element, config)
+    return config
+
+
+def _construct_plain_scalar(value: str) -> Any:
+    tag = _SCALAR_RESOLVER.resolve(ScalarNode, value, (True, False))
+    return _SCALAR_CONSTRUCTOR.yaml_constructors[tag](_SCALAR_CONSTRUCTOR, ScalarNode(tag, value))
 
 
-def load_from_string(serialized_config: str, *, instantiate: bool = True) -> Any:
+def _load_from_filesystem(
+    serialized_config: str, *, instantiate: bool = True, context: Optional[ResolutionContext] = None
+) -> Any:
     with tempfile.TemporaryDirectory() as temp_dir:
-        with open(os.path.join(temp_dir, "config.yml"), "w", encoding="utf-8") as writer:
+        file_path = os.path.join(temp_dir, "config.yml")
+        with open(file_path, "w", encoding="utf-8") as writer:
             writer.write(serialized_config)
-        config = load_from_path(os.path.join(temp_dir, "config.yml"), instantiate=instantiate)
+        if instantiate or context is None:
+            return load_from_path(file_path, instantiate=instantiate)
+        config = context.load(file_path)
+        # The temporary file is forgotten but the paths referenced by the value are still recorded, e.g. to make the
+        # `!path` values of the command line relative to the workdir of SkyPilot tasks
+        key = os.path.abspath(file_path)
+        dependencies = context.dependencies.get(key, set())
+        context.forget([key])
+        context.dependencies.setdefault(IN_MEMORY_FILE_PATH, set()).update(dependencies)
     return config
 
 
-def load_from_config(config: "DictConfig", *, instantiate: bool = True) -> Any:
-    return load_from_string(config.to_configue(), instantiate=instantiate)
+def load_from_string(
+    serialized_config: str, *, instantiate: bool = True, context: Optional[ResolutionContext] = None
+) -> Any:
+    """Load a configuration from a YAML string.
+
+    Files imported by the configuration are loaded with `context`, if any, when the configuration is not instantiated.
+    """
+    # Plain scalars (numbers, booleans, identifiers...) are by far the most common values passed from the command line
+    if PLAIN_SCALAR_REGEX.fullmatch(serialized_config):
+        return _construct_plain_scalar(serialized_config)
+
+    if FILE_RELATIVE_TAG_REGEX.search(serialized_config) is None:
+        if instantiate:
+            return InstanciatingStringLoader(serialized_config, InstanciatingRootLoader(IN_MEMORY_FILE_PATH)).load("")
+        root_loader = context if context is not None else NonInstanciatingRootLoader(IN_MEMORY_FILE_PATH)
+        return NonInstanciatingStringLoader(serialized_config, root_loader).load("")
+
+    # `!import` and `!path` are resolved relatively to the loaded file, which requires an actual file
+    return _load_from_filesystem(serialized_config, instantiate=instantiate, context=context)
+
+
+def load_from_config(
+    config: DictConfig,
+    *,
+    instantiate: bool = True,
+    lazy: bool = False,
+    workers: Optional[int] = None,
+    deduplicate: bool = False,
+) -> Any:
+    """Instantiate a configuration, or load it again without instantiating it.
+
+    With `lazy`, the objects below the root of the configuration are only built when they are first used. Otherwise,
+    with more than one of `workers`, the objects that do not depend on each other are built concurrently in threads.
+    With `deduplicate`, identical mappings with a `()` key are built once and shared, see `Instantiator`.
+    """
+    if instantiate and lazy:
+        return LazyInstantiator(deduplicate).instantiate(config)
+    if instantiate and workers is not None and workers > 1:
+        return ParallelInstantiator(workers, deduplicate).instantiate(config)
+    if instantiate:
+        return Instantiator(deduplicate).instantiate(config)
+    return load_from_string(config.to_configue(), instantiate=False)
@@ -0,0 +1,133 @@
+import contextlib
+import sys
+import time
+from enum import Enum
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Type
+
+if TYPE_CHECKING:
+    import cProfile
+
+
+class ProfileFormat(str, Enum):
+    TABLE = "table"
+    JSON = "json"
+
+
+class Profiler:
+    """Time the steps of the configuration resolution and record their peak memory usage.
+
+    Profiling starts when entering the profiler context and the report is printed when leaving it without error. When
+    disabled, all methods are no-ops. Peak memory usages are recorded with `tracemalloc` and only measure the memory
+    allocated by Python while profiling; per-step peaks require Python 3.9 or later.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        profile_format: ProfileFormat = ProfileFormat.TABLE,
+        stats_path: Optional[str] = None,
+    ) -> None:
+        self.enabled = enabled
+        self.profile_format = profile_format
+        self.stats_path = stats_path
+        self.steps: List[Dict[str, Any]] = []
+        self.total_time = 0.0
+        self.peak_memory: Optional[int] = None
+        self._start_time = 0.0
+        self._started_tracemalloc = False
+        self._profile: Optional["cProfile.Profile"] = None
+
+    def __enter__(self) -> "Profiler":
+        if not self.enabled:
+            return self
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.stats_path is not None:
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._start_time = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if not self.enabled:
+            return
+        import tracemalloc
+
+        self.total_time = time.perf_counter() - self._start_time
+        if self._profile is not None and self.stats_path is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.stats_path)
+        self._update_peak_memory(tracemalloc.get_traced_memory()[1])
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        if exc_type is None:
+            self.report()
+
+    @contextlib.contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        import tracemalloc
+
+        # `reset_peak` is only available since Python 3.9, only the peak over the whole run is reported before
+        can_reset_peak = hasattr(tracemalloc, "reset_peak")
+        if can_reset_peak:
+            self._update_peak_memory(tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start_time
+            step_peak_memory = tracemalloc.get_traced_memory()[1] if can_reset_peak else None
+            self.steps.append({"name": name, "time": duration, "peak_memory": step_peak_memory})
+            if step_peak_memory is not None:
+                self._update_peak_memory(step_peak_memory)
+
+    def _update_peak_memory(self, peak_memory: int) -> None:
+        # `reset_peak` discards the peak over the whole run, so it is kept up to date here
+        self.peak_memory = max(self.peak_memory or 0, peak_memory)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"steps": self.steps, "total_time": self.total_time, "peak_memory": self.peak_memory}
+
+    def report(self) -> None:
+        if self.profile_format == ProfileFormat.JSON:
+            import json
+
+            sys.stdout.write(json.dumps(self.to_dict()) + "\n")
+            return
+
+        from rich.console import Console
+        from rich.table import Table
+
+        table = Table(title="Profile", title_justify="left", border_style="dim")
+        table.add_column("Step")
+        table.add_column("Time", justify="right")
+        table.add_column("Peak memory", justify="right")
+        for step in self.steps:
+            table.add_row(step["name"], _format_duration(step["time"]), _format_size(step["peak_memory"]))
+        table.add_row("Total", _format_duration(self.total_time), _format_size(self.peak_memory), style="bold")
+        Console().print(table)
+
+
+def _format_duration(seconds: float) -> str:
+    return f"{seconds * 1000:.1f} ms"
+
+
+def _format_size(n_bytes: Optional[int]) -> str:
+    if n_bytes is None:
+        return "-"
+    return f"{n_bytes / 1024 / 1024:.2f} MiB"
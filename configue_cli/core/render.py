@@ -54,7 +54,7 @@ class Parser:
 
     def _parse_dict(self, obj: Dict, depth: Optional[int] = None, prefix_key: str = "") -> List[Tree]:
         trees: List[Tree] = []
-        for key, value in obj.items():
+        for key, value in dict.items(obj):
             dotted_key_name = str(key) if prefix_key == "" else f"{prefix_key}.{str(key)}"
             if isinstance(value, MissingType):
                 if self.throw_on_missing_value:
@@ -0,0 +1,155 @@
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Collection, Dict, List, NamedTuple, Optional, Sequence, Set
+
+from .concurrency import map_ordered
+from .dict_config import DictConfig
+from .snapshot import SNAPSHOT_SUFFIX, dump_snapshot
+
+# Directory of the remote nodes in which the configurations shipped with the tasks are mounted
+REMOTE_CONFIGS_DIRECTORY = "~/.configue"
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigArtifact(NamedTuple):
+    """Snapshot of the configuration of a run, written locally and mounted on the remote nodes of its task."""
+
+    local_path: str
+    remote_path: str
+
+
+class SkyPilotSubmission(NamedTuple):
+    """Execution of a SkyPilot task, built in memory from the resolved configuration of a run.
+
+    The local files of `temporary_paths` are removed once the task is submitted.
+    """
+
+    task_config: Dict[str, Any]
+    cluster_name: Optional[str] = None
+    dryrun: bool = False
+    down: bool = False
+    stream_logs: bool = True
+    temporary_paths: Sequence[str] = ()
+
+    @classmethod
+    def from_config(cls, sky_config: Dict[str, Any], temporary_paths: Sequence[str] = ()) -> "SkyPilotSubmission":
+        return cls(
+            task_config=sky_config["task"],
+            cluster_name=sky_config.get("cluster-name"),
+            dryrun=sky_config.get("dryrun", False),
+            down=sky_config.get("down", False),
+            stream_logs=sky_config.get("stream-logs", True),
+            temporary_paths=temporary_paths,
+        )
+
+
+class SubmissionReport(NamedTuple):
+    submission: SkyPilotSubmission
+    latency: float
+
+
+def import_sky() -> Any:
+    try:
+        import sky
+    except ImportError as exc:  # pragma: no cover
+        raise ImportError("skypilot is not installed, use `pip install skypilot`") from exc
+    return sky
+
+
+def create_task(sky: Any, task_config: Dict[str, Any]) -> Any:
+    if hasattr(sky.Task, "from_yaml_config"):
+        return sky.Task.from_yaml_config(task_config)
+    # Older versions of SkyPilot only create tasks from YAML files
+    return _create_task_from_file(sky, task_config)  # pragma: no cover
+
+
+def _create_task_from_file(sky: Any, task_config: Dict[str, Any]) -> Any:
+    import yaml
+
+    with tempfile.NamedTemporaryFile(suffix=".yml", mode="w") as sky_file:
+        yaml.safe_dump(task_config, sky_file)
+        sky_file.flush()
+        return sky.Task.from_yaml(sky_file.name)
+
+
+def write_config_artifact(
+    config: DictConfig, source_hash: str, *, workdir: Optional[str] = None, local_paths: Collection[str] = ()
+) -> ConfigArtifact:
+    """Snapshot a merged configuration to a temporary file, to be mounted on the remote nodes of a task.
+
+    The workdir of the task is synchronized to another directory on the remote nodes, so the values of the
+    configuration that are paths of `local_paths` inside the workdir are made relative to it. The remote file is named
+    after the content of the snapshot.
+    """
+    if workdir is not None:
+        workdir = os.path.abspath(os.path.expanduser(workdir))
+        config = _relative_paths(config, workdir, set(local_paths), {})
+    content = dump_snapshot(config, source_hash)
+    remote_path = f"{REMOTE_CONFIGS_DIRECTORY}/{hashlib.sha256(content).hexdigest()[:16]}{SNAPSHOT_SUFFIX}"
+    file_descriptor, local_path = tempfile.mkstemp(prefix="configue-", suffix=SNAPSHOT_SUFFIX)
+    with os.fdopen(file_descriptor, "wb") as writer:
+        writer.write(content)
+    return ConfigArtifact(local_path, remote_path)
+
+
+def _relative_paths(value: Any, workdir: str, local_paths: Set[str], copies: Dict[int, Any]) -> Any:
+    if isinstance(value, str):
+        path = os.path.abspath(value)
+        if path in local_paths and path.startswith(workdir + os.sep):
+            return os.path.relpath(path, workdir)
+        return value
+    if not isinstance(value, (dict, list)):
+        return value
+    # Subtrees referenced several times with `!cfg` are copied once, so that they are still shared in the snapshot
+    if id(value) not in copies:
+        if isinstance(value, dict):
+            copy = copies[id(value)] = type(value)()
+            for key, sub_value in dict.items(value):
+                dict.__setitem__(copy, key, _relative_paths(sub_value, workdir, local_paths, copies))
+        else:
+            copies[id(value)] = [_relative_paths(sub_value, workdir, local_paths, copies) for sub_value in value]
+    return copies[id(value)]
+
+
+def submit(submissions: Sequence[SkyPilotSubmission], *, workers: Optional[int] = None) -> List[SubmissionReport]:
+    """Execute SkyPilot tasks, on at most `workers` clusters at a time, and report the latency of each of them.
+
+    Every execution synchronizes the workdir and the mounted files of its task to the same directories of the cluster,
+    so the tasks of a cluster are executed one after the other. `sky.exec` looks the cluster up and chooses its backend
+    on every call, and does not accept a cluster handle to reuse. The submissions are reported in the order they are
+    given.
+    """
+    sky = import_sky()
+
+    def submit_one(submission: SkyPilotSubmission) -> SubmissionReport:
+        start = time.perf_counter()
+        try:
+            sky.exec(
+                create_task(sky, submission.task_config),
+                cluster_name=submission.cluster_name,
+                dryrun=submission.dryrun,
+                down=submission.down,
+                stream_logs=submission.stream_logs,
+            )
+        finally:
+            for temporary_path in submission.temporary_paths:
+                os.remove(temporary_path)
+        latency = time.perf_counter() - start
+        logger.info(f"Submitted command {submission.task_config['run']} to {submission.cluster_name} in {latency:.2f}s")
+        return SubmissionReport(submission, latency)
+
+    indices_by_cluster: Dict[Optional[str], List[int]] = {}
+    for index, submission in enumerate(submissions):
+        indices_by_cluster.setdefault(submission.cluster_name, []).append(index)
+    reports: Dict[int, SubmissionReport] = {}
+
+    def submit_to_cluster(indices: List[int]) -> None:
+        for index in indices:
+            reports[index] = submit_one(submissions[index])
+
+    map_ordered(submit_to_cluster, list(indices_by_cluster.values()), workers=workers)
+    return [reports[index] for index in range(len(submissions))]
@@ -0,0 +1,78 @@
+import hashlib
+import struct
+from typing import IO, Any, NamedTuple, Sequence
+
+from .dict_config import DictConfig
+from .exceptions import InvalidSnapshotError
+
+SNAPSHOT_SUFFIX = ".cfgc"
+SNAPSHOT_MAGIC = b"CFGC"
+SNAPSHOT_FORMAT_VERSION = 1
+# Magic number, format version and SHA-256 digest of the sources of the snapshot
+HEADER_STRUCT = struct.Struct(">4sH32s")
+
+
+class SnapshotHeader(NamedTuple):
+    version: int
+    source_hash: str
+
+
+def compute_source_hash(config_paths: Sequence[str], parameters: Sequence[str]) -> str:
+    """Hash the contents of the configuration files and the command line parameters a configuration is merged from."""
+    digest = hashlib.sha256()
+    for config_path in config_paths:
+        with open(config_path, "rb") as reader:
+            digest.update(hashlib.sha256(reader.read()).digest())
+    for parameter in parameters:
+        digest.update(hashlib.sha256(parameter.encode("utf-8")).digest())
+    return digest.hexdigest()
+
+
+def _read_header(reader: IO[bytes], file_path: str) -> SnapshotHeader:
+    header = reader.read(HEADER_STRUCT.size)
+    if len(header) != HEADER_STRUCT.size:
+        raise InvalidSnapshotError(f"{file_path} is not a configuration snapshot: truncated header")
+    magic, version, source_hash = HEADER_STRUCT.unpack(header)
+    if magic != SNAPSHOT_MAGIC:
+        raise InvalidSnapshotError(f"{file_path} is not a configuration snapshot")
+    return SnapshotHeader(version, source_hash.hex())
+
+
+def read_snapshot_header(file_path: str) -> SnapshotHeader:
+    """Read the header of a snapshot without loading the configuration it contains."""
+    with open(file_path, "rb") as reader:
+        return _read_header(reader, file_path)
+
+
+def dump_snapshot(config: DictConfig, source_hash: str) -> bytes:
+    """Serialize a merged configuration, before its dataclasses are traversed, to the content of a binary snapshot.
+
+    The snapshot is a header followed by the pickled configuration. It can only be loaded by a compatible version of
+    configue-cli and with the classes referenced by the configuration importable.
+    """
+    import pickle
+
+    header = HEADER_STRUCT.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, bytes.fromhex(source_hash))
+    return header + pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def write_snapshot(file_path: str, config: DictConfig, source_hash: str) -> None:
+    """Save a merged configuration, before its dataclasses are traversed, to a binary snapshot."""
+    with open(file_path, "wb") as writer:
+        writer.write(dump_snapshot(config, source_hash))
+
+
+def load_snapshot(file_path: str) -> Any:
+    import pickle
+
+    with open(file_path, "rb") as reader:
+        header = _read_header(reader, file_path)
+        if header.version != SNAPSHOT_FORMAT_VERSION:
+            raise InvalidSnapshotError(
+                f"{file_path} was compiled with snapshot format {header.version}, "
+                f"expected format {SNAPSHOT_FORMAT_VERSION}: compile it again"
+            )
+        try:
+            return pickle.load(reader)
+        except Exception as exc:
+            raise InvalidSnapshotError(f"Could not load the configuration snapshot {file_path}: {exc}") from exc
@@ -0,0 +1,81 @@
+import itertools
+import re
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .exceptions import InvalidSweepError
+
+RANGE_REGEX = re.compile(r"range\((.*)\)")
+OPENING_BRACKETS = "([{"
+CLOSING_BRACKETS = ")]}"
+QUOTES = "\"'"
+
+
+def split_top_level(value: str, separator: str = ",") -> List[str]:
+    """Split `value` on the separators that are neither quoted nor enclosed in brackets."""
+    parts = []
+    depth = 0
+    quote: Optional[str] = None
+    start = 0
+    for index, character in enumerate(value):
+        if quote is not None:
+            if character == quote:
+                quote = None
+        elif character in QUOTES:
+            quote = character
+        elif character in OPENING_BRACKETS:
+            depth += 1
+        elif character in CLOSING_BRACKETS:
+            depth -= 1
+        elif character == separator and depth == 0:
+            parts.append(value[start:index])
+            start = index + 1
+    parts.append(value[start:])
+    return parts
+
+
+def expand_range(arguments: str) -> List[str]:
+    try:
+        bounds = [int(argument) for argument in split_top_level(arguments)]
+        return [str(value) for value in range(*bounds)]
+    except (TypeError, ValueError) as exc:
+        raise InvalidSweepError(f"Invalid sweep `range({arguments})`: {exc}") from exc
+
+
+class Sweep(NamedTuple):
+    """Command line parameters in which some values are swept.
+
+    `key=value_1,value_2` sweeps the values separated by top-level commas and `key=range(start, stop, step)` sweeps
+    integers like the Python `range`.
+    """
+
+    fixed_parameters: List[str]
+    swept_parameters: List[Tuple[str, List[str]]]
+
+    @classmethod
+    def from_parameters(cls, parameters: Sequence[str]) -> "Sweep":
+        fixed_parameters = []
+        swept_parameters = []
+        for parameter in parameters:
+            key, separator, value = parameter.partition("=")
+            range_match = RANGE_REGEX.fullmatch(value.strip())
+            if separator and range_match is not None:
+                swept_parameters.append((key, expand_range(range_match.group(1))))
+                continue
+            values = split_top_level(value)
+            if separator and len(values) > 1:
+                swept_parameters.append((key, values))
+            else:
+                fixed_parameters.append(parameter)
+        return cls(fixed_parameters, swept_parameters)
+
+    def __len__(self) -> int:
+        n_combinations = 1
+        for _, values in self.swept_parameters:
+            n_combinations *= len(values)
+        return n_combinations
+
+    def combinations(self) -> Iterator[List[str]]:
+        """Lazily yield the parameters of all the combinations of the swept values, the last parameter varying first."""
+        keys = [key for key, _ in self.swept_parameters]
+        for values in itertools.product(*(values for _, values in self.swept_parameters)):
+            yield [f"{key}={value}" for key, value in zip(keys, values)]
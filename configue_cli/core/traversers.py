@@ -1,5 +1,8 @@
 import dataclasses
-from typing import Any, ClassVar, Dict, Optional, Tuple, Type, Union, cast
+import inspect
+import typing
+from enum import IntEnum
+from typing import Any, ClassVar, Dict, NamedTuple, Optional, Tuple, Type, Union, cast
 
 import attr
 
@@ -14,128 +17,117 @@ class NativeDataclassInstance:
 DataclassInstance = Union[NativeDataclassInstance, attr.AttrsInstance]
 
 
+class FieldKind(IntEnum):
+    NESTED = 0
+    DEFAULT = 1
+    FACTORY = 2
+    FACTORY_TAKES_SELF = 3
+    REQUIRED = 4
+
+
+class FieldPlan(NamedTuple):
+    name: str
+    kind: FieldKind
+    # The dataclass type to traverse, the default value or the factory depending on the kind of the field
+    value: Any
+
+
+TypePlan = Tuple[FieldPlan, ...]
+
+
+def _is_dataclass_type(value: Any) -> bool:
+    return Traverser.get_traverser(value) is not None
+
+
+def _resolve_field_types(type_: type, field_types: Dict[str, Any]) -> Dict[str, Any]:
+    # Annotations are strings when using `from __future__ import annotations`
+    if not any(isinstance(field_type, str) for field_type in field_types.values()):
+        return field_types
+    try:
+        type_hints = typing.get_type_hints(type_)
+    except Exception:
+        return field_types
+    return {name: type_hints.get(name, field_type) for name, field_type in field_types.items()}
+
+
 class NativeDataclassTraverser:
+    _type_plans: ClassVar[Dict[type, TypePlan]] = {}
+
     @staticmethod
+    def compile_type_plan(type_: Type[NativeDataclassInstance]) -> TypePlan:
+        fields = [field for field in dataclasses.fields(type_) if field.init]
+        field_types = _resolve_field_types(type_, {field.name: field.type for field in fields})
+
+        plan = []
+        for field in fields:
+            if not isinstance(field.default, dataclasses._MISSING_TYPE):
+                kind = FieldKind.NESTED if _is_dataclass_type(field.default) else FieldKind.DEFAULT
+                plan.append(FieldPlan(field.name, kind, field.default))
+            elif not isinstance(field.default_factory, dataclasses._MISSING_TYPE):
+                plan.append(FieldPlan(field.name, FieldKind.FACTORY, field.default_factory))
+            else:
+                field_type = field_types[field.name]
+                kind = FieldKind.NESTED if _is_dataclass_type(field_type) else FieldKind.REQUIRED
+                plan.append(FieldPlan(field.name, kind, field_type))
+        return tuple(plan)
+
+    @classmethod
+    def get_type_plan(cls, type_: Type[NativeDataclassInstance]) -> TypePlan:
+        if type_ not in cls._type_plans:
+            cls._type_plans[type_] = cls.compile_type_plan(type_)
+        return cls._type_plans[type_]
+
+    @classmethod
     def traverse_instance(
+        cls,
         instance: NativeDataclassInstance,
         initial_config: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Dict[str, Any], NativeDataclassInstance]:
-        config: Dict[str, Any] = {"()": instance.__class__.__module__ + "." + instance.__class__.__qualname__}
-        partially_init_instance = instance.__class__.__new__(instance.__class__)
-        initial_config = initial_config or {}
+        return Traverser.traverse_instance_with_plan(instance, cls.get_type_plan(instance.__class__), initial_config)
 
-        for field in dataclasses.fields(instance.__class__):
-            if not field.init:
-                continue
-            sub_instance = getattr(instance, field.name)
-            sub_config, partially_init_subinstance = Traverser.traverse_instance(
-                sub_instance, initial_config=initial_config.get(field.name, None)
-            )
-            setattr(partially_init_instance, field.name, partially_init_subinstance)
-            config[field.name] = sub_config
-        return config, instance
-
-    @staticmethod
+    @classmethod
     def traverse_type(
+        cls,
         type_: Type[NativeDataclassInstance],
         initial_config: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Dict[str, Any], NativeDataclassInstance]:
-        config: Dict[str, Any] = {"()": type_.__module__ + "." + type_.__qualname__}
-        partially_init_instance = type_.__new__(type_)
-        initial_config = initial_config or {}
-
-        for field in dataclasses.fields(type_):
-            if not field.init:
-                continue
-            if not isinstance(field.default, dataclasses._MISSING_TYPE):
-                sub_instance_type = field.default
-                try:
-                    sub_config, partially_init_subinstance = Traverser.traverse_type(
-                        sub_instance_type, initial_config=initial_config.get(field.name, None)
-                    )
-                    setattr(partially_init_instance, field.name, partially_init_subinstance)
-                except UnsupportedDataclassTypeError:
-                    sub_config = initial_config.get(field.name, sub_instance_type)
-                    setattr(partially_init_instance, field.name, sub_config)
-
-            elif not isinstance(field.default_factory, dataclasses._MISSING_TYPE):
-                sub_instance = field.default_factory()
-                sub_config, partially_init_subinstance = Traverser.traverse_instance(
-                    sub_instance, initial_config=initial_config.get(field.name, None)
-                )
-                setattr(partially_init_instance, field.name, partially_init_subinstance)
-
-            else:
-                sub_instance_type = field.type
-                try:
-                    sub_config, partially_init_subinstance = Traverser.traverse_type(
-                        sub_instance_type, initial_config=initial_config.get(field.name, None)
-                    )
-                    setattr(partially_init_instance, field.name, partially_init_subinstance)
-                except UnsupportedDataclassTypeError:
-                    sub_config = initial_config.get(field.name, MISSING)
-                    try:
-                        setattr(partially_init_instance, field.name, sub_config)
-                    except TypeError:
-                        # a converter can raise an issue here so we bypass it
-                        pass
-
-            config[field.name] = sub_config
-
-        return config, partially_init_instance
+        return Traverser.traverse_type_with_plan(type_, cls.get_type_plan(type_), initial_config)
 
 
 class AttrsDataclassTraverser:
-    @staticmethod
-    def _update_with_factory_takes_self(
-        field: attr.Attribute,
-        partially_init_instance: attr.AttrsInstance,
-        initial_config: Dict[str, Any],
-    ) -> Any:
-        try:
-            sub_instance = field.default.factory(partially_init_instance)  # type: ignore[union-attr]
-            sub_config, partially_init_subinstance = Traverser.traverse_instance(
-                sub_instance, initial_config=initial_config.get(field.name, None)
-            )
-            setattr(partially_init_instance, field.name, partially_init_subinstance)
-
-        except Exception:
-            sub_config = initial_config.get(field.name, MISSING)
-            setattr(partially_init_instance, field.name, sub_config)
-        return sub_config
+    _type_plans: ClassVar[Dict[type, TypePlan]] = {}
 
     @staticmethod
-    def _update_with_factory_no_takes_self(
-        field: attr.Attribute,
-        partially_init_instance: attr.AttrsInstance,
-        initial_config: Dict[str, Any],
-    ) -> Any:
-        sub_instance = field.default.factory()  # type: ignore[union-attr]
-        sub_config, partially_init_subinstance = Traverser.traverse_instance(
-            sub_instance, initial_config=initial_config.get(field.name, None)
-        )
-        setattr(partially_init_instance, field.name, partially_init_subinstance)
-        return sub_config
+    def compile_type_plan(type_: Type[attr.AttrsInstance]) -> TypePlan:
+        fields = [field for field in attr.fields(type_) if field.init]
+        field_types = _resolve_field_types(type_, {field.name: field.type for field in fields})
+
+        plan = []
+        for field in fields:
+            if isinstance(field.default, attr.Factory):  # type: ignore[arg-type]
+                kind = FieldKind.FACTORY_TAKES_SELF if field.default.takes_self else FieldKind.FACTORY
+                plan.append(FieldPlan(field.name, kind, field.default.factory))
+            elif field.default is not attr.NOTHING:
+                plan.append(FieldPlan(field.name, FieldKind.DEFAULT, field.default))
+            else:
+                field_type = field_types[field.name]
+                kind = FieldKind.NESTED if _is_dataclass_type(field_type) else FieldKind.REQUIRED
+                plan.append(FieldPlan(field.name, kind, field_type))
+        return tuple(plan)
 
-    @staticmethod
+    @classmethod
+    def get_type_plan(cls, type_: Type[attr.AttrsInstance]) -> TypePlan:
+        if type_ not in cls._type_plans:
+            cls._type_plans[type_] = cls.compile_type_plan(type_)
+        return cls._type_plans[type_]
+
+    @classmethod
     def traverse_instance(
+        cls,
         instance: attr.AttrsInstance,
         initial_config: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Dict[str, Any], attr.AttrsInstance]:
-        config: Dict[str, Any] = {"()": instance.__class__.__module__ + "." + instance.__class__.__qualname__}
-        partially_init_instance = instance.__class__.__new__(instance.__class__)
-        initial_config = initial_config or {}
-
-        for field in attr.fields(instance.__class__):
-            if not field.init:
-                continue
-            sub_instance = getattr(instance, field.name)
-            sub_config, partially_init_subinstance = Traverser.traverse_instance(
-                sub_instance, initial_config=initial_config.get(field.name, None)
-            )
-            setattr(partially_init_instance, field.name, partially_init_subinstance)
-            config[field.name] = sub_config
-        return config, instance
+        return Traverser.traverse_instance_with_plan(instance, cls.get_type_plan(instance.__class__), initial_config)
 
     @classmethod
     def traverse_type(
@@ -143,44 +135,7 @@ class AttrsDataclassTraverser:
         type_: Type[attr.AttrsInstance],
         initial_config: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Dict[str, Any], attr.AttrsInstance]:
-        config: Dict[str, Any] = {"()": type_.__module__ + "." + type_.__qualname__}
-        partially_init_instance = type_.__new__(type_)
-        initial_config = initial_config or {}
-
-        for field in attr.fields(type_):
-            if not field.init:
-                continue
-            if field.default != attr._make._Nothing.NOTHING:  # type: ignore[attr-defined]
-                if isinstance(field.default, attr._make.Factory):  # type: ignore[attr-defined]
-                    if field.default.takes_self:
-                        sub_config = cls._update_with_factory_takes_self(field, partially_init_instance, initial_config)
-                    else:
-                        sub_config = cls._update_with_factory_no_takes_self(
-                            field, partially_init_instance, initial_config
-                        )
-
-                else:
-                    sub_config = initial_config.get(field.name, field.default)
-                    setattr(partially_init_instance, field.name, sub_config)
-
-            else:
-                try:
-                    sub_config, partially_init_subinstance = Traverser.traverse_type(
-                        field.type, initial_config=initial_config.get(field.name, None)
-                    )
-                    setattr(partially_init_instance, field.name, partially_init_subinstance)
-
-                except UnsupportedDataclassTypeError:
-                    sub_config = initial_config.get(field.name, MISSING)
-                    try:
-                        setattr(partially_init_instance, field.name, sub_config)
-                    except TypeError:
-                        # a converter can raise an issue here so we bypass it
-                        pass
-
-            config[field.name] = sub_config
-
-        return config, partially_init_instance
+        return Traverser.traverse_type_with_plan(type_, cls.get_type_plan(type_), initial_config)
 
 
 class DictTraverser:
@@ -198,13 +153,99 @@ class DictTraverser:
         return config, instance
 
 
+DataclassTraverser = Union[Type[NativeDataclassTraverser], Type[AttrsDataclassTraverser]]
+
+
 class Traverser:
+    _traversers_by_type: ClassVar[Dict[type, Optional[DataclassTraverser]]] = {}
+
+    @classmethod
+    def get_traverser(cls, type_: Any) -> Optional[DataclassTraverser]:
+        if not inspect.isclass(type_):
+            return None
+        if type_ in cls._traversers_by_type:
+            return cls._traversers_by_type[type_]
+
+        traverser: Optional[DataclassTraverser] = None
+        if dataclasses.is_dataclass(type_):
+            traverser = NativeDataclassTraverser
+        elif attr.has(type_):
+            traverser = AttrsDataclassTraverser
+        cls._traversers_by_type[type_] = traverser
+        return traverser
+
+    @staticmethod
+    def traverse_instance_with_plan(
+        instance: Any,
+        plan: TypePlan,
+        initial_config: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], Any]:
+        config: Dict[str, Any] = {"()": instance.__class__.__module__ + "." + instance.__class__.__qualname__}
+        partially_init_instance = instance.__class__.__new__(instance.__class__)
+        initial_config = initial_config or {}
+
+        for name, _, _ in plan:
+            sub_config, partially_init_subinstance = Traverser.traverse_instance(
+                getattr(instance, name), initial_config=initial_config.get(name, None)
+            )
+            setattr(partially_init_instance, name, partially_init_subinstance)
+            config[name] = sub_config
+        return config, instance
+
+    @staticmethod
+    def traverse_type_with_plan(
+        type_: Any,
+        plan: TypePlan,
+        initial_config: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], Any]:
+        config: Dict[str, Any] = {"()": type_.__module__ + "." + type_.__qualname__}
+        partially_init_instance = type_.__new__(type_)
+        initial_config = initial_config or {}
+
+        for name, kind, value in plan:
+            if kind is FieldKind.NESTED:
+                sub_config, partially_init_subinstance = Traverser.traverse_type(
+                    value, initial_config=initial_config.get(name, None)
+                )
+                setattr(partially_init_instance, name, partially_init_subinstance)
+
+            elif kind is FieldKind.DEFAULT:
+                sub_config = initial_config.get(name, value)
+                setattr(partially_init_instance, name, sub_config)
+
+            elif kind is FieldKind.FACTORY:
+                sub_config, partially_init_subinstance = Traverser.traverse_instance(
+                    value(), initial_config=initial_config.get(name, None)
+                )
+                setattr(partially_init_instance, name, partially_init_subinstance)
+
+            elif kind is FieldKind.FACTORY_TAKES_SELF:
+                try:
+                    sub_config, partially_init_subinstance = Traverser.traverse_instance(
+                        value(partially_init_instance), initial_config=initial_config.get(name, None)
+                    )
+                    setattr(partially_init_instance, name, partially_init_subinstance)
+                except Exception:
+                    sub_config = initial_config.get(name, MISSING)
+                    setattr(partially_init_instance, name, sub_config)
+
+            else:
+                sub_config = initial_config.get(name, MISSING)
+                try:
+                    setattr(partially_init_instance, name, sub_config)
+                except TypeError:
+                    # a converter can raise an issue here so we bypass it
+                    pass
+
+            config[name] = sub_config
+
+        return config, partially_init_instance
+
     @classmethod
     def traverse_instance(cls, instance: Any, initial_config: Any = None) -> Tuple[Any, Any]:
-        if dataclasses.is_dataclass(instance.__class__):
-            return NativeDataclassTraverser.traverse_instance(instance, initial_config)
-        if attr.has(instance.__class__):
-            return AttrsDataclassTraverser.traverse_instance(instance, initial_config)
+        traverser = cls.get_traverser(instance.__class__)
+        if traverser is not None:
+            return traverser.traverse_instance(instance, initial_config)
         if isinstance(instance, dict):
             return DictTraverser.traverse_instance(instance)
         instance = initial_config if initial_config is not None else instance
@@ -216,12 +257,9 @@ class Traverser:
         type_: Type[DataclassInstance],
         initial_config: Any = None,
     ) -> Tuple[Dict[str, Any], DataclassInstance]:
-        if dataclasses.is_dataclass(type_):
-            return NativeDataclassTraverser.traverse_type(
-                cast(Type[NativeDataclassInstance], type_), initial_config=initial_config
+        traverser = cls.get_traverser(type_)
+        if traverser is None:
+            raise UnsupportedDataclassTypeError(
+                f"`type_` should be the type of a native dataclass or `attr` dataclass, not {type_}"
             )
-        if attr.has(type_):
-            return AttrsDataclassTraverser.traverse_type(type_, initial_config=initial_config)
-        raise UnsupportedDataclassTypeError(
-            f"`type_` should be the type of a native dataclass or `attr` dataclass, not {type_}"
-        )
+        return traverser.traverse_type(cast(Any, type_), initial_config=initial_config)
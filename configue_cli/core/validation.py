@@ -0,0 +1,33 @@
+from typing import Any, List, Tuple
+
+from .exceptions import MissingMandatoryValueError
+from .missing import MissingType
+
+
+def find_missing_paths(config: Any) -> List[str]:
+    """Return the dotted paths of all the missing values of a configuration, in depth-first order."""
+    missing_paths = []
+    # The children of a node are pushed in reverse order so that they are visited in order
+    stack: List[Tuple[str, Any]] = [("", config)]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, MissingType):
+            missing_paths.append(path)
+        elif isinstance(value, dict):
+            stack.extend((_join(path, str(key)), sub_value) for key, sub_value in reversed(list(dict.items(value))))
+        elif isinstance(value, list):
+            stack.extend((_join(path, str(index)), sub_value) for index, sub_value in reversed(list(enumerate(value))))
+    return missing_paths
+
+
+def _join(prefix: str, key: str) -> str:
+    return key if prefix == "" else f"{prefix}.{key}"
+
+
+def validate(config: Any) -> None:
+    """Raise a `MissingMandatoryValueError` listing all the missing values of a configuration (if any)."""
+    missing_paths = find_missing_paths(config)
+    if len(missing_paths) == 1:
+        raise MissingMandatoryValueError(f"Missing mandatory value: {missing_paths[0]}")
+    if missing_paths:
+        raise MissingMandatoryValueError(f"Missing mandatory values: {', '.join(missing_paths)}")
@@ -0,0 +1,154 @@
+import functools
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .concurrency import ExecutorKind, map_ordered
+
+if TYPE_CHECKING:
+    from .cache import NodeCache
+    from .loader import ResolutionContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+FileStat = Tuple[int, int]
+
+
+def _stat(file_path: str) -> Optional[FileStat]:
+    try:
+        stat = os.stat(file_path)
+    except OSError:  # deleted files are watched until they are created again
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ConfigFiles:
+    """The configuration files passed with -c/--config and their parsed content.
+
+    Files are loaded concurrently with a shared resolution context, so that files imported by several configuration
+    files are only parsed once, and kept until they are invalidated. The files each loaded file references through
+    `!import` and `!path` are recorded while loading it, which builds the include graph used to only reload the
+    modified files and the files depending on them.
+    """
+
+    def __init__(
+        self,
+        config_paths: Iterable[str],
+        *,
+        cache: Optional["NodeCache"] = None,
+        workers: Optional[int] = None,
+        executor_kind: ExecutorKind = ExecutorKind.THREAD,
+    ) -> None:
+        self.config_paths = list(config_paths)
+        self.cache = cache
+        self.workers = workers
+        self.executor_kind = executor_kind
+        self._context: Optional["ResolutionContext"] = None
+        self._configs: Dict[str, Any] = {}
+
+    @property
+    def context(self) -> "ResolutionContext":
+        # The loader is imported lazily to keep `--help` and shell completion fast
+        if self._context is None:
+            from .loader import ResolutionContext
+
+            self._context = ResolutionContext(self.cache)
+        return self._context
+
+    def load(self) -> List[Any]:
+        """Return the configurations of all the files in order, only loading the files that are not loaded yet."""
+        from .loader import load_with_dependencies
+
+        stale_paths = [path for path in dict.fromkeys(self.config_paths) if path not in self._configs]
+        if self.executor_kind == ExecutorKind.PROCESS:
+            # Worker processes cannot share the resolution context, they only send back the include graph
+            loaded_configs = map_ordered(
+                functools.partial(load_with_dependencies, cache=self.cache),
+                stale_paths,
+                workers=self.workers,
+                executor_kind=self.executor_kind,
+            )
+            for config_path, (config, dependencies) in zip(stale_paths, loaded_configs):
+                self._configs[config_path] = config
+                for file_path, paths in dependencies.items():
+                    self.context.dependencies.setdefault(file_path, set()).update(paths)
+        else:
+            configs = map_ordered(
+                self.context.load, stale_paths, workers=self.workers, executor_kind=self.executor_kind
+            )
+            self._configs.update(zip(stale_paths, configs))
+        return [self._configs[config_path] for config_path in self.config_paths]
+
+    def dependencies(self, config_path: str) -> Set[str]:
+        """Return the absolute paths of a configuration file and of all the files it depends on."""
+        include_graph = self.context.dependencies
+        root_path = os.path.abspath(config_path)
+        visited = {root_path}
+        stack = [root_path]
+        while stack:
+            for dependency in include_graph.get(stack.pop(), ()):
+                if dependency not in visited:
+                    visited.add(dependency)
+                    stack.append(dependency)
+        return visited
+
+    def all_dependencies(self) -> Set[str]:
+        return set().union(*(self.dependencies(config_path) for config_path in self.config_paths))
+
+    def invalidate(self, file_paths: Iterable[str]) -> List[str]:
+        """Forget `file_paths` and the files depending on them, and return the configuration files to load again."""
+        invalidated_files = self.context.dependents(file_paths)
+        self.context.forget(invalidated_files)
+        invalidated_paths = [
+            config_path
+            for config_path in dict.fromkeys(self.config_paths)
+            if os.path.abspath(config_path) in invalidated_files
+        ]
+        for config_path in invalidated_paths:
+            self._configs.pop(config_path, None)
+        return invalidated_paths
+
+
+class FileWatcher:
+    """Detect modifications of files by polling their modification time and size."""
+
+    def __init__(self, interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.interval = interval
+        self._stats: Dict[str, Optional[FileStat]] = {}
+
+    def wait_for_changes(self, file_paths: Iterable[str]) -> Set[str]:
+        """Block until some of `file_paths` are modified, created or deleted and return them.
+
+        Files that were already watched by a previous call are compared to their state at that time, so modifications
+        made in between are not missed.
+        """
+        self._stats = {
+            file_path: self._stats[file_path] if file_path in self._stats else _stat(file_path)
+            for file_path in file_paths
+        }
+        while True:
+            modified_paths = set()
+            for file_path, stat in self._stats.items():
+                current_stat = _stat(file_path)
+                if current_stat != stat:
+                    self._stats[file_path] = current_stat
+                    modified_paths.add(file_path)
+            if modified_paths:
+                return modified_paths
+            time.sleep(self.interval)
+
+
+def watch(run: Callable[[], Any], config_files: ConfigFiles, interval: float = DEFAULT_POLL_INTERVAL) -> None:
+    """Call `run` every time the configuration files or their dependencies are modified, until interrupted."""
+    file_watcher = FileWatcher(interval)
+    while True:
+        try:
+            run()
+        except Exception:  # an invalid configuration should not stop the watch
+            logger.exception("Could not run the command, waiting for the configuration to change")
+        modified_paths = file_watcher.wait_for_changes(config_files.all_dependencies())
+        invalidated_paths = config_files.invalidate(modified_paths)
+        logger.info(f"{', '.join(sorted(modified_paths))} changed, reloading {', '.join(invalidated_paths)}")
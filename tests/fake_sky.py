@@ -0,0 +1,56 @@
+"""Local stand-in for the `sky` module of SkyPilot, recording the tasks it executes."""
+import threading
+import time
+from typing import Any, Dict, List
+
+import yaml
+
+EXEC_DURATION = 0.05
+
+executions: List[Dict[str, Any]] = []
+_lock = threading.Lock()
+_running = 0
+max_running = 0
+
+
+class Task:
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+
+    @classmethod
+    def from_yaml_config(cls, config: Dict[str, Any]) -> "Task":
+        return cls(config)
+
+
+class FileTask:
+    """Task of the SkyPilot versions that only create tasks from YAML files."""
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+
+    @classmethod
+    def from_yaml(cls, file_path: str) -> "FileTask":
+        with open(file_path, encoding="utf-8") as reader:
+            return cls(yaml.safe_load(reader))
+
+
+def exec(task: Any, **kwargs: Any) -> None:
+    global _running, max_running
+    with _lock:
+        _running += 1
+        max_running = max(max_running, _running)
+    time.sleep(EXEC_DURATION)
+    # The mounted files are uploaded when the task is executed
+    mounted_files = {}
+    for remote_path, local_path in task.config.get("file_mounts", {}).items():
+        with open(local_path, "rb") as reader:
+            mounted_files[remote_path] = reader.read()
+    with _lock:
+        _running -= 1
+        executions.append({"task": task.config, "mounted_files": mounted_files, **kwargs})
+
+
+def reset() -> None:
+    global max_running
+    executions.clear()
+    max_running = 0
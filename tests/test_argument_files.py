@@ -0,0 +1,103 @@
+# mypy: disable-error-code=no-untyped-def
+import collections
+import json
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+from configue_cli.core.argument_files import ArgumentFiles
+from configue_cli.core.dict_config import DictConfig
+from configue_cli.core.exceptions import InvalidArgumentFileError
+
+from .utils import TemporaryDirectoryTestCase
+
+
+@click.command()
+@inject_from_cli()
+def main(config):
+    return config
+
+
+class TestArgumentFiles(TemporaryDirectoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.text_path = self._write(
+            "overrides.txt", "# Generated overrides\nmodel.name=camembert-base\n\nmodel.layers=[1, 2]\nseed=1,2\n"
+        )
+        self.json_lines_path = self._write(
+            "overrides.jsonl",
+            json.dumps({"model.name": "flaubert", "model.flag": "true", "optimizer": {"lr": 0.1}})
+            + "\n"
+            + json.dumps({"model.layers": [3], "activation": {"!ext": "collections.OrderedDict"}})
+            + "\n",
+        )
+
+    def _invoke(self, *arguments: str, command: click.Command = main):
+        result = CliRunner().invoke(command, list(arguments), standalone_mode=False)
+        self.assertIsNone(result.exception, result.output)
+        return result.return_value
+
+    def test_from_parameters(self):
+        argument_files = ArgumentFiles.from_parameters(["a=1", f"@{self.text_path}", f"@{self.json_lines_path}", "b=2"])
+        self.assertEqual(
+            argument_files.parameters, ["a=1", "model.name=camembert-base", "model.layers=[1, 2]", "seed=1,2", "b=2"]
+        )
+        self.assertEqual(argument_files.overrides_paths, [self.json_lines_path])
+        self.assertEqual(
+            [key for key, _ in argument_files.overrides()],
+            ["model.name", "model.flag", "optimizer", "model.layers", "activation"],
+        )
+
+    def test_text_file(self):
+        config = self._invoke(f"@{self.text_path}", "seed=3")
+        self.assertEqual(config, {"model": {"name": "camembert-base", "layers": [1, 2]}, "seed": 3})
+
+        configs = self._invoke("--multirun", f"@{self.text_path}")
+        self.assertEqual([config["seed"] for config in configs], [1, 2])
+
+    def test_json_lines_file(self):
+        # The values of JSON Lines files are typed and the command line parameters are merged after them
+        config = self._invoke(f"@{self.json_lines_path}", "optimizer.lr=0.2")
+        self.assertEqual(config["model"], {"name": "flaubert", "flag": "true", "layers": [3]})
+        self.assertEqual(config["optimizer"], {"lr": 0.2})
+        self.assertIsInstance(config["optimizer"], DictConfig)
+        self.assertIs(config["activation"], collections.OrderedDict)
+
+    def test_in_memory_overrides(self):
+        @click.command()
+        @inject_from_cli(overrides=iter([("model.name", "flaubert"), ("model.layers", [1, 2])]))
+        def main_with_overrides(config):
+            return config
+
+        for _ in range(2):
+            config = self._invoke("model.layers=[3]", command=main_with_overrides)
+            self.assertEqual(config, {"model": {"name": "flaubert", "layers": [3]}})
+        self.assertEqual(DictConfig.from_overrides({"a.b": {"c": 1}}), {"a": {"b": {"c": 1}}})
+
+    def test_in_memory_overrides_are_copied(self):
+        model = DictConfig({"name": "flaubert", "optimizer": {"lr": 0.1}})
+
+        @click.command()
+        @inject_from_cli(overrides={"model": model})
+        def main_with_overrides(config):
+            return config
+
+        # The caller still owns the configurations given as overrides
+        model["name"] = "camembert-base"
+        model["optimizer"]["lr"] = 0.2
+        config = self._invoke(command=main_with_overrides)
+        self.assertEqual(config, {"model": {"name": "flaubert", "optimizer": {"lr": 0.1}}})
+        config["model"]["optimizer"]["lr"] = 0.3
+        self.assertEqual(model, {"name": "camembert-base", "optimizer": {"lr": 0.2}})
+
+    def test_invalid_files(self):
+        invalid_path = self._write("invalid.jsonl", "[1, 2]\n")
+        for arguments, message in [
+            ([f"@{invalid_path}"], "expected an object mapping dotted keys to values on line 1"),
+            (["@missing.txt"], "Argument file missing.txt does not exist"),
+        ]:
+            with self.subTest(arguments=arguments):
+                result = CliRunner().invoke(main, arguments, standalone_mode=False)
+                self.assertIsInstance(result.exception, InvalidArgumentFileError)
+                self.assertIn(message, str(result.exception))
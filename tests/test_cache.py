@@ -0,0 +1,80 @@
+# mypy: disable-error-code=no-untyped-def
+import os
+import shutil
+import unittest
+import unittest.mock
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+from configue_cli.core.cache import NodeCache
+from configue_cli.core.loader import BaseFileLoader, load_from_path
+
+from .utils import TemporaryDirectoryTestCase
+
+
+class TestNodeCache(TemporaryDirectoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache = NodeCache(self._path("cache"))
+        self.config_path = self._path("config.yml")
+        shutil.copy("tests/config_1.yml", self.config_path)
+
+    def test_warm_load_skips_parsing(self) -> None:
+        expected = load_from_path(self.config_path, instantiate=False, cache=self.cache)
+        # Both parser backends parse the files through `_parse`
+        with unittest.mock.patch.object(BaseFileLoader, "_parse", side_effect=AssertionError("parsed")):
+            config = load_from_path(self.config_path, instantiate=False, cache=self.cache)
+        self.assertEqual(config, expected)
+
+    def test_cache_hits_do_not_read_files(self) -> None:
+        load_from_path(self.config_path, instantiate=False, cache=self.cache)
+        with unittest.mock.patch.object(NodeCache, "fingerprint", side_effect=AssertionError("read")):
+            self.assertIsNotNone(self.cache.get(self.config_path))
+
+        # Files whose modification time changed but not their size are compared by content
+        stat = os.stat(self.config_path)
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        with unittest.mock.patch.object(NodeCache, "fingerprint", wraps=NodeCache.fingerprint) as fingerprint:
+            self.assertIsNotNone(self.cache.get(self.config_path))
+        fingerprint.assert_called_once_with(self.config_path)
+        with open(self.config_path, "r+", encoding="utf-8") as writer:
+            content = writer.read()
+            writer.seek(0)
+            writer.write(content.replace("param_1: 2", "param_1: 3", 1))
+        self.assertIsNone(self.cache.get(self.config_path))
+
+    def test_modified_file_is_parsed_again(self) -> None:
+        load_from_path(self.config_path, instantiate=False, cache=self.cache)
+        with open(self.config_path, "a", encoding="utf-8") as writer:
+            writer.write("param_2: 5\n")
+        config = load_from_path(self.config_path, instantiate=False, cache=self.cache)
+        self.assertEqual(config["param_2"], 5)
+
+    def test_least_recently_used_entries_are_evicted(self) -> None:
+        other_config_path = self._path("other_config.yml")
+        shutil.copy("tests/config_2.yml", other_config_path)
+        load_from_path(self.config_path, instantiate=False, cache=self.cache)
+        entry_size = sum(entry.stat().st_size for entry in os.scandir(self.cache.directory))
+
+        cache = NodeCache(self.cache.directory, max_size=entry_size)
+        load_from_path(other_config_path, instantiate=False, cache=cache)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+        self.assertIsNone(cache.get(self.config_path))
+        self.assertIsNotNone(cache.get(other_config_path))
+
+    def test_disable_cache_from_cli(self) -> None:
+        @click.command()
+        @inject_from_cli(cache_dir=self.cache.directory)
+        def main(config) -> None:
+            pass
+
+        runner = CliRunner()
+        result = runner.invoke(main, ["-c", self.config_path, "--no-cache"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertFalse(os.path.exists(self.cache.directory))
+
+        result = runner.invoke(main, ["-c", self.config_path])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
@@ -0,0 +1,135 @@
+# mypy: disable-error-code=no-untyped-def
+import functools
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+from configue_cli.core import loader
+from configue_cli.core.concurrency import ExecutorKind, map_ordered, run_task_graph
+from configue_cli.core.dict_config import ListMergeMode
+
+from .utils import TemporaryDirectoryTestCase
+
+
+PARSE = loader.YamlFileLoader._parse
+
+
+def slow_parse(*args):
+    time.sleep(0.05)
+    return PARSE(*args)
+
+
+def slow_square(value: int) -> int:
+    # The first items finish last
+    time.sleep(0.01 * (5 - value))
+    return value * value
+
+
+class TestMapOrdered(unittest.TestCase):
+    def test_results_are_ordered(self):
+        for executor_kind in ExecutorKind:
+            with self.subTest(executor_kind=executor_kind):
+                results = map_ordered(slow_square, list(range(5)), workers=5, executor_kind=executor_kind)
+                self.assertEqual(results, [0, 1, 4, 9, 16])
+
+    def test_processes_are_spawned_outside_linux(self):
+        with mock.patch.object(sys, "platform", "darwin"), mock.patch(
+            "concurrent.futures.ProcessPoolExecutor", wraps=ProcessPoolExecutor
+        ) as executor_cls:
+            results = map_ordered(slow_square, list(range(3)), workers=3, executor_kind=ExecutorKind.PROCESS)
+        self.assertEqual(results, [0, 1, 4])
+        # The platform's default start method is used instead of `fork`
+        self.assertNotIn("mp_context", executor_cls.call_args.kwargs)
+
+    def test_sequential(self):
+        self.assertEqual(map_ordered(slow_square, [1, 2], workers=1), [1, 4])
+        self.assertEqual(map_ordered(slow_square, []), [])
+
+
+class TestRunTaskGraph(unittest.TestCase):
+    def test_tasks_run_after_their_dependencies(self):
+        finished = []
+
+        def task(index: int) -> int:
+            time.sleep(0.01 * (3 - index))
+            finished.append(index)
+            return index
+
+        tasks = [functools.partial(task, index) for index in range(4)]
+        for workers in (1, 4):
+            with self.subTest(workers=workers):
+                finished.clear()
+                self.assertEqual(run_task_graph(tasks, [[], [], [0, 1], [0]], workers=workers), [0, 1, 2, 3])
+                self.assertLess(finished.index(0), finished.index(2))
+                self.assertLess(finished.index(1), finished.index(2))
+                self.assertLess(finished.index(0), finished.index(3))
+
+    def test_first_error_is_raised(self):
+        def fail(message: str) -> None:
+            time.sleep(0.01 if message == "first" else 0)
+            raise ValueError(message)
+
+        tasks = [functools.partial(fail, "first"), functools.partial(fail, "second"), lambda: None]
+        with self.assertRaisesRegex(ValueError, "first"):
+            run_task_graph(tasks, [[], [], [1]], workers=3)
+
+
+class TestConcurrentLoading(TemporaryDirectoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.config_paths = [
+            self._write(
+                f"config_{index}.yml",
+                f"values: [{index}]\nlast: {index}\nnested:\n  type: !ext collections.OrderedDict\n",
+            )
+            for index in range(6)
+        ]
+
+    def test_files_are_merged_in_order(self):
+        for workers, executor_kind in [(1, ExecutorKind.THREAD), (4, ExecutorKind.THREAD), (4, ExecutorKind.PROCESS)]:
+            with self.subTest(workers=workers, executor_kind=executor_kind):
+                configs = []
+
+                @click.command()
+                @inject_from_cli(
+                    yaml_merge_mode=ListMergeMode.EXTEND, loading_workers=workers, loading_executor=executor_kind
+                )
+                def main(config) -> None:
+                    configs.append(config)
+
+                arguments = [argument for path in self.config_paths for argument in ["-c", path]]
+                result = CliRunner().invoke(main, arguments)
+                self.assertEqual(result.exit_code, 0, result.output)
+                self.assertEqual(configs[0]["values"], [0, 1, 2, 3, 4, 5])
+                self.assertEqual(configs[0]["last"], 5)
+                self.assertIsInstance(configs[0]["nested"]["type"](), dict)
+
+    def test_mutually_importing_files(self):
+        # Files are loaded concurrently by default: each thread parses its file at the same time, then constructs the
+        # import of the file of the other thread
+        a_path = self._write("a.yml", "x: !import:y b.yml\nz: 1\n")
+        b_path = self._write("b.yml", "w: !import:z a.yml\ny: 2\n")
+
+        @click.command()
+        @inject_from_cli()
+        def main(config):
+            return config
+
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(CliRunner().invoke(main, ["-c", a_path, "-c", b_path], standalone_mode=False))
+        )
+        thread.daemon = True
+        with mock.patch.object(loader.YamlFileLoader, "_parse", autospec=True, side_effect=slow_parse):
+            thread.start()
+            thread.join(timeout=10)
+        self.assertFalse(thread.is_alive(), "The loading of the files is deadlocked")
+        self.assertIsNone(results[0].exception, results[0].output)
+        self.assertEqual(results[0].return_value, {"x": 2, "z": 1, "w": 1, "y": 2})
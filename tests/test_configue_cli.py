@@ -111,7 +111,11 @@ class TestConfigueCLI(unittest.TestCase):
         result = runner.invoke(main, [])
         self.assertEqual(result.exit_code, 1)
         self.assertIsInstance(result.exception, MissingMandatoryValueError)
-        self.assertEqual(result.exception.args[0], "Missing mandatory value: param_1")  # type: ignore[union-attr]
+        message = result.exception.args[0]  # type: ignore[union-attr]
+        self.assertTrue(
+            message.startswith("Missing mandatory values: param_1, dataclass_config_1.dataclass_sub_config")
+        )
+        self.assertTrue(message.endswith(", attrs_config_2.param_1"))
 
     def test_dry_run_unstructured(self) -> None:
         @click.command(no_args_is_help=True)
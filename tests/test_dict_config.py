@@ -0,0 +1,143 @@
+# mypy: disable-error-code=no-untyped-def
+import copy
+import unittest
+
+from configue_cli.core.dict_config import DictConfig, ListMergeMode
+
+
+class TestDictConfig(unittest.TestCase):
+    def test_nested_mappings_are_wrapped(self):
+        config = DictConfig({"a": {"b": {"c": 1}}, "d": [{"e": 1}]})
+        self.assertIsInstance(config["a"], DictConfig)
+        self.assertIsInstance(config["a"]["b"], DictConfig)
+        self.assertEqual(config, {"a": {"b": {"c": 1}}, "d": [{"e": 1}]})
+
+    def test_subtrees_are_shared_until_modified(self):
+        source = DictConfig({"a": {"b": {"c": 1}}, "d": {"e": 2}})
+        config = DictConfig(source)
+        self.assertIs(dict.__getitem__(config, "a"), dict.__getitem__(source, "a"))
+
+        config["a"]["b"]["c"] = 3
+        self.assertEqual(source, {"a": {"b": {"c": 1}}, "d": {"e": 2}})
+        self.assertEqual(config, {"a": {"b": {"c": 3}}, "d": {"e": 2}})
+        # Only the modified path is copied
+        self.assertIs(dict.__getitem__(config, "d"), dict.__getitem__(source, "d"))
+
+        source["d"]["e"] = 4
+        self.assertEqual(config["d"], {"e": 2})
+
+    def test_merge_does_not_alias_layers(self):
+        base = DictConfig({"model": {"name": "base", "layers": [1, 2]}, "dataset": {"name": "fquad"}})
+        override = DictConfig({"model": {"layers": [3]}, "optimizer": {"lr": 0.1}})
+        config = DictConfig({})
+        config.merge(base, override, mode=ListMergeMode.EXTEND)
+        self.assertEqual(
+            config,
+            {"model": {"name": "base", "layers": [1, 2, 3]}, "dataset": {"name": "fquad"}, "optimizer": {"lr": 0.1}},
+        )
+
+        config["dataset"]["name"] = "squad"
+        config["optimizer"]["lr"] = 0.2
+        config["model"]["layers"].append(4)
+        self.assertEqual(base, {"model": {"name": "base", "layers": [1, 2]}, "dataset": {"name": "fquad"}})
+        self.assertEqual(override, {"model": {"layers": [3]}, "optimizer": {"lr": 0.1}})
+
+        override["optimizer"]["lr"] = 0.3
+        self.assertEqual(config["optimizer"], {"lr": 0.2})
+
+    def test_merge_extends_lists_without_mutating_sources(self):
+        first = DictConfig({"values": [1]})
+        second = DictConfig({"values": [2]})
+        for _ in range(2):
+            config = DictConfig({})
+            config.merge(first, second, mode=ListMergeMode.EXTEND)
+            self.assertEqual(config, {"values": [1, 2]})
+        self.assertEqual(first, {"values": [1]})
+
+    def test_accessors_return_private_subtrees(self):
+        source = DictConfig({"a": {"b": 1}, "c": {"d": 2}, "e": {"f": 3}, "g": {"h": 4}})
+        config = DictConfig(source)
+        config.get("a")["b"] = 10
+        for key, value in config.items():
+            if key == "c":
+                value["d"] = 20
+        config.pop("e")["f"] = 30
+        copied = config.copy()
+        copied["g"]["h"] = 40
+        copy.copy(config)["g"]["h"] = 40
+        self.assertEqual(source, {"a": {"b": 1}, "c": {"d": 2}, "e": {"f": 3}, "g": {"h": 4}})
+        self.assertEqual(config, {"a": {"b": 10}, "c": {"d": 20}, "g": {"h": 4}})
+        self.assertIsInstance(copied, DictConfig)
+
+    def test_owner_writes_after_wrap(self):
+        owned = DictConfig({"a": {"b": 1}})
+        layer = DictConfig({"c": {"d": 2}})
+        config = DictConfig({"owned": owned})
+        config.merge(layer)
+        owned["e"] = 3
+        owned["a"]["b"] = 10
+        layer["c"]["d"] = 20
+        self.assertEqual(config, {"owned": {"a": {"b": 1}}, "c": {"d": 2}})
+
+        # The same configuration given under two keys is stored as two configurations
+        config = DictConfig({"first": owned, "second": owned})
+        config["first"]["e"] = 30
+        self.assertEqual(config["second"]["e"], 3)
+
+    def test_dict_conversion_returns_private_subtrees(self):
+        source = DictConfig({"a": {"b": 1}, "c": {"d": 2}})
+        config = DictConfig(source)
+        dict(config)["a"]["b"] = 10
+        {**config}["c"]["d"] = 20
+        self.assertEqual(source, {"a": {"b": 1}, "c": {"d": 2}})
+        self.assertEqual(config, {"a": {"b": 10}, "c": {"d": 20}})
+
+    def test_deepcopy(self):
+        source = DictConfig({"a": {"b": [1, {"c": 2}]}})
+        config = DictConfig(source)
+        copied = copy.deepcopy(config)
+        copied["a"]["b"][1]["c"] = 3
+        self.assertEqual(config, {"a": {"b": [1, {"c": 2}]}})
+        self.assertIsInstance(copied["a"], DictConfig)
+
+    def test_dotted_paths(self):
+        source = DictConfig({"model": {"optimizer": {"lr": 0.1}, "layers": [{"size": 3}, 4]}})
+        config = DictConfig(source)
+        self.assertEqual(config.get_path("model.optimizer.lr"), 0.1)
+        self.assertEqual(config.get_path("model.layers.0.size"), 3)
+        self.assertEqual(config.get_path("model.layers.-1"), 4)
+        self.assertIsNone(config.get_path("model.dropout", None))
+        for path in ("model.dropout", "model.layers.2", "model.layers.first", "model.optimizer.lr.value"):
+            with self.subTest(path=path):
+                self.assertFalse(config.has_path(path))
+                with self.assertRaisesRegex(KeyError, path):
+                    config.get_path(path)
+        # Checking a path does not copy the shared subtrees
+        copied = DictConfig(source)
+        self.assertTrue(copied.has_path("model.layers.1"))
+        self.assertIs(dict.__getitem__(copied, "model"), dict.__getitem__(source, "model"))
+
+        config.set_path("model.optimizer.lr", 0.2)
+        config.set_path("model.layers.0.size", 5)
+        config.set_path("model.scheduler.name", "cosine")
+        config.delete_path("model.layers.1")
+        self.assertEqual(
+            config,
+            {"model": {"optimizer": {"lr": 0.2}, "layers": [{"size": 5}], "scheduler": {"name": "cosine"}}},
+        )
+        self.assertIsInstance(config["model"]["scheduler"], DictConfig)
+        self.assertEqual(source, {"model": {"optimizer": {"lr": 0.1}, "layers": [{"size": 3}, 4]}})
+        with self.assertRaisesRegex(KeyError, "model.layers.3"):
+            config.set_path("model.layers.3", 1)
+        with self.assertRaisesRegex(KeyError, "model.dropout.rate"):
+            config.delete_path("model.dropout.rate")
+
+    def test_dotted_paths_after_merge(self):
+        config = DictConfig({"model": {"optimizer": {"lr": 0.1}}})
+        self.assertTrue(config.has_path("model.optimizer.lr"))
+        config.merge(DictConfig({"model": {"optimizer": {"lr": 0.2, "momentum": 0.9}}}))
+        self.assertEqual(config.get_path("model.optimizer.lr"), 0.2)
+        self.assertEqual(config.get_path("model.optimizer.momentum"), 0.9)
+        config.merge(DictConfig({"model": {"optimizer": 1}}), mode=ListMergeMode.REPLACE)
+        self.assertFalse(config.has_path("model.optimizer.lr"))
+        self.assertEqual(DictConfig.from_dotlist(["a.b=1", "a.c=[1, 2]", "a.c.1=3"]), {"a": {"b": 1, "c": [1, 3]}})
@@ -0,0 +1,149 @@
+# mypy: disable-error-code=no-untyped-def
+import collections
+import io
+import math
+import os
+import unittest
+
+import yaml
+
+from configue_cli.core.dict_config import DictConfig
+from configue_cli.core.dumper import ConfigueDumper
+from configue_cli.core.loader import load_from_string
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+LONG_SENTENCE = "the quick brown fox jumps over the lazy dog " * 3
+
+
+class CustomType:
+    def __init__(self, arg: int = 1) -> None:
+        self.arg = arg
+
+
+def custom_function() -> None:
+    pass
+
+
+class OuterType:
+    class InnerType:
+        class NestedType:
+            pass
+
+
+def make_nested(depth: int) -> DictConfig:
+    config = DictConfig({"sentence": LONG_SENTENCE.strip(), "words": [LONG_SENTENCE.strip(), "short"]})
+    for level in range(depth):
+        config = DictConfig({f"level_{level}": config, "value": level})
+    return config
+
+
+def make_config() -> DictConfig:
+    return DictConfig(
+        {
+            "()": "tests.test_dumper.CustomType",
+            "\\()": "escaped",
+            "scalars": {
+                "none": None,
+                "true": True,
+                "false": False,
+                "int": -12,
+                "float": 0.5,
+                "exponent": 1e20,
+                "small": -2.5e-8,
+                "inf": math.inf,
+                "negative_inf": -math.inf,
+                "nan": math.nan,
+            },
+            "strings": {
+                "plain": "camembert-base",
+                "path": "/data/models/model.bin",
+                "spaces": "hello world",
+                "bool_like": "true",
+                "null_like": "null",
+                "int_like": "123",
+                "float_like": "1.5",
+                "date_like": "2001-12-14",
+                "colon": "key: value",
+                "comment": "value # comment",
+                "empty": "",
+                "leading_space": " value",
+                "trailing_space": "value ",
+                "quote": "it's",
+                "unicode": "é",
+                "multiline": "first line\nsecond line",
+                "long": LONG_SENTENCE.strip(),
+                "long_without_spaces": "a" * 100,
+                "environment": "${HOME}/data",
+            },
+            "quoted keys": {"key: with colon": 1, "123": 2, "true": 3},
+            "collections": {
+                "empty_dict": {},
+                "empty_list": [],
+                "list": [1, "two", 3.0, None],
+                "nested_lists": [[1, 2], [], [[3]]],
+                "dicts": [{"a": 1, "b": [1, 2]}, {}, {"c": {"d": "e"}}],
+            },
+            "types": {
+                "class": CustomType,
+                "same_class": CustomType,
+                "builtin_class": collections.OrderedDict,
+                "function": custom_function,
+                "builtin_function": len,
+                "same_function": custom_function,
+            },
+            "nested": make_nested(12),
+        }
+    )
+
+
+class TestConfigueDumper(unittest.TestCase):
+    def assertSameAsGolden(self, config: DictConfig, file_name: str) -> None:
+        with open(os.path.join(GOLDEN_DIR, file_name), encoding="utf-8") as reader:
+            expected = reader.read()
+        self.assertEqual(ConfigueDumper.from_config(config), expected)
+
+    def test_golden_file(self):
+        self.assertSameAsGolden(make_config(), "config.yml")
+
+    def test_golden_file_with_objects(self):
+        # Objects that are not written directly make the whole configuration go through PyYAML
+        config = make_config()
+        config["types"]["object"] = CustomType(2)
+        self.assertSameAsGolden(config, "config_with_objects.yml")
+
+    def test_deeply_nested_config(self):
+        # PyYAML cannot format alone the scalars indented past the line width
+        config = make_nested(40)
+        self.assertEqual(ConfigueDumper.from_config(config), yaml.dump(config, Dumper=yaml.Dumper, sort_keys=False))
+
+    def test_dump_to_stream(self):
+        stream = io.StringIO()
+        ConfigueDumper.dump(make_config(), stream)
+        self.assertEqual(stream.getvalue(), ConfigueDumper.from_config(make_config()))
+        self.assertEqual(ConfigueDumper.from_config(DictConfig()), "{}\n")
+
+    def test_round_trip(self):
+        config = make_config()
+        loaded_config = load_from_string(ConfigueDumper.from_config(config), instantiate=False)
+        self.assertIs(loaded_config["types"]["class"], CustomType)
+        self.assertIs(loaded_config["types"]["builtin_function"], len)
+        self.assertEqual(loaded_config["strings"]["multiline"], "first line\nsecond line")
+        self.assertEqual(loaded_config["nested"], config["nested"])
+
+    def test_nested_classes(self):
+        config = DictConfig({"inner": OuterType.InnerType, "nested": [OuterType.InnerType.NestedType]})
+        serialized_config = ConfigueDumper.from_config(config)
+        self.assertIn("!ext tests.test_dumper.OuterType.InnerType.NestedType", serialized_config)
+        self.assertEqual(load_from_string(serialized_config, instantiate=False), config)
+
+    def test_local_classes(self):
+        class LocalType:
+            pass
+
+        with self.assertRaisesRegex(TypeError, "LocalType is defined inside a function"):
+            ConfigueDumper.from_config(DictConfig({"type": LocalType}))
+
+    def test_classes_in_lists(self):
+        # PyYAML's `!!python/name` tags used to be kept in lists
+        serialized_config = ConfigueDumper.from_config(DictConfig({"types": [int, CustomType]}))
+        self.assertEqual(serialized_config, "types:\n- !ext builtins.int\n- !ext tests.test_dumper.CustomType\n")
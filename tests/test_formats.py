@@ -0,0 +1,147 @@
+# mypy: disable-error-code=no-untyped-def
+import collections
+import dataclasses
+import json
+import math
+import sys
+from typing import Any, Dict
+from unittest import mock
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+from configue_cli.core.formats import export_config, read_json_lines
+from configue_cli.core.loader import load_from_path
+
+from .utils import TemporaryDirectoryTestCase
+
+JSON_CONFIG = {
+    "model": {"()": "collections.OrderedDict", "layers": [64, 128], "name": "camembert-base"},
+    "escaped": {"\\()": "collections.OrderedDict"},
+    "learning_rate": 1e-3,
+}
+TOML_CONFIG = """\
+learning_rate = 1e-3
+
+[model]
+"()" = "collections.OrderedDict"
+layers = [64, 128]
+name = "camembert-base"
+
+[escaped]
+'\\()' = "collections.OrderedDict"
+"""
+
+
+@dataclasses.dataclass
+class Config:
+    model: Dict[str, Any]
+    escaped: Dict[str, str]
+    learning_rate: float
+    batch_size: int = 8
+
+    class Optimizer:
+        class Scheduler:
+            pass
+
+
+class TestFormats(TemporaryDirectoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.json_path = self._write("config.json", json.dumps(JSON_CONFIG))
+        self.toml_path = self._write("config.toml", TOML_CONFIG)
+
+    def test_load_from_path(self):
+        for file_path in (self.json_path, self.toml_path):
+            with self.subTest(file_path):
+                self.assertEqual(load_from_path(file_path, instantiate=False), JSON_CONFIG)
+                self.assertEqual(load_from_path(file_path, sub_path="model.layers.1", instantiate=False), 128)
+                config = load_from_path(file_path)
+                self.assertEqual(
+                    config["model"], collections.OrderedDict([("layers", [64, 128]), ("name", "camembert-base")])
+                )
+                self.assertEqual(config["escaped"], {"()": "collections.OrderedDict"})
+
+    def test_load_json_without_orjson(self):
+        with mock.patch.dict(sys.modules, {"orjson": None}):
+            self.assertEqual(load_from_path(self.json_path, instantiate=False), JSON_CONFIG)
+
+    def test_import_from_yaml(self):
+        yaml_path = self._write("config.yml", "model: !import:model config.json\nbatch_size: 16\n")
+        self.assertEqual(
+            load_from_path(yaml_path, instantiate=False), {"model": JSON_CONFIG["model"], "batch_size": 16}
+        )
+
+    def test_cli(self):
+        @click.command()
+        @inject_from_cli(Config)
+        def main(config: Config) -> Config:
+            return config
+
+        yaml_path = self._write("override.yml", "batch_size: 16\n")
+        result = CliRunner().invoke(
+            main,
+            ["-c", self.json_path, "-c", yaml_path, "model.name=flaubert"],
+            standalone_mode=False,
+        )
+        self.assertIsNone(result.exception, result.output)
+        self.assertEqual(result.return_value.batch_size, 16)
+        self.assertEqual(result.return_value.learning_rate, 1e-3)
+        self.assertEqual(result.return_value.escaped, {"()": "collections.OrderedDict"})
+        self.assertEqual(
+            result.return_value.model, collections.OrderedDict([("layers", [64, 128]), ("name", "flaubert")])
+        )
+
+
+@click.command()
+@inject_from_cli()
+def export_main(config) -> None:
+    pass
+
+
+class TestExportFormats(TemporaryDirectoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.config_path = self._write(
+            "config.yml",
+            "model:\n  (): collections.OrderedDict\n  activation: !ext collections.OrderedDict\n"
+            "  layers: [64, 128]\nlearning_rate: .nan\nname: é\n",
+        )
+
+    def _export(self, output: str, *arguments: str) -> str:
+        output_path = self._path(output)
+        result = CliRunner().invoke(export_main, ["-c", self.config_path, "-o", output_path, *arguments])
+        self.assertIsNone(result.exception, result.output)
+        return output_path
+
+    def assertSameConfig(self, config, expected_config) -> None:
+        self.assertTrue(math.isnan(config.pop("learning_rate")))
+        self.assertEqual(config, {key: value for key, value in expected_config.items() if key != "learning_rate"})
+
+    def test_export_and_load(self):
+        expected_config = load_from_path(self._export("output.yml"), instantiate=False)
+        self.assertIs(expected_config["model"]["activation"], collections.OrderedDict)
+        for output in ("output.json", "output.msgpack"):
+            with self.subTest(output):
+                self.assertSameConfig(load_from_path(self._export(output), instantiate=False), expected_config)
+
+    def test_json_lines(self):
+        output_path = self._export("runs.jsonl", "model.layers=[256]")
+        self._export("runs.jsonl", "name=other")
+        self._export("runs.jsonl", "--multirun", "name=a,b")
+        configs = list(read_json_lines(output_path))
+        self.assertEqual([config["name"] for config in configs], ["é", "other", "a", "b"])
+        self.assertEqual(configs[0]["model"]["layers"], [256])
+        self.assertIs(configs[0]["model"]["activation"], collections.OrderedDict)
+
+    def test_nested_classes(self):
+        config = {"optimizer": Config.Optimizer, "schedulers": [Config.Optimizer.Scheduler]}
+        for output in ("output.json", "output.msgpack", "output.yml"):
+            with self.subTest(output):
+                export_config(self._path(output), config)
+                self.assertEqual(load_from_path(self._path(output), instantiate=False), config)
+
+    def test_unsupported_values(self):
+        with self.assertRaisesRegex(TypeError, "Config objects cannot be exported to JSON"):
+            export_config(self._path("output.json"), {"config": Config({}, {}, 1.0)})
@@ -0,0 +1,64 @@
+# mypy: disable-error-code=no-untyped-def
+import subprocess
+import sys
+import textwrap
+import unittest
+
+# Budget for the cold import of the decorator, excluding `click` which is always needed to build the CLI
+IMPORT_TIME_BUDGET_US = 75_000
+HEAVY_MODULES = ["attr", "configue", "logging.config", "rich", "yaml", "hashlib", "pickle", "tempfile", "tracemalloc"]
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+class TestImportTime(unittest.TestCase):
+    def test_import_time_budget(self):
+        process = run_python("-X", "importtime", "-c", "import click; import configue_cli.click")
+        cumulative_times = {}
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative_time, module_name = line.split("|")
+            if cumulative_time.strip().isdigit():
+                cumulative_times.setdefault(module_name.strip(), int(cumulative_time))
+        self.assertLessEqual(cumulative_times["configue_cli"], IMPORT_TIME_BUDGET_US)
+
+    def test_heavy_modules_are_not_imported_for_help(self):
+        script = textwrap.dedent(
+            f"""\
+            import sys
+
+            import click
+
+            from configue_cli.click import inject_from_cli
+
+
+            @click.command()
+            @inject_from_cli()
+            def main(config):
+                pass
+
+
+            try:
+                main(["--help"])
+            except SystemExit:
+                pass
+            print(",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+            """
+        )
+        process = run_python("-c", script)
+        self.assertEqual(process.stdout.splitlines()[-1], "")
+
+    def test_dict_config_representer_is_registered(self):
+        # The representer is registered by the modules loading and dumping configurations, which import `yaml`
+        for imports in (
+            "import yaml; from configue_cli.core.dict_config import DictConfig; import configue_cli.core.loader",
+            "from configue_cli.core.dict_config import DictConfig; import configue_cli.core.loader; import yaml",
+            "import yaml; from configue_cli.core.dict_config import DictConfig; import configue_cli.core.dumper",
+        ):
+            with self.subTest(imports=imports):
+                script = f"{imports}; print(yaml.dump(DictConfig({{'a': {{'b': 1}}}}), Dumper=yaml.Dumper), end='')"
+                process = run_python("-c", script)
+                self.assertEqual(process.stdout, "a:\n  b: 1\n")
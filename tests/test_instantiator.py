@@ -0,0 +1,313 @@
+# mypy: disable-error-code=no-untyped-def
+import dataclasses
+import pickle
+import threading
+import unittest
+from typing import Any, List
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+from configue_cli.core.dict_config import DictConfig, ListMergeMode
+from configue_cli.core.exceptions import InstantiationError
+from configue_cli.core.instantiator import is_instantiated, not_deduplicated, unwrap
+from configue_cli.core.loader import load_from_config, load_from_path, load_from_string
+
+from .test_configue_cli import CustomType, DataclassConfig, MainConfig
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return type(value), {key: _normalize(sub_value) for key, sub_value in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value), [_normalize(item) for item in value]
+    if isinstance(value, (type, str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "__dict__"):
+        attributes = list(vars(value))
+    else:
+        attributes = [name for cls in type(value).__mro__ for name in getattr(cls, "__slots__", ())]
+    return type(value), {name: _normalize(getattr(value, name, "<unset>")) for name in attributes}
+
+
+BUILT_NAMES: List[str] = []
+
+
+class Dataset:
+    def __init__(self, name: str, size: int = 1) -> None:
+        if size < 0:
+            raise ValueError("negative size")
+        BUILT_NAMES.append(name)
+        self.name = name
+        self.size = size
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Dataset) and (other.name, other.size) == (self.name, self.size)
+
+
+class Model:
+    def __init__(self, dataset: Dataset) -> None:
+        BUILT_NAMES.append("model")
+        self.dataset = dataset
+
+
+class Client:
+    # Clients are only built if the three of them wait for each other in different threads
+    barrier = threading.Barrier(3, timeout=5)
+
+    def __init__(self, name: str) -> None:
+        self.barrier.wait()
+        self.name = name
+
+
+@not_deduplicated
+class Connection:
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+
+@dataclasses.dataclass
+class LazyConfig:
+    datasets: Any
+    model: Any
+
+
+class TestInstantiator(unittest.TestCase):
+    def assertSameAsYaml(self, config: DictConfig) -> None:
+        expected = load_from_string(config.to_configue(), instantiate=True)
+        actual = load_from_config(config, instantiate=True)
+        self.assertEqual(_normalize(actual), _normalize(expected))
+
+    def test_instantiate_from_files(self) -> None:
+        config = DictConfig({})
+        config.merge(
+            DictConfig(load_from_path("tests/config_1.yml", instantiate=False)),
+            DictConfig(load_from_path("tests/config_2.yml", instantiate=False)),
+            DictConfig(load_from_path("tests/logging.yml", instantiate=False)),
+        )
+        self.assertSameAsYaml(config)
+
+    def test_instantiate_traversed_types(self) -> None:
+        for type_ in (DataclassConfig, MainConfig):
+            with self.subTest(type_=type_):
+                config = DictConfig.from_type(type_)
+                config.merge(DictConfig.from_dotlist(["param_1=1"]))
+                self.assertSameAsYaml(config)
+
+    def test_instantiate_shared_nodes(self) -> None:
+        config = DictConfig(load_from_path("tests/shared_nodes.yml", instantiate=False))
+        self.assertSameAsYaml(config)
+
+        instance = load_from_config(config, instantiate=True)
+        self.assertIsInstance(instance["model"]["layers"][0], CustomType)
+        self.assertEqual(instance["handler"]["()"], "tests.test_configue_cli.CustomHandler")
+
+    def test_instantiate_shared_subtrees_once(self) -> None:
+        config = DictConfig({"tokenizer": {"()": "collections.OrderedDict", "name": "camembert-base"}, "model": {}})
+        config["model"]["tokenizer"] = config["tokenizer"]
+        self.assertSameAsYaml(config)
+
+        instance = load_from_config(config, instantiate=True)
+        self.assertIs(instance["model"]["tokenizer"], instance["tokenizer"])
+
+    def test_instantiate_wrapped_configs_separately(self) -> None:
+        tokenizer = DictConfig({"()": "collections.OrderedDict", "name": "camembert-base"})
+        config = DictConfig({"tokenizer": tokenizer, "model": {"tokenizer": tokenizer}})
+
+        instance = load_from_config(config, instantiate=True)
+        self.assertIsNot(instance["model"]["tokenizer"], instance["tokenizer"])
+
+    def test_instantiate_copies_python_objects(self) -> None:
+        custom_object = CustomType(3)
+        config = DictConfig({"first": custom_object, "second": custom_object})
+        config.merge(DictConfig({"third": [custom_object]}), mode=ListMergeMode.EXTEND)
+
+        instance = load_from_config(config, instantiate=True)
+        self.assertIsNot(instance["first"], custom_object)
+        self.assertIs(instance["first"], instance["second"])
+        self.assertIs(instance["first"], instance["third"][0])
+        self.assertSameAsYaml(config)
+
+
+class TestParallelInstantiator(unittest.TestCase):
+    def setUp(self) -> None:
+        BUILT_NAMES.clear()
+
+    def assertSameAsSequential(self, config: DictConfig) -> None:
+        expected = load_from_config(config, instantiate=True)
+        actual = load_from_config(config, instantiate=True, workers=4)
+        self.assertEqual(_normalize(actual), _normalize(expected))
+
+    def test_same_objects_as_sequential(self):
+        self.assertSameAsSequential(DictConfig(load_from_path("tests/config_1.yml", instantiate=False)))
+        self.assertSameAsSequential(DictConfig(load_from_path("tests/shared_nodes.yml", instantiate=False)))
+        for type_ in (DataclassConfig, MainConfig):
+            with self.subTest(type_=type_):
+                config = DictConfig.from_type(type_)
+                config.merge(DictConfig.from_dotlist(["param_1=1"]))
+                self.assertSameAsSequential(config)
+
+    def test_independent_objects_are_built_concurrently(self):
+        config = DictConfig(
+            {
+                "clients": [{"()": "tests.test_instantiator.Client", "name": f"client_{index}"} for index in range(3)],
+                "dataset": {"()": "tests.test_instantiator.Dataset", "name": "dataset"},
+                "models": [{"()": "tests.test_instantiator.Model"}, {"()": "tests.test_instantiator.Model"}],
+                "shared": ({"items": []},),
+            }
+        )
+        for model in config["models"]:
+            model["dataset"] = config["dataset"]
+        config["shared"][0]["items"].append(config["dataset"])
+
+        instance = load_from_config(config, instantiate=True, workers=3)
+        self.assertEqual([client.name for client in instance["clients"]], ["client_0", "client_1", "client_2"])
+        # Shared objects are built once, before the objects receiving them
+        self.assertEqual(BUILT_NAMES, ["dataset", "model", "model"])
+        self.assertIs(instance["models"][0].dataset, instance["dataset"])
+        self.assertIs(instance["models"][1].dataset, instance["dataset"])
+        self.assertIs(instance["shared"][0]["items"][0], instance["dataset"])
+
+    def test_first_error_is_raised(self):
+        config = DictConfig(
+            {
+                "first": {"()": "tests.test_instantiator.Dataset", "name": "first", "size": -1},
+                "second": {"()": "tests.test_instantiator.Missing"},
+            }
+        )
+        with self.assertRaisesRegex(ValueError, "negative size"):
+            load_from_config(config, instantiate=True, workers=2)
+        config["second"]["()"] = "tests.test_instantiator.Dataset"
+        config["second"].update({"name": "second", "size": "large"})
+        with self.assertRaisesRegex(ValueError, "negative size"):
+            load_from_config(config, instantiate=True, workers=2)
+
+    def test_cli(self):
+        @click.command()
+        @inject_from_cli(LazyConfig, instantiation_workers=2)
+        def main(config: LazyConfig) -> LazyConfig:
+            return config
+
+        result = CliRunner().invoke(main, ["-c", "tests/lazy.yml", "datasets.broken=[]"], standalone_mode=False)
+        self.assertIsNone(result.exception, result.output)
+        self.assertEqual(result.return_value.model.dataset, result.return_value.datasets["small"])
+        self.assertEqual(sorted(BUILT_NAMES), ["large", "model", "small", "small"])
+
+
+class TestDeduplication(unittest.TestCase):
+    def setUp(self) -> None:
+        BUILT_NAMES.clear()
+        self.config = DictConfig(
+            {
+                "model": {
+                    "()": "tests.test_instantiator.Model",
+                    "dataset": {"()": "tests.test_instantiator.Dataset", "name": "wiki", "size": 2},
+                },
+                "dataset": {"size": 2, "()": "tests.test_instantiator.Dataset", "name": "wiki"},
+                "other_sizes": [
+                    {"()": "tests.test_instantiator.Dataset", "name": "wiki", "size": 2.0},
+                    {"()": "tests.test_instantiator.Dataset", "name": "wiki", "size": True},
+                ],
+                "connections": [
+                    {
+                        "()": "collections.OrderedDict",
+                        "connection": {"()": "tests.test_instantiator.Connection", "url": "db"},
+                    },
+                    {
+                        "()": "collections.OrderedDict",
+                        "connection": {"()": "tests.test_instantiator.Connection", "url": "db"},
+                    },
+                ],
+            }
+        )
+
+    def test_identical_objects_are_shared(self):
+        for options in ({}, {"workers": 2}, {"lazy": True}):
+            with self.subTest(**options):
+                BUILT_NAMES.clear()
+                instance = load_from_config(self.config, instantiate=True, deduplicate=True, **options)
+                self.assertIs(unwrap(instance["model"]).dataset, unwrap(instance["dataset"]))
+                # Equal scalars of different types are different arguments
+                self.assertIsNot(unwrap(instance["other_sizes"][0]), unwrap(instance["dataset"]))
+                self.assertIsNot(unwrap(instance["other_sizes"][1]), unwrap(instance["dataset"]))
+                self.assertEqual(BUILT_NAMES.count("wiki"), 3)
+
+    def test_opted_out_objects_are_not_shared(self):
+        instance = load_from_config(self.config, instantiate=True, deduplicate=True)
+        first, second = instance["connections"]
+        self.assertIsNot(first, second)
+        self.assertIsNot(first["connection"], second["connection"])
+
+    def test_disabled_by_default(self):
+        instance = load_from_config(self.config, instantiate=True)
+        self.assertIsNot(instance["model"].dataset, instance["dataset"])
+        self.assertEqual(BUILT_NAMES.count("wiki"), 4)
+
+    def test_cli(self):
+        @click.command()
+        @inject_from_cli(LazyConfig, deduplicate_instances=True)
+        def main(config: LazyConfig) -> LazyConfig:
+            return config
+
+        result = CliRunner().invoke(
+            main,
+            ["-c", "tests/lazy.yml", "datasets.broken=[]", "datasets.large.name=small", "datasets.small.size=10"],
+            standalone_mode=False,
+        )
+        self.assertIsNone(result.exception, result.output)
+        self.assertIs(result.return_value.datasets["small"], result.return_value.datasets["large"])
+
+
+class TestLazyInstantiator(unittest.TestCase):
+    def setUp(self) -> None:
+        BUILT_NAMES.clear()
+        self.config = DictConfig(
+            {
+                "datasets": {
+                    "small": {"()": "tests.test_instantiator.Dataset", "name": "small"},
+                    "large": {"()": "tests.test_instantiator.Dataset", "name": "large", "size": 10},
+                    "broken": [{"()": "tests.test_instantiator.Dataset", "name": "broken", "size": -1}],
+                },
+                "model": {"()": "tests.test_instantiator.Model"},
+            }
+        )
+        self.config["model"]["dataset"] = self.config["datasets"]["small"]
+
+    def test_objects_are_built_on_first_use(self):
+        instance = load_from_config(self.config, instantiate=True, lazy=True)
+        self.assertEqual(BUILT_NAMES, [])
+        # The class of the object is known without building it
+        self.assertIsInstance(instance["model"], Model)
+        self.assertFalse(is_instantiated(instance["model"]))
+
+        self.assertEqual(instance["model"].dataset.name, "small")
+        self.assertTrue(is_instantiated(instance["model"]))
+        # The objects receive the objects they depend on rather than proxies
+        self.assertIs(type(instance["model"].dataset), Dataset)
+        self.assertEqual(instance["datasets"]["small"], instance["model"].dataset)
+        self.assertEqual(BUILT_NAMES, ["small", "model"])
+        self.assertEqual(pickle.loads(pickle.dumps(instance["datasets"]["small"])), Dataset("small"))
+
+    def test_errors_point_to_the_dotted_path(self):
+        instance = load_from_config(self.config, instantiate=True, lazy=True)
+        with self.assertRaisesRegex(InstantiationError, r"^Could not instantiate datasets\.broken\.0: negative size$"):
+            _ = instance["datasets"]["broken"][0].size
+
+        self.config["datasets"]["small"]["()"] = "tests.test_instantiator.Missing"
+        instance = load_from_config(self.config, instantiate=True, lazy=True)
+        with self.assertRaisesRegex(
+            InstantiationError, r"^Could not instantiate datasets\.small: cannot find 'Missing'"
+        ):
+            _ = instance["model"].dataset
+
+    def test_cli(self):
+        @click.command()
+        @inject_from_cli(LazyConfig, lazy_instantiation=True)
+        def main(config: LazyConfig) -> str:
+            return str(config.datasets["large"].size)
+
+        result = CliRunner().invoke(main, ["-c", "tests/lazy.yml", "datasets.large.size=3"], standalone_mode=False)
+        self.assertIsNone(result.exception, result.output)
+        self.assertEqual(result.return_value, "3")
+        self.assertEqual(BUILT_NAMES, ["large"])
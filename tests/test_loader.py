@@ -0,0 +1,168 @@
+# mypy: disable-error-code=no-untyped-def
+import collections
+import datetime
+import os
+import pickle
+import threading
+import time
+import unittest
+from typing import Any, List
+from unittest import mock
+
+import yaml
+from configue.configue_loader import ConfigueLoader
+
+from configue_cli.core import loader
+from configue_cli.core.concurrency import map_ordered
+from configue_cli.core.dict_config import DictConfig
+from configue_cli.core.loader import ParserBackend, ResolutionContext, get_loader_cls, load_from_path, load_from_string
+
+from .utils import TemporaryDirectoryTestCase
+
+PARSE = loader.YamlFileLoader._parse
+
+
+class TestLoadFromString(unittest.TestCase):
+    def test_load_plain_scalars(self) -> None:
+        self.assertEqual(load_from_string("12", instantiate=False), 12)
+        self.assertEqual(load_from_string("-1.5e-3", instantiate=False), -1.5e-3)
+        self.assertEqual(load_from_string("0x1f", instantiate=False), 31)
+        self.assertIs(load_from_string("true", instantiate=False), True)
+        self.assertIsNone(load_from_string("null", instantiate=False))
+        self.assertEqual(load_from_string("2001-12-14", instantiate=False), datetime.date(2001, 12, 14))
+        self.assertEqual(load_from_string("camembert-base", instantiate=False), "camembert-base")
+
+    def test_load_collections(self) -> None:
+        self.assertEqual(load_from_string("[1, hello, 2.0]", instantiate=False), [1, "hello", 2.0])
+        self.assertEqual(load_from_string("{a: 1, b: [true]}", instantiate=False), {"a": 1, "b": [True]})
+        self.assertEqual(load_from_string("hello world", instantiate=False), "hello world")
+
+    def test_load_configue_tags(self) -> None:
+        self.assertIs(load_from_string("!ext collections.OrderedDict", instantiate=False), collections.OrderedDict)
+        self.assertEqual(
+            load_from_string("(): collections.OrderedDict", instantiate=False), {"()": "collections.OrderedDict"}
+        )
+        self.assertEqual(load_from_string("(): collections.OrderedDict", instantiate=True), collections.OrderedDict())
+
+    def test_load_file_relative_tags(self) -> None:
+        path = load_from_string("!path data.txt", instantiate=False)
+        self.assertTrue(os.path.isabs(path))
+        self.assertEqual(os.path.basename(path), "data.txt")
+
+
+class TestDictConfigFromDotlist(unittest.TestCase):
+    def test_from_dotlist(self) -> None:
+        config = DictConfig.from_dotlist(
+            [
+                "model.batch_size=32",
+                "model.layers=[64, 128]",
+                "model.name='camembert base'",
+                'model.activation="!ext collections.OrderedDict"',
+                "flag",
+            ]
+        )
+        self.assertEqual(
+            config,
+            {
+                "model": {
+                    "batch_size": 32,
+                    "layers": [64, 128],
+                    "name": "camembert base",
+                    "activation": collections.OrderedDict,
+                },
+                "flag": None,
+            },
+        )
+
+
+class TestResolutionContext(TemporaryDirectoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.config_paths = []
+        self._write("base.yml", "value: 1\n")
+        for index in range(5):
+            self.config_paths.append(self._write(f"config_{index}.yml", f"index: {index}\nbase: !import base.yml\n"))
+
+    def test_files_are_parsed_once(self) -> None:
+        context = ResolutionContext()
+        base_path = self._path("base.yml")
+        with mock.patch.object(loader.YamlFileLoader, "_parse", autospec=True, side_effect=PARSE) as parse:
+            configs = map_ordered(context.load, self.config_paths, workers=5)
+            parameters = DictConfig.from_dotlist([f"base=!import {base_path}"], context=context)
+        self.assertEqual(configs, [{"index": index, "base": {"value": 1}} for index in range(5)])
+        self.assertEqual(parameters, {"base": {"value": 1}})
+        # The configuration files, the base file and the temporary file holding the command line value
+        self.assertEqual(parse.call_count, 7)
+
+    def test_mutually_importing_files(self) -> None:
+        # Each thread parses its file at the same time, then constructs the import of the file of the other thread
+        def slow_parse(*args: Any) -> Any:
+            time.sleep(0.05)
+            return PARSE(*args)
+
+        paths = [
+            self._write("a.yml", "x: !import:y b.yml\nz: 1\n"),
+            self._write("b.yml", "w: !import:z a.yml\ny: 2\n"),
+        ]
+        context = ResolutionContext()
+        configs: List[Any] = []
+        thread = threading.Thread(target=lambda: configs.extend(map_ordered(context.load, paths, workers=2)))
+        thread.daemon = True
+        with mock.patch.object(loader.YamlFileLoader, "_parse", autospec=True, side_effect=slow_parse):
+            thread.start()
+            thread.join(timeout=10)
+        self.assertFalse(thread.is_alive(), "The loading of the files is deadlocked")
+        self.assertEqual(configs, [{"x": 2, "z": 1}, {"w": 1, "y": 2}])
+
+    def test_dependents(self) -> None:
+        context = ResolutionContext()
+        context.load(self.config_paths[0])
+        base_path = self._path("base.yml")
+        self.assertEqual(context.dependents([base_path]), {base_path, os.path.abspath(self.config_paths[0])})
+
+    def test_pickle(self) -> None:
+        # Worker processes that are spawned rather than forked receive a pickled copy of the context
+        context = ResolutionContext()
+        context.load(self.config_paths[0])
+        copied_context = pickle.loads(pickle.dumps(context))
+        self.assertEqual(copied_context.dependencies, context.dependencies)
+        configs = map_ordered(copied_context.load, self.config_paths, workers=5)
+        self.assertEqual(configs, [{"index": index, "base": {"value": 1}} for index in range(5)])
+
+    def test_environment_variables(self) -> None:
+        # configue loads the values of the environment variables with a new instance of the loader class
+        config_path = self._write("env.yml", "type: ${CONFIGUE_CLI_TYPE}\n")
+        with mock.patch.dict(os.environ, {"CONFIGUE_CLI_TYPE": "!ext collections.OrderedDict"}):
+            self.assertEqual(ResolutionContext().load(config_path), {"type": collections.OrderedDict})
+
+
+@unittest.skipUnless(loader.LIBYAML_AVAILABLE, "PyYAML was built without libyaml")
+class TestParserBackends(TemporaryDirectoryTestCase):
+    def test_same_configurations(self) -> None:
+        for file_name in ("config_1.yml", "config_2.yml", "logging.yml", "shared_nodes.yml", "skypilot.yml"):
+            with self.subTest(file_name):
+                file_path = os.path.join(os.path.dirname(__file__), file_name)
+                self.assertEqual(
+                    load_from_path(file_path, instantiate=False, parser_backend=ParserBackend.LIBYAML),
+                    load_from_path(file_path, instantiate=False, parser_backend=ParserBackend.PYTHON),
+                )
+
+    def test_fallback_to_pyyaml(self) -> None:
+        # libyaml is stricter than PyYAML on some inputs, e.g. commas in tags
+        libyaml_loader_cls = get_loader_cls(loader.NonInstanciatingConfigueLoader, ParserBackend.LIBYAML)
+        file_path = self._write("config.yml", "values: [a, 2]\n")
+        with mock.patch.object(libyaml_loader_cls, "get_single_node", side_effect=yaml.scanner.ScannerError()):
+            self.assertEqual(load_from_path(file_path, instantiate=False), {"values": ["a", 2]})
+            self.assertEqual(load_from_string("[a, 2]", instantiate=False), ["a", 2])
+
+        # Invalid files are reported by PyYAML
+        self._write("config.yml", "values: [a, 2\n")
+        with self.assertRaisesRegex(yaml.parser.ParserError, "while parsing a flow sequence"):
+            load_from_path(file_path, instantiate=False)
+
+    def test_libyaml_unavailable(self) -> None:
+        with mock.patch.object(loader, "LIBYAML_AVAILABLE", False):
+            self.assertIs(
+                get_loader_cls(ConfigueLoader, ParserBackend.LIBYAML),
+                get_loader_cls(ConfigueLoader, ParserBackend.PYTHON),
+            )
@@ -0,0 +1,71 @@
+# mypy: disable-error-code=no-untyped-def
+import dataclasses
+import json
+import os
+import pstats
+import tempfile
+import unittest
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+
+
+@dataclasses.dataclass
+class Config:
+    param_1: int
+    param_2: int = 2
+
+
+@click.command()
+@inject_from_cli(Config)
+def main(config) -> None:
+    print("Injected")
+
+
+class TestProfiler(unittest.TestCase):
+    def test_json_report(self):
+        runner = CliRunner()
+        result = runner.invoke(main, ["param_1=1", "--no-pretty", "--profile", "--profile-format", "json"])
+        self.assertEqual(result.exit_code, 0)
+        output_lines = result.stdout.splitlines()
+        self.assertEqual(output_lines[-1], "Injected")
+        report = json.loads(output_lines[-2])
+        self.assertEqual(
+            [step["name"] for step in report["steps"]],
+            [
+                "Load YAML files",
+                "Parse command line parameters",
+                "Traverse dataclasses",
+                "Validate",
+                "Configure logging",
+                "Instantiate",
+                "Render",
+            ],
+        )
+        self.assertGreaterEqual(report["total_time"], sum(step["time"] for step in report["steps"]))
+        self.assertGreater(report["peak_memory"], 0)
+
+    def test_table_report(self):
+        runner = CliRunner()
+        result = runner.invoke(main, ["--dry-run", "--no-pretty", "--profile"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Profile", result.stdout)
+        self.assertIn("Traverse dataclasses", result.stdout)
+        self.assertNotIn("Instantiate", result.stdout)
+
+    def test_no_report_by_default(self):
+        runner = CliRunner()
+        result = runner.invoke(main, ["--dry-run", "--no-pretty"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertNotIn("Profile", result.stdout)
+
+    def test_cprofile_stats(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stats_path = os.path.join(temp_dir, "profile.stats")
+            runner = CliRunner()
+            result = runner.invoke(main, ["param_1=1", "--no-pretty", "--profile-stats", stats_path])
+            self.assertEqual(result.exit_code, 0)
+            stats = pstats.Stats(stats_path)
+            self.assertTrue(any(name == "from_type" for _, _, name in stats.stats))  # type: ignore[attr-defined]
@@ -0,0 +1,177 @@
+# mypy: disable-error-code=no-untyped-def
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+from configue_cli.core.skypilot import REMOTE_CONFIGS_DIRECTORY, SkyPilotSubmission, submit
+
+from . import fake_sky
+from .test_configue_cli import DataclassConfig
+
+CONFIG_PATHS = ["-c", "tests/skypilot.yml", "-c", "tests/config_1.yml", "-c", "tests/config_2.yml"]
+
+
+class TestSkyPilot(unittest.TestCase):
+    def setUp(self) -> None:
+        fake_sky.reset()
+        patcher = mock.patch.dict(sys.modules, {"sky": fake_sky})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.calls = []
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        # The local temporary files, the workdir and the home directory of the remote nodes
+        self.local_dir, self.workdir, self.remote_home = (
+            os.path.join(temp_dir.name, name) for name in ("local", "workdir", "remote")
+        )
+        for directory in (self.local_dir, self.workdir, self.remote_home):
+            os.mkdir(directory)
+        patcher = mock.patch.object(tempfile, "tempdir", self.local_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.workdir_parameter = f"skypilot.task.workdir={self.workdir}"
+
+    def _command(self, **kwargs) -> click.Command:
+        @click.command()
+        @inject_from_cli(DataclassConfig, skypilot_config_path="skypilot", **kwargs)
+        def main(config) -> None:
+            self.calls.append(config)
+
+        return main
+
+    def _run_remotely(self, execution) -> None:
+        # The remote command is run from the workdir, with the parameters interpolated in the last line
+        for remote_path, content in execution["mounted_files"].items():
+            local_path = remote_path.replace("~", self.remote_home)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, "wb") as writer:
+                writer.write(content)
+        command = execution["task"]["run"].strip().splitlines()[-1].replace("~", self.remote_home)
+        cwd = os.getcwd()
+        os.chdir(self.workdir)
+        try:
+            result = CliRunner().invoke(self._command(), command.split()[1:])
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(result.exit_code, 0, result.output)
+
+    def test_submit_task(self):
+        paths_path = os.path.join(self.workdir, "paths.yml")
+        with open(paths_path, "w", encoding="utf-8") as writer:
+            writer.write("param_2: !path data/train.txt\n")
+        # Strings that are not resolved with `!path` are left as they are, even if they look like paths
+        notes = os.path.join(self.workdir, "notes.txt")
+        arguments = [*CONFIG_PATHS, "-c", paths_path, self.workdir_parameter, f"param_3={notes}"]
+        result = CliRunner().invoke(self._command(), arguments)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.calls, [])
+        (execution,) = fake_sky.executions
+        self.assertEqual(execution["cluster_name"], "test-cluster")
+        # SkyPilot chooses the backend from the cluster
+        self.assertNotIn("backend", execution)
+        self.assertEqual(execution["task"]["resources"], {"cloud": "gcp", "accelerators": "K80:1"})
+
+        # Only the mounted configuration is passed to the remote command, the local snapshot is removed once submitted
+        (remote_path,) = execution["task"]["file_mounts"]
+        self.assertTrue(remote_path.startswith(f"{REMOTE_CONFIGS_DIRECTORY}/"))
+        self.assertIn(f"-c {remote_path}\n", execution["task"]["run"])
+        self.assertNotIn("tests/config_1.yml", execution["task"]["run"])
+        self.assertEqual(os.listdir(self.local_dir), [])
+        self.assertEqual(os.listdir(self.workdir), ["paths.yml"])
+
+        # The remote command does not submit the task again and resolves the same configuration
+        self._run_remotely(execution)
+        self.assertEqual(len(fake_sky.executions), 1)
+        result = CliRunner().invoke(self._command(), [*arguments, "skypilot.submit=false"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        remote_config, local_config = self.calls
+        # Paths inside the workdir are relative to it on the remote nodes
+        self.assertEqual(remote_config.param_2, os.path.join("data", "train.txt"))
+        self.assertEqual(local_config.param_2, os.path.join(self.workdir, "data", "train.txt"))
+        self.assertEqual(remote_config.param_3, notes)
+        for sub_config_name in ("dataclass_sub_config", "attrs_sub_config"):
+            remote_sub_config = getattr(remote_config, sub_config_name)
+            local_sub_config = getattr(local_config, sub_config_name)
+            self.assertEqual(remote_sub_config.param_1, local_sub_config.param_1)
+            self.assertEqual(remote_sub_config.param_4, local_sub_config.param_4)
+        self.assertEqual(remote_config.dataclass_sub_config.custom_type, local_config.dataclass_sub_config.custom_type)
+        self.assertEqual(remote_config.param_1, local_config.param_1)
+
+    def test_command_line_paths(self):
+        # Paths resolved with `!path` on the command line are also made relative to the workdir
+        data_path = os.path.join(self.workdir, "data", "train.txt")
+        result = CliRunner().invoke(
+            self._command(), [*CONFIG_PATHS, self.workdir_parameter, f"param_2=!path {data_path}"]
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        (execution,) = fake_sky.executions
+        self._run_remotely(execution)
+        (remote_config,) = self.calls
+        self.assertEqual(remote_config.param_2, os.path.join("data", "train.txt"))
+
+    def test_submit_task_without_shipped_config(self):
+        result = CliRunner().invoke(
+            self._command(), [*CONFIG_PATHS, self.workdir_parameter, "skypilot.ship-config=false", "param_2=remote"]
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        (execution,) = fake_sky.executions
+        self.assertIn(
+            f"-c tests/skypilot.yml -c tests/config_1.yml -c tests/config_2.yml {self.workdir_parameter} "
+            "skypilot.ship-config=false param_2=remote skypilot.submit=false",
+            execution["task"]["run"],
+        )
+        self.assertNotIn("file_mounts", execution["task"])
+
+    def test_submit_sweep(self):
+        result = CliRunner().invoke(
+            self._command(skypilot_workers=4),
+            [*CONFIG_PATHS, self.workdir_parameter, "--multirun", "param_2=a,b", "skypilot.cluster-name=c1,c2"],
+            standalone_mode=False,
+        )
+        self.assertIsNone(result.exception, result.output)
+        self.assertEqual(result.return_value, [None] * 4)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(len(fake_sky.executions), 4)
+        # Each run ships its own configuration
+        self.assertEqual(
+            len({remote_path for execution in fake_sky.executions for remote_path in execution["mounted_files"]}), 4
+        )
+        self.assertEqual(os.listdir(self.local_dir), [])
+        for execution in fake_sky.executions:
+            self._run_remotely(execution)
+        self.assertEqual(sorted(config.param_2 for config in self.calls), ["a", "a", "b", "b"])
+        # The clusters receive their tasks concurrently, one task at a time
+        self.assertEqual(fake_sky.max_running, 2)
+
+    def test_latency_reports(self):
+        submissions = [
+            SkyPilotSubmission({"run": f"echo {index}"}, cluster_name=f"cluster-{index}") for index in range(3)
+        ]
+        reports = submit(submissions, workers=3)
+        self.assertEqual([report.submission for report in reports], submissions)
+        for report in reports:
+            self.assertGreaterEqual(report.latency, fake_sky.EXEC_DURATION)
+        self.assertEqual(fake_sky.max_running, 3)
+
+    def test_tasks_of_a_cluster_are_sequential(self):
+        submissions = [
+            SkyPilotSubmission({"run": f"echo {index}"}, cluster_name=f"cluster-{index % 2}") for index in range(4)
+        ]
+        reports = submit(submissions, workers=4)
+        self.assertEqual([report.submission for report in reports], submissions)
+        self.assertEqual(fake_sky.max_running, 2)
+        self.assertEqual(
+            [execution["task"]["run"] for execution in fake_sky.executions if execution["cluster_name"] == "cluster-1"],
+            ["echo 1", "echo 3"],
+        )
+
+    def test_tasks_from_files(self):
+        with mock.patch.object(fake_sky, "Task", fake_sky.FileTask):
+            submit([SkyPilotSubmission({"run": "echo 1", "workdir": "."})])
+        self.assertEqual(fake_sky.executions[0]["task"], {"run": "echo 1", "workdir": "."})
@@ -0,0 +1,89 @@
+# mypy: disable-error-code=no-untyped-def
+import collections
+import dataclasses
+import struct
+from typing import Any
+from unittest import mock
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+from configue_cli.core import loader
+from configue_cli.core.exceptions import InvalidSnapshotError
+from configue_cli.core.loader import load_from_path
+from configue_cli.core.snapshot import SNAPSHOT_FORMAT_VERSION, read_snapshot_header
+
+from .utils import TemporaryDirectoryTestCase
+
+
+@dataclasses.dataclass
+class SubConfig:
+    param_1: int
+    param_2: Any = None
+
+
+@dataclasses.dataclass
+class Config:
+    sub_config: SubConfig
+    param_1: int
+    param_2: str = "default"
+
+
+@click.command()
+@inject_from_cli(Config)
+def main(config):
+    return config
+
+
+class TestSnapshot(TemporaryDirectoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.config_path = self._write(
+            "config.yml", "param_1: 1\nsub_config:\n  param_1: 2\n  param_2: !ext collections.OrderedDict\n"
+        )
+        self.snapshot_path = self._path("snapshot.cfgc")
+
+    def _compile(self, *arguments):
+        result = CliRunner().invoke(
+            main, ["-c", self.config_path, "--compile", self.snapshot_path, *arguments], standalone_mode=False
+        )
+        self.assertIsNone(result.exception, result.output)
+        return result.return_value
+
+    def test_load_snapshot(self):
+        expected_config = self._compile("param_2=compiled")
+        self.assertEqual(expected_config.sub_config.param_2, collections.OrderedDict)
+
+        with mock.patch.object(loader, "NonInstanciatingRootLoader") as root_loader:
+            result = CliRunner().invoke(main, ["-c", self.snapshot_path, "param_1=3"], standalone_mode=False)
+        self.assertIsNone(result.exception, result.output)
+        root_loader.assert_not_called()
+        self.assertEqual(result.return_value, dataclasses.replace(expected_config, param_1=3))
+
+    def test_load_from_path(self):
+        self._compile()
+        self.assertEqual(load_from_path(self.snapshot_path, sub_path="sub_config.param_1"), 2)
+        self.assertEqual(load_from_path(self.snapshot_path, instantiate=False)["sub_config"]["param_1"], 2)
+
+    def test_source_hash(self):
+        self._compile()
+        header = read_snapshot_header(self.snapshot_path)
+        self.assertEqual(header.version, SNAPSHOT_FORMAT_VERSION)
+        self._compile()
+        self.assertEqual(read_snapshot_header(self.snapshot_path), header)
+        self._compile("param_2=other")
+        self.assertNotEqual(read_snapshot_header(self.snapshot_path).source_hash, header.source_hash)
+
+    def test_invalid_snapshots(self):
+        self._compile()
+        with open(self.snapshot_path, "r+b") as snapshot_file:
+            snapshot_file.seek(4)
+            snapshot_file.write(struct.pack(">H", SNAPSHOT_FORMAT_VERSION + 1))
+        with self.assertRaisesRegex(InvalidSnapshotError, "compile it again"):
+            load_from_path(self.snapshot_path)
+
+        with open(self.snapshot_path, "wb") as snapshot_file:
+            snapshot_file.write(b"param_1: 1\n" * 10)
+        with self.assertRaisesRegex(InvalidSnapshotError, "is not a configuration snapshot"):
+            load_from_path(self.snapshot_path)
@@ -0,0 +1,111 @@
+# mypy: disable-error-code=no-untyped-def
+import dataclasses
+import functools
+import multiprocessing
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+from configue_cli.core import loader
+from configue_cli.core.exceptions import InvalidSweepError
+from configue_cli.core.sweep import Sweep, split_top_level
+
+from .utils import TemporaryDirectoryTestCase
+
+
+PARSE = loader.YamlFileLoader._parse
+
+
+@dataclasses.dataclass
+class Config:
+    param_1: int
+    param_2: str = "default"
+
+
+@click.command()
+@inject_from_cli(Config)
+def main(config):
+    return config.param_1, config.param_2
+
+
+class TestSweep(unittest.TestCase):
+    def test_split_top_level(self):
+        self.assertEqual(split_top_level("1,2,3"), ["1", "2", "3"])
+        self.assertEqual(split_top_level("[1, 2],{a: 1, b: 2}"), ["[1, 2]", "{a: 1, b: 2}"])
+        self.assertEqual(split_top_level("'x,y',z"), ["'x,y'", "z"])
+
+    def test_from_parameters(self):
+        sweep = Sweep.from_parameters(["a=1,2", "b=range(0, 6, 2)", "c=[1,2]", "d='x,y'", "e={a: 1, b: 2}", "f=3", "g"])
+        self.assertEqual(sweep.fixed_parameters, ["c=[1,2]", "d='x,y'", "e={a: 1, b: 2}", "f=3", "g"])
+        self.assertEqual(sweep.swept_parameters, [("a", ["1", "2"]), ("b", ["0", "2", "4"])])
+        self.assertEqual(len(sweep), 6)
+
+    def test_combinations(self):
+        combinations = Sweep.from_parameters(["a=1,2", "b=x,y"]).combinations()
+        self.assertEqual(next(combinations), ["a=1", "b=x"])
+        self.assertEqual(list(combinations), [["a=1", "b=y"], ["a=2", "b=x"], ["a=2", "b=y"]])
+
+    def test_invalid_range(self):
+        with self.assertRaises(InvalidSweepError):
+            Sweep.from_parameters(["a=range(x)"])
+
+
+class TestMultirun(TemporaryDirectoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.config_path = self._write("config.yml", "param_2: from_file\n")
+
+    def test_runs_are_ordered(self):
+        for workers in [1, 3]:
+            with self.subTest(workers=workers):
+                result = CliRunner().invoke(
+                    main,
+                    ["-c", self.config_path, "param_1=range(3)", "--multirun", "--multirun-workers", str(workers)],
+                    standalone_mode=False,
+                )
+                self.assertIsNone(result.exception, result.output)
+                self.assertEqual(result.return_value, [(0, "from_file"), (1, "from_file"), (2, "from_file")])
+
+    def test_spawned_processes(self):
+        spawn_executor = functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn"))
+        with mock.patch.object(sys, "platform", "darwin"), mock.patch(
+            "concurrent.futures.ProcessPoolExecutor", spawn_executor
+        ):
+            result = CliRunner().invoke(
+                main, ["-c", self.config_path, "param_1=1,2", "-m", "--multirun-workers", "2"], standalone_mode=False
+            )
+        self.assertIsNone(result.exception, result.output)
+        self.assertEqual(result.return_value, [(1, "from_file"), (2, "from_file")])
+
+    def test_files_are_loaded_once(self):
+        with mock.patch.object(loader.YamlFileLoader, "_parse", autospec=True, side_effect=PARSE) as parse:
+            result = CliRunner().invoke(
+                main, ["-c", self.config_path, "param_1=1,2", "param_2=a,b", "-m"], standalone_mode=False
+            )
+        self.assertIsNone(result.exception, result.output)
+        self.assertEqual(result.return_value, [(1, "a"), (1, "b"), (2, "a"), (2, "b")])
+        self.assertEqual(parse.call_count, 1)
+
+    def test_outputs(self):
+        output_path = self._path("output.yml")
+        result = CliRunner().invoke(main, ["param_1=1,2", "-m", "-o", output_path], standalone_mode=False)
+        self.assertIsNone(result.exception, result.output)
+        for index, param_1 in enumerate([1, 2]):
+            with open(self._path(f"output.{index}.yml"), encoding="utf-8") as reader:
+                self.assertIn(f"param_1: {param_1}", reader.read())
+
+    def test_dry_run(self):
+        result = CliRunner().invoke(main, ["param_1=1,2", "-m", "-d", "--no-pretty"], standalone_mode=False)
+        self.assertIsNone(result.exception, result.output)
+        self.assertIsNone(result.return_value)
+        self.assertEqual(result.output, "param_1: 1\nparam_2: 'default'\nparam_1: 2\nparam_2: 'default'\n")
+
+    def test_without_multirun(self):
+        result = CliRunner().invoke(main, ["param_1=1", "param_2=a,b"], standalone_mode=False)
+        self.assertIsNone(result.exception, result.output)
+        self.assertEqual(result.return_value, (1, "a,b"))
@@ -0,0 +1,78 @@
+# mypy: disable-error-code=no-untyped-def
+from __future__ import annotations
+
+import dataclasses
+import unittest
+import unittest.mock
+
+import attrs
+
+from configue_cli.core.missing import MISSING
+from configue_cli.core.traversers import (
+    AttrsDataclassTraverser,
+    FieldKind,
+    NativeDataclassTraverser,
+    Traverser,
+)
+
+from .test_configue_cli import AttrsSubConfig, DataclassSubConfig
+
+
+@dataclasses.dataclass
+class PostponedSubConfig:
+    param: int = 1
+
+
+@attrs.define
+class PostponedConfig:
+    sub_config: PostponedSubConfig
+    param: int
+
+
+class TestTraverser(unittest.TestCase):
+    def test_native_dataclass_type_plan(self) -> None:
+        plan = NativeDataclassTraverser.get_type_plan(DataclassSubConfig)
+        self.assertEqual(
+            [(field.name, field.kind) for field in plan],
+            [
+                ("custom_type", FieldKind.REQUIRED),
+                ("custom_object", FieldKind.REQUIRED),
+                ("param_1", FieldKind.REQUIRED),
+                ("param_2", FieldKind.DEFAULT),
+                ("param_3", FieldKind.FACTORY),
+                ("param_4", FieldKind.FACTORY),
+                ("param_5", FieldKind.FACTORY),
+            ],
+        )
+
+    def test_attrs_dataclass_type_plan(self) -> None:
+        plan = AttrsDataclassTraverser.get_type_plan(AttrsSubConfig)
+        self.assertEqual(
+            [(field.name, field.kind) for field in plan],
+            [
+                ("param_1", FieldKind.REQUIRED),
+                ("param_2", FieldKind.DEFAULT),
+                ("param_3", FieldKind.FACTORY),
+                ("param_4", FieldKind.FACTORY_TAKES_SELF),
+                ("param_5", FieldKind.FACTORY),
+                ("param_6", FieldKind.FACTORY),
+            ],
+        )
+
+    def test_type_plans_are_compiled_once(self) -> None:
+        Traverser.traverse_type(AttrsSubConfig)
+        with unittest.mock.patch.object(AttrsDataclassTraverser, "compile_type_plan") as compile_type_plan:
+            config, _ = Traverser.traverse_type(AttrsSubConfig, initial_config={"param_3": 10})
+        compile_type_plan.assert_not_called()
+        self.assertEqual(config["param_4"], 12)
+
+    def test_postponed_annotations_are_resolved(self) -> None:
+        config, _ = Traverser.traverse_type(PostponedConfig)
+        self.assertEqual(
+            config,
+            {
+                "()": "tests.test_traversers.PostponedConfig",
+                "sub_config": {"()": "tests.test_traversers.PostponedSubConfig", "param": 1},
+                "param": MISSING,
+            },
+        )
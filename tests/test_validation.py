@@ -0,0 +1,65 @@
+# mypy: disable-error-code=no-untyped-def
+import dataclasses
+import unittest
+from typing import Any, List
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+from configue_cli.core.dict_config import DictConfig
+from configue_cli.core.exceptions import MissingMandatoryValueError
+from configue_cli.core.missing import MISSING
+from configue_cli.core.validation import find_missing_paths, validate
+
+INSTANTIATED: List[str] = []
+
+
+class RecordedType:
+    def __init__(self, name: str) -> None:
+        INSTANTIATED.append(name)
+
+
+@dataclasses.dataclass
+class Config:
+    recorded: Any
+    param: int
+
+
+class TestValidation(unittest.TestCase):
+    def test_find_missing_paths(self):
+        config = DictConfig(
+            {
+                "a": MISSING,
+                "b": {"c": 1, "d": [{"e": MISSING}, MISSING], "f": {"()": "builtins.dict", "g": MISSING}},
+                "h": "value",
+            }
+        )
+        self.assertEqual(find_missing_paths(config), ["a", "b.d.0.e", "b.d.1", "b.f.g"])
+
+    def test_validate(self):
+        validate(DictConfig({"a": 1, "b": {"c": [1, 2]}}))
+        with self.assertRaisesRegex(MissingMandatoryValueError, r"^Missing mandatory value: b\.c$"):
+            validate(DictConfig({"a": 1, "b": {"c": MISSING}}))
+        with self.assertRaisesRegex(MissingMandatoryValueError, r"^Missing mandatory values: a, b\.c$"):
+            validate(DictConfig({"a": MISSING, "b": {"c": MISSING}}))
+
+    def test_validate_before_instantiation(self):
+        @click.command()
+        @inject_from_cli(Config)
+        def main(config) -> None:
+            pass
+
+        INSTANTIATED.clear()
+        runner = CliRunner()
+        result = runner.invoke(main, ["recorded.()=tests.test_validation.RecordedType", "recorded.name=first"])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIsInstance(result.exception, MissingMandatoryValueError)
+        self.assertEqual(result.exception.args[0], "Missing mandatory value: param")  # type: ignore[union-attr]
+        self.assertEqual(INSTANTIATED, [])
+
+        result = runner.invoke(
+            main, ["recorded.()=tests.test_validation.RecordedType", "recorded.name=first", "param=1"]
+        )
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(INSTANTIATED, ["first"])
@@ -0,0 +1,97 @@
+# mypy: disable-error-code=no-untyped-def
+import threading
+from unittest import mock
+
+import click
+from click.testing import CliRunner
+
+from configue_cli.click import inject_from_cli
+from configue_cli.core import loader
+from configue_cli.core.watch import ConfigFiles, FileWatcher
+
+from .utils import TemporaryDirectoryTestCase
+
+
+PARSE = loader.YamlFileLoader._parse
+
+
+class TestWatch(TemporaryDirectoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self._write("base.yml", "value: 1\n")
+        self._write("data.txt", "data")
+        self._write("shared.yml", "shared: 3\n")
+        self._write("root.yml", "base: !import base.yml\ndata: !path data.txt\nshared: !import shared.yml\n")
+        self._write("other.yml", "other: 2\nshared: !import shared.yml\n")
+
+    def _write_later(self, file_name: str, content: str) -> threading.Timer:
+        timer = threading.Timer(0.05, self._write, (file_name, content))
+        timer.start()
+        return timer
+
+    def test_include_graph(self):
+        config_files = ConfigFiles([self._path("root.yml"), self._path("other.yml")])
+        with mock.patch.object(loader.YamlFileLoader, "_parse", autospec=True, side_effect=PARSE) as parse:
+            configs = config_files.load()
+        self.assertEqual(
+            configs,
+            [
+                {"base": {"value": 1}, "data": self._path("data.txt"), "shared": {"shared": 3}},
+                {"other": 2, "shared": {"shared": 3}},
+            ],
+        )
+        # Files imported by several configuration files are parsed once
+        self.assertEqual(parse.call_count, 4)
+        self.assertEqual(
+            config_files.dependencies(self._path("root.yml")),
+            {self._path("root.yml"), self._path("base.yml"), self._path("data.txt"), self._path("shared.yml")},
+        )
+        self.assertEqual(
+            config_files.dependencies(self._path("other.yml")), {self._path("other.yml"), self._path("shared.yml")}
+        )
+
+    def test_only_affected_files_are_reloaded(self):
+        config_files = ConfigFiles([self._path("root.yml"), self._path("other.yml")])
+        config_files.load()
+        self.assertEqual(config_files.invalidate([self._path("base.yml")]), [self._path("root.yml")])
+
+        self._write("base.yml", "value: 3\n")
+        with mock.patch.object(loader.YamlFileLoader, "_parse", autospec=True, side_effect=PARSE) as parse:
+            configs = config_files.load()
+        # `shared.yml` was not modified, it is not parsed again
+        self.assertEqual(
+            [call.args[0]._file_path for call in parse.call_args_list], [self._path("root.yml"), self._path("base.yml")]
+        )
+        self.assertEqual(configs[0]["base"], {"value": 3})
+        self.assertEqual(
+            config_files.invalidate([self._path("shared.yml")]), [self._path("root.yml"), self._path("other.yml")]
+        )
+
+    def test_file_watcher(self):
+        file_watcher = FileWatcher(interval=0.01)
+        timer = self._write_later("base.yml", "value: 10\n")
+        self.assertEqual(
+            file_watcher.wait_for_changes([self._path("base.yml"), self._path("data.txt")]), {self._path("base.yml")}
+        )
+        timer.join()
+
+        # Modifications made between two calls are detected
+        self._write("data.txt", "modified data")
+        self.assertEqual(
+            file_watcher.wait_for_changes([self._path("base.yml"), self._path("data.txt")]), {self._path("data.txt")}
+        )
+
+    def test_cli(self):
+        values = []
+
+        @click.command()
+        @inject_from_cli()
+        def main(config) -> None:
+            values.append(config["base"]["value"])
+            if len(values) == 1:
+                self._write_later("base.yml", "value: 10\n")
+            else:
+                raise KeyboardInterrupt()
+
+        CliRunner().invoke(main, ["-c", self._path("root.yml"), "--watch"])
+        self.assertEqual(values, [1, 10])
@@ -0,0 +1,21 @@
+import os
+import tempfile
+import unittest
+
+
+class TemporaryDirectoryTestCase(unittest.TestCase):
+    """Test case writing its files in a temporary directory, removed after each test."""
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+
+    def _path(self, file_name: str) -> str:
+        return os.path.join(self.temp_dir, file_name)
+
+    def _write(self, file_name: str, content: str) -> str:
+        file_path = self._path(file_name)
+        with open(file_path, "w", encoding="utf-8") as writer:
+            writer.write(content)
+        return file_path